@@ -1,22 +1,42 @@
 """
 Gallery Controller - Handles gallery-related business logic
 """
-import os
-import uuid
 from typing import List, Optional
-from datetime import datetime
-from PIL import Image
-import io
-import base64
+import hashlib
 
-from app.core.services.database_service import DatabaseService
+from app.core.services.async_database_service import AsyncDatabaseService
+from app.core.services.image_store import (
+    ImageStore,
+    IMAGE_FORMATS,
+    RENDITION_FORMATS,
+    content_type_for_key,
+    digest_from_key,
+    get_or_create_rendition,
+    iter_memory_range,
+    parse_data_url,
+    public_gallery_item,
+    save_renditions
+)
+from app.core.utils.image_renditions import negotiate_format
+from app.core.utils.image_processing import (
+    process_gallery_upload,
+    process_generated_image,
+    validate_gallery_image
+)
+from app.core.services.image_executor import get_image_executor
+from app.core.utils.http_cache import make_etag
+from app.core.config.settings import GALLERY_PAGE_SIZE, GALLERY_IMAGE_SIZES, GALLERY_RENDITION_SIZES
+
+# Largest stored original; bigger images are re-encoded down to this size
+GALLERY_MAX_IMAGE_BYTES = 8 * 1024 * 1024
 
 
 class GalleryController:
-    def __init__(self, db_service: DatabaseService):
+    def __init__(self, db_service: AsyncDatabaseService, image_store: ImageStore):
         self.db = db_service
+        self.image_store = image_store
 
-    def create_gallery_item(
+    async def create_gallery_item(
         self,
         session_id: int,
         user_id: int,
@@ -32,128 +52,202 @@ class GalleryController:
         """
         try:
             # Validate session exists and user has access
-            session = self.db.get_session_by_id(session_id)
-            if not session:
-                return {"success": False, "error": "Session not found"}
-            
-            # Validate user access to session
-            if user_type == "student":
-                student = self.db.get_student_by_session_and_name(session_id, user_name)
-                if not student:
-                    return {"success": False, "error": "Student not found in this session"}
-            elif user_type == "teacher":
-                if session.get("teacher_id") != user_id:
-                    return {"success": False, "error": "Teacher not authorized for this session"}
-            
-            # Process and validate image
+            error = await self.validate_upload_access(session_id, user_id, user_name, user_type)
+            if error:
+                return {"success": False, "error": error}
+            
+            # Decode once in the image process pool; the stored copy and renditions share it
             try:
-                # Open image with PIL for validation and processing
-                image = Image.open(io.BytesIO(image_data))
-                
-                # Convert to RGB if necessary
-                if image.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    if image.mode == 'P':
-                        image = image.convert('RGBA')
-                    background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-                    image = background
-                elif image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # Resize if too large (max 1920x1920)
-                max_size = (1920, 1920)
-                if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
-                    image.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Apply compression to reduce file size
-                # Start with higher quality and reduce if file is still too large
-                quality = 85
-                while quality >= 60:
-                    img_buffer = io.BytesIO()
-                    image.save(img_buffer, format=image_format, quality=quality, optimize=True)
-                    processed_image_data = img_buffer.getvalue()
-                    
-                    # Check if compressed size is acceptable (8MB limit)
-                    if len(processed_image_data) <= 8 * 1024 * 1024:
-                        break
-                    
-                    quality -= 5
+                processed_image_data, renditions = await get_image_executor().run(
+                    process_gallery_upload,
+                    image_data,
+                    image_format,
+                    max_bytes=GALLERY_MAX_IMAGE_BYTES,
+                    rendition_sizes=GALLERY_RENDITION_SIZES,
+                    rendition_formats=RENDITION_FORMATS
+                )
                 
-                # If still too large after compression, resize further
-                if len(processed_image_data) > 8 * 1024 * 1024:
-                    scale_factor = 0.8
-                    while len(processed_image_data) > 8 * 1024 * 1024 and scale_factor > 0.3:
-                        new_width = int(image.size[0] * scale_factor)
-                        new_height = int(image.size[1] * scale_factor)
-                        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        
-                        img_buffer = io.BytesIO()
-                        resized_image.save(img_buffer, format=image_format, quality=70, optimize=True)
-                        processed_image_data = img_buffer.getvalue()
-                        
-                        scale_factor -= 0.1
+            except Exception as e:
+                return {"success": False, "error": f"Invalid image format: {str(e)}"}
+            
+            return await self._store_gallery_item(
+                session_id, user_id, user_name, user_type,
+                processed_image_data, image_format, renditions, prompt, title
+            )
                 
+        except Exception as e:
+            return {"success": False, "error": f"Server error: {str(e)}"}
+
+    async def publish_generated_image(
+        self,
+        session_id: int,
+        user_id: int,
+        user_name: str,
+        user_type: str,
+        image_data: bytes,
+        prompt: str,
+        title: Optional[str] = None
+    ) -> dict:
+        """
+        Publish a freshly generated image straight into the gallery
+        
+        The Stability output is decoded once for the renditions and stored
+        as-is when it is within the gallery limits, so the client does not
+        have to download and re-upload it through /gallery/upload.
+        """
+        try:
+            error = await self.validate_upload_access(session_id, user_id, user_name, user_type)
+            if error:
+                return {"success": False, "error": error}
+            
+            try:
+                stored_image_data, image_format, renditions = await get_image_executor().run(
+                    process_generated_image,
+                    image_data,
+                    max_bytes=GALLERY_MAX_IMAGE_BYTES,
+                    rendition_sizes=GALLERY_RENDITION_SIZES,
+                    rendition_formats=RENDITION_FORMATS
+                )
             except Exception as e:
                 return {"success": False, "error": f"Invalid image format: {str(e)}"}
             
-            # Convert image to base64 for storage (temporary solution)
-            # In production, you would upload to cloud storage (S3, Cloudinary, etc.)
-            image_base64 = base64.b64encode(processed_image_data).decode('utf-8')
-            image_url = f"data:image/{image_format.lower()};base64,{image_base64}"
-            
-            # Save to database
-            gallery_item = self.db.create_gallery_item(
-                session_id=session_id,
-                user_id=user_id,
-                user_name=user_name,
-                user_type=user_type,
-                image_url=image_url,
-                prompt=prompt,
-                title=title
+            return await self._store_gallery_item(
+                session_id, user_id, user_name, user_type,
+                stored_image_data, image_format, renditions, prompt, title
             )
             
-            if gallery_item:
-                return {"success": True, "item": gallery_item}
-            else:
-                return {"success": False, "error": "Failed to create gallery item"}
-                
         except Exception as e:
             return {"success": False, "error": f"Server error: {str(e)}"}
 
-    def get_session_gallery_items(self, session_id: int, user_id: int, user_type: str) -> dict:
+    async def _store_gallery_item(
+        self,
+        session_id: int,
+        user_id: int,
+        user_name: str,
+        user_type: str,
+        image_data: bytes,
+        image_format: str,
+        renditions: dict,
+        prompt: str,
+        title: Optional[str]
+    ) -> dict:
+        """
+        Store the processed image and its renditions, then insert the gallery row
+        """
+        # Store image bytes content-addressed; only the URL goes into the row
+        image_url = await self.image_store.save(image_data, image_format)
+        
+        # Store the grid/detail renditions; missing ones are rebuilt on first request
+        try:
+            await save_renditions(
+                self.image_store,
+                digest_from_key(self.image_store.key_from_url(image_url)),
+                renditions
+            )
+        except Exception as e:
+            print(f"⚠️ Failed to store gallery renditions: {str(e)}")
+        
+        # Save to database
+        gallery_item = await self.db.create_gallery_item(
+            session_id=session_id,
+            user_id=user_id,
+            user_name=user_name,
+            user_type=user_type,
+            image_url=image_url,
+            prompt=prompt,
+            title=title
+        )
+        
+        if gallery_item:
+            return {"success": True, "item": public_gallery_item(gallery_item)}
+        else:
+            return {"success": False, "error": "Failed to create gallery item"}
+
+    async def validate_upload_access(self, session_id: int, user_id: int, user_name: str,
+                                     user_type: str) -> Optional[str]:
+        """
+        Check that the uploader belongs to the session
+        
+        Returns:
+            None if the upload is allowed, otherwise an error message
+        """
+        session = await self.db.get_session_by_id(session_id)
+        if not session:
+            return "Session not found"
+        
+        if user_type == "student":
+            student = await self.db.get_student_by_session_and_name(session_id, user_name)
+            if not student:
+                return "Student not found in this session"
+        elif user_type == "teacher":
+            if session.get("teacher_id") != user_id:
+                return "Teacher not authorized for this session"
+        
+        return None
+
+    async def validate_session_access(self, session_id: int, user_id: int, user_type: str) -> Optional[str]:
         """
-        Get all gallery items for a specific session
+        Check that the user belongs to the session
+
+        Returns:
+            None if access is allowed, otherwise an error message
+        """
+        session = await self.db.get_session_by_id(session_id)
+        if not session:
+            return "Session not found"
+
+        if user_type == "student":
+            student = await self.db.get_student_by_id(user_id)
+            if not student or student.get("session_id") != session_id:
+                return "Access denied to this session"
+        elif user_type == "teacher":
+            if session.get("teacher_id") != user_id:
+                return "Access denied to this session"
+
+        return None
+
+    async def get_session_gallery_items(
+        self,
+        session_id: int,
+        user_id: int,
+        user_type: str,
+        cursor: Optional[str] = None,
+        limit: int = GALLERY_PAGE_SIZE,
+        include_image: bool = False
+    ) -> dict:
+        """
+        Get one page of gallery items for a specific session (newest first)
         """
         try:
             # Validate session exists and user has access
-            session = self.db.get_session_by_id(session_id)
-            if not session:
-                return {"success": False, "error": "Session not found"}
-            
-            # Validate user access to session
-            if user_type == "student":
-                student = self.db.get_student_by_id(user_id)
-                if not student or student.get("session_id") != session_id:
-                    return {"success": False, "error": "Access denied to this session"}
-            elif user_type == "teacher":
-                if session.get("teacher_id") != user_id:
-                    return {"success": False, "error": "Access denied to this session"}
+            error = await self.validate_session_access(session_id, user_id, user_type)
+            if error:
+                return {"success": False, "error": error}
             
-            # Get gallery items
-            items = self.db.get_gallery_items_by_session(session_id)
+            # Get gallery items page
+            try:
+                page = await self.db.get_gallery_items_page(
+                    session_id=session_id,
+                    cursor=cursor,
+                    limit=limit,
+                    include_image=include_image
+                )
+            except ValueError as e:
+                return {"success": False, "error": str(e)}
             
-            return {"success": True, "items": items}
+            page["items"] = [public_gallery_item(item) for item in page["items"]]
+            return {"success": True, **page}
             
         except Exception as e:
             return {"success": False, "error": f"Server error: {str(e)}"}
 
-    def delete_gallery_item(self, item_id: int, user_id: int, user_type: str) -> dict:
+    async def delete_gallery_item(self, item_id: int, user_id: int, user_type: str) -> dict:
         """
         Delete a gallery item (only by the creator or teacher of the session)
         """
         try:
             # Get the gallery item
-            item = self.db.get_gallery_item_by_id(item_id)
+            item = await self.db.get_gallery_item_by_id(item_id)
             if not item:
                 return {"success": False, "error": "Gallery item not found"}
             
@@ -172,7 +266,7 @@ class GalleryController:
                 return {"success": False, "error": "Access denied"}
             
             # Delete the item
-            success = self.db.delete_gallery_item(item_id)
+            success = await self.db.delete_gallery_item(item_id)
             
             if success:
                 return {"success": True, "message": "Gallery item deleted successfully"}
@@ -182,30 +276,85 @@ class GalleryController:
         except Exception as e:
             return {"success": False, "error": f"Server error: {str(e)}"}
 
-    def validate_image_file(self, file_data: bytes, max_size_mb: int = 10) -> dict:
+    async def get_gallery_image(self, item_id: int, user_id: int, user_type: str,
+                                size: str = "original", accept: Optional[str] = None) -> dict:
         """
-        Validate uploaded image file
+        Resolve the stored image bytes of a gallery item for streaming
+        (with the same session access validation as the item endpoint)
+        
+        size is "original" or a rendition name; renditions are negotiated
+        between WebP/AVIF and JPEG from the Accept header.
         """
         try:
-            # Check file size
-            file_size_mb = len(file_data) / (1024 * 1024)
-            if file_size_mb > max_size_mb:
-                return {"valid": False, "error": f"File too large. Maximum size is {max_size_mb}MB"}
+            if size not in GALLERY_IMAGE_SIZES:
+                return {"success": False, "error": "Unknown image size"}
+            
+            image_info = await self.db.get_gallery_item_image_info(item_id)
+            if not image_info:
+                return {"success": False, "error": "Gallery image not found"}
+            
+            error = await self.validate_session_access(image_info["session_id"], user_id, user_type)
+            if error:
+                return {"success": False, "error": error, "status_code": 403}
+            
+            image_url = image_info["image_url"]
+            key = self.image_store.key_from_url(image_url)
+            image_data = None
+            if key:
+                digest = digest_from_key(key)
+            else:
+                # Rows not yet moved by migrate_gallery_images.py still hold a data: URL
+                parsed = parse_data_url(image_url)
+                if not parsed:
+                    return {"success": False, "error": "Gallery image not found"}
+                image_data, original_format = parsed
+                digest = hashlib.sha256(image_data).hexdigest()
+            
+            async def load_original() -> Optional[bytes]:
+                return image_data if image_data is not None else await self.image_store.load(key)
+            
+            if size != "original":
+                image_format = negotiate_format(accept, RENDITION_FORMATS)
+                rendition = await get_or_create_rendition(
+                    self.image_store, digest, size, image_format, load_original
+                )
+                if not rendition:
+                    return {"success": False, "error": "Gallery image not found"}
+                stored_key, byte_size = rendition
+                return {
+                    "success": True,
+                    "etag": make_etag(f"{digest}-{size}-{image_format.lower()}"),
+                    "content_type": IMAGE_FORMATS[image_format][1],
+                    "size": byte_size,
+                    "vary": "Accept",
+                    "open_range": lambda start, end: self.image_store.iter_bytes(stored_key, start, end)
+                }
+            
+            if key:
+                byte_size = await self.image_store.size(key)
+                if byte_size is None:
+                    return {"success": False, "error": "Gallery image not found"}
+                return {
+                    "success": True,
+                    "etag": make_etag(digest),
+                    "content_type": content_type_for_key(key),
+                    "size": byte_size,
+                    "open_range": lambda start, end: self.image_store.iter_bytes(key, start, end)
+                }
+            
+            return {
+                "success": True,
+                "etag": make_etag(digest),
+                "content_type": IMAGE_FORMATS[original_format][1],
+                "size": len(image_data),
+                "open_range": lambda start, end: iter_memory_range(image_data, start, end)
+            }
             
-            # Check if it's a valid image
-            try:
-                image = Image.open(io.BytesIO(file_data))
-                image.verify()  # Verify it's a valid image
-                
-                # Check format
-                allowed_formats = ['JPEG', 'PNG', 'WebP']
-                if image.format not in allowed_formats:
-                    return {"valid": False, "error": f"Unsupported format. Allowed: {', '.join(allowed_formats)}"}
-                
-                return {"valid": True, "format": image.format, "size": image.size}
-                
-            except Exception:
-                return {"valid": False, "error": "Invalid image file"}
-                
         except Exception as e:
-            return {"valid": False, "error": f"File validation error: {str(e)}"}
\ No newline at end of file
+            return {"success": False, "error": f"Server error: {str(e)}"}
+
+    async def validate_image_file(self, file_data: bytes, max_size_mb: int = 10) -> dict:
+        """
+        Validate uploaded image file (header probe only, no pixel decode)
+        """
+        return validate_gallery_image(file_data, max_size_mb)
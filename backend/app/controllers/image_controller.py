@@ -5,11 +5,10 @@ MVC 패턴에 따라 이미지 생성 비즈니스 로직을 처리
 import time
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from fastapi import UploadFile, HTTPException
-import io
 
-from app.core.services.stability_service import StabilityService, StabilityServiceError
+from app.core.services.stability_service import ImageStream, StabilityService, StabilityServiceError
 from app.core.models.image_schemas import (
     CoreImageRequest, SD35ImageRequest, UltraImageRequest, SketchRequest,
     ImageGenerationResponse, ErrorResponse, FileValidationResponse,
@@ -68,7 +67,7 @@ class ImageController:
             await file.seek(0)
             
             # Stability 서비스를 통한 상세 검증
-            validation_result = self.stability_service.validate_image_file(io.BytesIO(file_content))
+            validation_result = await self.stability_service.validate_image_file_async(file_content)
             
             return FileValidationResponse(
                 valid=validation_result["valid"],
@@ -88,15 +87,17 @@ class ImageController:
                 message=f"검증 중 오류 발생: {str(e)}"
             )
     
-    async def generate_core_image_data(self, request_data: Dict[str, Any]) -> bytes:
+    async def generate_core_image_data(self, request_data: Dict[str, Any],
+                                       stream: bool = False) -> Union[bytes, ImageStream]:
         """
         Core 모델로 이미지 생성 (바이너리 데이터 반환)
         
         Args:
             request_data: 요청 데이터
+            stream: True이면 업스트림 응답을 그대로 흘려보내는 ImageStream 반환
             
         Returns:
-            bytes: 생성된 이미지 바이너리 데이터
+            bytes: 생성된 이미지 바이너리 데이터 (stream=True이면 ImageStream)
         """
         try:
             # 요청 데이터 검증
@@ -105,13 +106,14 @@ class ImageController:
             logger.info(f"Core 이미지 생성 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            image_data = self.stability_service.generate_core_image(
+            image_data = await self.stability_service.generate_core_image(
                 prompt=request.prompt,
                 aspect_ratio=request.aspect_ratio,
                 output_format=request.output_format,
                 style_preset=request.style_preset,
                 negative_prompt=request.negative_prompt,
-                seed=request.seed
+                seed=request.seed,
+                stream=stream
             )
             
             logger.info("Core 이미지 생성 완료")
@@ -122,7 +124,8 @@ class ImageController:
             logger.error(f"Core 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"Core 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -147,7 +150,7 @@ class ImageController:
             logger.info(f"Core 이미지 생성 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            image_data = self.stability_service.generate_core_image(
+            image_data = await self.stability_service.generate_core_image(
                 prompt=request.prompt,
                 aspect_ratio=request.aspect_ratio,
                 output_format=request.output_format,
@@ -163,7 +166,7 @@ class ImageController:
             filename = f"core_image_{timestamp}.{request.output_format}"
             
             # 이미지 정보 조회
-            image_info = self.stability_service.get_image_info(image_data)
+            image_info = await self.stability_service.get_image_info_async(image_data)
             
             logger.info(f"Core 이미지 생성 완료: {filename}, 시간: {generation_time:.2f}s")
             
@@ -181,7 +184,8 @@ class ImageController:
             logger.error(f"Core 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"Core 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -191,13 +195,15 @@ class ImageController:
             )
     
     async def generate_sd35_image(self, request_data: Dict[str, Any], 
-                                 image_file: Optional[UploadFile] = None) -> bytes:
+                                 image_file: Optional[UploadFile] = None,
+                                 stream: bool = False) -> Union[bytes, ImageStream]:
         """
         SD3.5 모델로 이미지 생성
         
         Args:
             request_data: 요청 데이터
             image_file: 업로드된 이미지 파일 (image-to-image 모드에서 필요)
+            stream: True이면 업스트림 응답을 그대로 흘려보내는 ImageStream 반환
             
         Returns:
             bytes: 생성된 이미지 바이너리 데이터
@@ -215,7 +221,7 @@ class ImageController:
             logger.info(f"SD3.5 이미지 생성 시작: {request.mode} - {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            generated_image = self.stability_service.generate_sd35_image(
+            generated_image = await self.stability_service.generate_sd35_image(
                 prompt=request.prompt,
                 mode=request.mode,
                 model=request.model,
@@ -226,7 +232,8 @@ class ImageController:
                 style_preset=request.style_preset,
                 negative_prompt=request.negative_prompt,
                 seed=request.seed,
-                cfg_scale=request.cfg_scale
+                cfg_scale=request.cfg_scale,
+                stream=stream
             )
             
             logger.info(f"SD3.5 이미지 생성 완료: {request.mode}")
@@ -237,7 +244,8 @@ class ImageController:
             logger.error(f"SD3.5 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"SD3.5 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -247,13 +255,15 @@ class ImageController:
             )
     
     async def generate_ultra_image(self, request_data: Dict[str, Any], 
-                                  image_file: Optional[UploadFile] = None) -> bytes:
+                                  image_file: Optional[UploadFile] = None,
+                                  stream: bool = False) -> Union[bytes, ImageStream]:
         """
         Ultra 모델로 이미지 생성
         
         Args:
             request_data: 요청 데이터
             image_file: 업로드된 참조 이미지 파일 (선택사항)
+            stream: True이면 업스트림 응답을 그대로 흘려보내는 ImageStream 반환
             
         Returns:
             bytes: 생성된 이미지 바이너리 데이터
@@ -271,7 +281,7 @@ class ImageController:
             logger.info(f"Ultra 이미지 생성 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            generated_image = self.stability_service.generate_ultra_image(
+            generated_image = await self.stability_service.generate_ultra_image(
                 prompt=request.prompt,
                 aspect_ratio=request.aspect_ratio,
                 output_format=request.output_format,
@@ -279,7 +289,8 @@ class ImageController:
                 strength=request.strength,
                 style_preset=request.style_preset,
                 negative_prompt=request.negative_prompt,
-                seed=request.seed
+                seed=request.seed,
+                stream=stream
             )
             
             logger.info("Ultra 이미지 생성 완료")
@@ -290,7 +301,8 @@ class ImageController:
             logger.error(f"Ultra 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"Ultra 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -300,13 +312,15 @@ class ImageController:
             )
     
     async def sketch_to_image(self, request_data: Dict[str, Any], 
-                             image_file: UploadFile) -> bytes:
+                             image_file: UploadFile,
+                             stream: bool = False) -> Union[bytes, ImageStream]:
         """
         스케치를 이미지로 변환
         
         Args:
             request_data: 요청 데이터
             image_file: 업로드된 스케치 이미지 파일
+            stream: True이면 업스트림 응답을 그대로 흘려보내는 ImageStream 반환
             
         Returns:
             bytes: 생성된 이미지 바이너리 데이터
@@ -322,14 +336,15 @@ class ImageController:
             logger.info(f"스케치→이미지 변환 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            generated_image = self.stability_service.sketch_to_image(
+            generated_image = await self.stability_service.sketch_to_image(
                 prompt=request.prompt,
                 image=image_data,
                 control_strength=request.control_strength,
                 output_format=request.output_format,
                 style_preset=request.style_preset,
                 negative_prompt=request.negative_prompt,
-                seed=request.seed
+                seed=request.seed,
+                stream=stream
             )
             
             logger.info("스케치→이미지 변환 완료")
@@ -340,7 +355,8 @@ class ImageController:
             logger.error(f"스케치→이미지 변환 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"스케치→이미지 변환 중 예상치 못한 오류: {str(e)}")
@@ -13,6 +13,21 @@ load_dotenv()
 # Supabase 설정
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+SUPABASE_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() == "true"  # h2 패키지 설치 시 HTTP/2 사용
+
+# 데이터베이스 연결 풀 설정 (프로세스당 하나의 풀을 공유)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))  # 최대 동시 연결 수
+DB_KEEPALIVE_CONNECTIONS = int(os.getenv("DB_KEEPALIVE_CONNECTIONS", "20"))  # 유지할 유휴 연결 수
+DB_KEEPALIVE_EXPIRY = float(os.getenv("DB_KEEPALIVE_EXPIRY", "60"))  # 유휴 연결 유지 시간 (초)
+
+# 엔티티 조회 캐시 설정 (세션/학생/선생님/채팅 스레드 조회 결과)
+DB_CACHE_MAX_ENTRIES = int(os.getenv("DB_CACHE_MAX_ENTRIES", "2048"))
+DB_CACHE_TTL_SECONDS = float(os.getenv("DB_CACHE_TTL_SECONDS", "60"))
+
+# 채팅 스레드 메시지 캐시 설정 (스레드별 최근 메시지 링 버퍼)
+CHAT_MESSAGE_CACHE_PER_THREAD = int(os.getenv("CHAT_MESSAGE_CACHE_PER_THREAD", "100"))  # 스레드당 유지할 최근 메시지 수
+CHAT_MESSAGE_CACHE_MAX_BYTES = int(os.getenv("CHAT_MESSAGE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 전체 스레드 합계 크기 (넘으면 LRU 제거)
+CHAT_MESSAGE_CACHE_TTL_SECONDS = float(os.getenv("CHAT_MESSAGE_CACHE_TTL_SECONDS", "600"))  # 다른 워커의 쓰기 반영을 위한 재조회 주기
 
 # CORS 설정
 CORS_ORIGINS = [
@@ -30,10 +45,81 @@ SESSION_EXPIRE_HOURS = 24  # 클래스 세션 만료 시간 (24시간)
 # 클래스 코드 설정
 CLASS_CODE_LENGTH = 6  # 클래스 코드 길이
 
+# 갤러리 목록 페이지 크기
+GALLERY_PAGE_SIZE = 24
+GALLERY_MAX_PAGE_SIZE = 100
+# 업로드 시 생성하는 렌디션 (이름 -> 긴 변 픽셀)과 포맷 (Accept 헤더로 선택, JPEG는 항상 대체용으로 생성)
+GALLERY_RENDITION_SIZES = {"256": 256, "640": 640, "1920": 1920}
+GALLERY_RENDITION_FORMATS = tuple(os.getenv("GALLERY_RENDITION_FORMATS", "WEBP,JPEG").upper().split(","))
+GALLERY_IMAGE_SIZES = ("original", *GALLERY_RENDITION_SIZES)  # /gallery/image/{item_id}/{size}에서 허용하는 크기
+GALLERY_STATS_TTL_SECONDS = float(os.getenv("GALLERY_STATS_TTL_SECONDS", "300"))  # 세션별 통계 캐시 유지 시간 (초)
+
+# 갤러리 이미지 저장소 설정 (local: 로컬 파일 시스템, s3: S3 호환 스토리지)
+IMAGE_STORE_BACKEND = os.getenv("IMAGE_STORE_BACKEND", "local").lower()
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "media")  # local 저장소 루트 디렉터리
+IMAGE_PUBLIC_BASE_URL = os.getenv("IMAGE_PUBLIC_BASE_URL")  # 저장된 이미지 URL 접두사 (DB 행에서 저장 키를 찾는 데 사용, 이미지는 /gallery/image로만 제공)
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # MinIO 등 S3 호환 서버 주소 (AWS S3는 비워둠)
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY")
+S3_SECRET_KEY = os.getenv("S3_SECRET_KEY")
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+
+# 이미지 처리 프로세스 풀 설정 (Pillow 작업을 이벤트 루프 밖에서 실행)
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0이면 스레드 1개로 실행
+IMAGE_MAX_PENDING = int(os.getenv("IMAGE_MAX_PENDING", "32"))  # 풀에 동시에 넘길 수 있는 최대 작업 수
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "40000000"))  # 헤더에 선언된 픽셀 수 상한 (디컴프레션 밤 차단)
+
+# Stability AI 호출 설정 (공유 연결 풀, 호출별 타임아웃)
+STABILITY_POOL_SIZE = int(os.getenv("STABILITY_POOL_SIZE", "10"))
+STABILITY_TIMEOUT = float(os.getenv("STABILITY_TIMEOUT", "60"))  # 이미지 생성 응답 대기 시간 (초)
+STABILITY_CONNECT_TIMEOUT = float(os.getenv("STABILITY_CONNECT_TIMEOUT", "5"))
+
+# 시드 고정 이미지 생성 결과 디스크 캐시 (같은 요청은 API 호출/크레딧 없이 재사용)
+GENERATION_CACHE_ENABLED = os.getenv("GENERATION_CACHE_ENABLED", "true").lower() == "true"
+GENERATION_CACHE_DIR = os.getenv("GENERATION_CACHE_DIR", "cache/generations")
+GENERATION_CACHE_MAX_MB = int(os.getenv("GENERATION_CACHE_MAX_MB", "512"))  # 초과 시 가장 오래 안 쓴 결과부터 삭제
+
+# 이미지 생성 크레딧 제한 (토큰 버킷, 생성 전에 모델별 크레딧 차감)
+CREDIT_SESSION_CAPACITY = int(os.getenv("CREDIT_SESSION_CAPACITY", "300"))  # 세션(수업)당 최대 누적 크레딧
+CREDIT_SESSION_REFILL_PER_MINUTE = float(os.getenv("CREDIT_SESSION_REFILL_PER_MINUTE", "60"))
+CREDIT_USER_CAPACITY = int(os.getenv("CREDIT_USER_CAPACITY", "40"))  # 사용자당 최대 누적 크레딧
+CREDIT_USER_REFILL_PER_MINUTE = float(os.getenv("CREDIT_USER_REFILL_PER_MINUTE", "8"))
+CREDIT_LIMITER_STATE_FILE = os.getenv("CREDIT_LIMITER_STATE_FILE")  # 지정 시 종료할 때 버킷 상태를 저장하고 시작할 때 복원
+
+# 배치 이미지 생성 설정 (/image/generate/batch)
+BATCH_GENERATION_MAX_ITEMS = int(os.getenv("BATCH_GENERATION_MAX_ITEMS", "20"))
+BATCH_GENERATION_CONCURRENCY = int(os.getenv("BATCH_GENERATION_CONCURRENCY", "4"))  # 요청 하나에서 동시에 실행할 생성 수
+
+# 이미지 생성 백그라운드 작업 큐 설정
+IMAGE_JOB_WORKERS = int(os.getenv("IMAGE_JOB_WORKERS", "4"))  # 동시에 실행할 Stability 호출 수
+IMAGE_JOB_SESSION_CONCURRENCY = int(os.getenv("IMAGE_JOB_SESSION_CONCURRENCY", "2"))  # 세션(수업)당 동시 실행 수
+IMAGE_JOB_SESSION_MAX_QUEUED = int(os.getenv("IMAGE_JOB_SESSION_MAX_QUEUED", "60"))  # 세션당 대기+실행 작업 상한
+IMAGE_JOB_RESULT_TTL_SECONDS = int(os.getenv("IMAGE_JOB_RESULT_TTL_SECONDS", "900"))  # 완료된 결과 보관 시간
+
 # OpenAI API 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = "gpt-4o"  # Vision 및 파일 첨부 지원 모델
 
+# OpenAI 응답 캐시 (같은 세션에서 반복되는 짧은 질문은 API 호출 없이 응답, 기본 비활성)
+OPENAI_RESPONSE_CACHE_ENABLED = os.getenv("OPENAI_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+OPENAI_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("OPENAI_RESPONSE_CACHE_TTL_SECONDS", "3600"))
+OPENAI_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("OPENAI_RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+OPENAI_RESPONSE_CACHE_MAX_MESSAGES = int(os.getenv("OPENAI_RESPONSE_CACHE_MAX_MESSAGES", "3"))  # 대화 기록이 이보다 길면 캐시하지 않음
+
+# AI 채팅 대화 컨텍스트 설정 (토큰 예산을 넘는 오래된 대화는 요약으로 대체)
+CHAT_CONTEXT_MAX_TOKENS = int(os.getenv("CHAT_CONTEXT_MAX_TOKENS", "6000"))  # 시스템 프롬프트 + 요약 + 기록 + 현재 메시지
+CHAT_CONTEXT_FETCH_LIMIT = int(os.getenv("CHAT_CONTEXT_FETCH_LIMIT", "50"))  # 컨텍스트 후보로 읽는 최근 메시지 수
+CHAT_CONTEXT_MESSAGE_MAX_TOKENS = int(os.getenv("CHAT_CONTEXT_MESSAGE_MAX_TOKENS", "1500"))  # 기록 메시지 하나의 최대 토큰 (넘으면 잘라냄)
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "400"))  # 이전 대화 요약 길이
+
+# 채팅 메시지 저장 설정 (응답 후 백그라운드에서 모아서 일괄 저장)
+CHAT_PERSIST_QUEUE_SIZE = int(os.getenv("CHAT_PERSIST_QUEUE_SIZE", "1000"))  # 저장 대기 메시지 상한 (가득 차면 저장 요청이 대기)
+CHAT_PERSIST_BATCH_SIZE = int(os.getenv("CHAT_PERSIST_BATCH_SIZE", "50"))  # 한 번의 POST로 저장할 최대 메시지 수
+CHAT_PERSIST_FLUSH_INTERVAL = float(os.getenv("CHAT_PERSIST_FLUSH_INTERVAL", "0.2"))  # 배치를 채우기 위해 기다리는 최대 시간 (초)
+CHAT_PERSIST_MAX_RETRIES = int(os.getenv("CHAT_PERSIST_MAX_RETRIES", "5"))  # 저장 실패 시 재시도 횟수 (넘으면 스풀 파일에 기록)
+CHAT_PERSIST_SHUTDOWN_TIMEOUT = float(os.getenv("CHAT_PERSIST_SHUTDOWN_TIMEOUT", "5"))  # 종료 시 남은 메시지 저장을 기다리는 시간 (초)
+CHAT_PERSIST_SPOOL_FILE = os.getenv("CHAT_PERSIST_SPOOL_FILE", "cache/chat_message_spool.jsonl")  # 저장하지 못한 메시지 (시작 시 다시 저장, DB가 거부한 메시지는 같은 경로 + .rejected)
+
 def get_supabase_headers() -> Dict[str, Any]:
     """
     Supabase API 요청용 헤더 반환
@@ -7,6 +7,8 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, Literal, Union
 from enum import Enum
 
+from app.core.config.settings import BATCH_GENERATION_MAX_ITEMS
+
 
 # Enum 정의
 class OutputFormat(str, Enum):
@@ -119,6 +121,48 @@ class SketchRequest(BaseControlRequest):
     pass
 
 
+# 배치 생성 요청 스키마들
+class BatchImageItem(BaseModel):
+    """배치 생성 항목 하나 (텍스트→이미지만 지원)"""
+    generation_type: Literal["core", "sd35", "ultra"] = Field("core", description="사용할 모델 종류")
+    prompt: str = Field(..., max_length=10000, description="생성할 이미지에 대한 설명")
+    negative_prompt: Optional[str] = Field(None, max_length=10000, description="생성하지 않을 요소들")
+    output_format: OutputFormat = Field(OutputFormat.PNG, description="출력 파일 형식")
+    aspect_ratio: AspectRatio = Field(AspectRatio.SQUARE, description="이미지 종횡비")
+    style_preset: Optional[StylePreset] = Field(None, description="스타일 프리셋")
+    seed: Optional[int] = Field(None, ge=0, le=2147483647, description="랜덤 시드 (0 또는 None = 랜덤)")
+    sd35_model: SD35Model = Field(SD35Model.LARGE, description="SD3.5 모델 (sd35에서만)")
+    cfg_scale: Optional[float] = Field(None, ge=1.0, le=10.0, description="프롬프트 준수도 (sd35에서만)")
+
+    def to_request_data(self) -> dict:
+        """모델별 생성 메서드에 넘길 요청 데이터로 변환"""
+        request_data = {
+            "prompt": self.prompt,
+            "aspect_ratio": self.aspect_ratio.value,
+            "output_format": self.output_format.value
+        }
+        if self.generation_type == "sd35":
+            request_data["mode"] = GenerationMode.TEXT_TO_IMAGE.value
+            request_data["model"] = self.sd35_model.value
+            if self.cfg_scale is not None:
+                request_data["cfg_scale"] = self.cfg_scale
+        if self.style_preset:
+            request_data["style_preset"] = self.style_preset.value
+        if self.negative_prompt:
+            request_data["negative_prompt"] = self.negative_prompt
+        if self.seed is not None:
+            request_data["seed"] = self.seed
+        return request_data
+
+
+class BatchImageRequest(BaseModel):
+    """배치 이미지 생성 요청"""
+    items: list[BatchImageItem] = Field(..., min_length=1, max_length=BATCH_GENERATION_MAX_ITEMS, description="생성할 항목들")
+    session_id: int = Field(0, description="세션 ID (크레딧 제한 단위)")
+    user_id: int = Field(0, description="사용자 ID (크레딧 제한 단위)")
+    background: bool = Field(False, description="true이면 이미지 대신 백그라운드 작업 ID를 반환")
+
+
 # 응답 스키마들
 class ImageGenerationResponse(BaseModel):
     """이미지 생성 성공 응답"""
@@ -0,0 +1,693 @@
+"""
+비동기 데이터베이스 서비스 계층
+DatabaseService와 동일한 Repository 메서드를 async로 제공
+httpx.AsyncClient 기반으로 이벤트 루프를 막지 않고 Supabase REST API 호출
+"""
+import asyncio
+import importlib.util
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+import httpx
+from fastapi import HTTPException
+
+from app.core.config.settings import (
+    SUPABASE_URL,
+    SUPABASE_HTTP2,
+    DB_POOL_SIZE,
+    DB_KEEPALIVE_CONNECTIONS,
+    DB_KEEPALIVE_EXPIRY,
+    DB_CACHE_MAX_ENTRIES,
+    DB_CACHE_TTL_SECONDS,
+    CHAT_MESSAGE_CACHE_PER_THREAD,
+    CHAT_MESSAGE_CACHE_MAX_BYTES,
+    CHAT_MESSAGE_CACHE_TTL_SECONDS,
+    GALLERY_STATS_TTL_SECONDS,
+    get_supabase_headers
+)
+from app.core.utils.cache import TTLCache, ThreadMessageCache
+from app.core.utils.pagination import keyset_filter, build_page
+
+# 재시도할 HTTP 상태 코드 (동기 DatabaseService의 Retry 설정과 동일)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 갤러리 목록 조회 시 기본 컬럼 (용량이 큰 image_url 제외)
+GALLERY_LIST_COLUMNS = "id,session_id,user_id,user_name,user_type,prompt,title,created_at,updated_at"
+
+
+class DatabaseRejectedError(HTTPException):
+    """
+    DB가 요청 자체를 거부한 경우 (429를 제외한 4xx, 다시 보내도 같은 결과)
+    기존 호출부와 같이 500 HTTPException으로 처리되며 upstream_status에 원래 상태 코드를 담음
+    """
+
+    def __init__(self, upstream_status: int, detail: str):
+        super().__init__(status_code=500, detail=detail)
+        self.upstream_status = upstream_status
+
+
+def _http2_available() -> bool:
+    """h2 패키지가 설치된 경우에만 HTTP/2 사용"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class AsyncDatabaseService:
+    """
+    비동기 데이터베이스 서비스 클래스
+    Supabase REST API를 통한 CRUD 작업 제공
+    프로세스당 하나의 인스턴스와 httpx.AsyncClient 연결 풀을 공유
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None,
+                 pool_size: int = DB_POOL_SIZE,
+                 keepalive_connections: int = DB_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = DB_KEEPALIVE_EXPIRY,
+                 max_retries: int = 3, backoff_factor: float = 1.0):
+        self.base_url = SUPABASE_URL
+        self.headers = get_supabase_headers()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        # HTTP 클라이언트 (연결 풀링) - 주입되지 않으면 직접 생성
+        # transport를 직접 넘기면 클라이언트의 http2/limits 인자는 무시되므로 transport에 설정
+        self.client = client or httpx.AsyncClient(
+            # (연결 타임아웃, 읽기 타임아웃) - 동기 서비스와 동일
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                http2=SUPABASE_HTTP2 and _http2_available(),
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=keepalive_connections,
+                    keepalive_expiry=keepalive_expiry
+                )
+            ),
+        )
+
+        # 자주 조회되는 엔티티(세션, 학생, 선생님, 채팅 스레드)용 read-through 캐시
+        self.entity_cache = TTLCache(max_entries=DB_CACHE_MAX_ENTRIES, ttl_seconds=DB_CACHE_TTL_SECONDS)
+
+        # 세션별 갤러리 통계 캐시 (생성/삭제 시 증분 갱신)
+        self.gallery_stats_cache = TTLCache(max_entries=DB_CACHE_MAX_ENTRIES, ttl_seconds=GALLERY_STATS_TTL_SECONDS)
+
+        # 채팅 스레드별 최근 메시지 캐시 (메시지 저장 시 이어 붙임)
+        self.thread_message_cache = ThreadMessageCache(
+            max_bytes=CHAT_MESSAGE_CACHE_MAX_BYTES,
+            messages_per_thread=CHAT_MESSAGE_CACHE_PER_THREAD,
+            ttl_seconds=CHAT_MESSAGE_CACHE_TTL_SECONDS
+        )
+
+    async def close(self) -> None:
+        """HTTP 클라이언트 연결 풀 정리"""
+        if not self.client.is_closed:
+            await self.client.aclose()
+
+    def _cache_session(self, session: Optional[Dict[str, Any]]) -> None:
+        """세션을 ID/클래스 코드 키로 캐시에 저장"""
+        if not session:
+            return
+        if session.get("id") is not None:
+            self.entity_cache.set(("session", session["id"]), session)
+        if session.get("class_code"):
+            self.entity_cache.set(("session_code", session["class_code"]), session)
+
+    def _cache_student(self, student: Optional[Dict[str, Any]]) -> None:
+        """학생을 ID/(세션, 이름) 키로 캐시에 저장"""
+        if not student:
+            return
+        if student.get("id") is not None:
+            self.entity_cache.set(("student", student["id"]), student)
+        if student.get("session_id") is not None and student.get("name"):
+            self.entity_cache.set(("student_name", student["session_id"], student["name"]), student)
+
+    def _cache_chat_thread(self, thread: Optional[Dict[str, Any]]) -> None:
+        """채팅 스레드를 (사용자, 세션) 키로 캐시에 저장"""
+        if thread and thread.get("user_id") is not None and thread.get("session_id") is not None:
+            self.entity_cache.set(("chat_thread", thread["user_id"], thread["session_id"]), thread)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """캐시별 적중/미스 통계 반환"""
+        return {
+            "entity_cache": self.entity_cache.stats(),
+            "gallery_stats_cache": self.gallery_stats_cache.stats(),
+            "thread_message_cache": self.thread_message_cache.stats()
+        }
+
+    def _apply_gallery_stats_delta(self, item: Dict[str, Any], delta: int) -> None:
+        """
+        캐시된 세션 갤러리 통계에 아이템 생성(+1)/삭제(-1) 반영
+        캐시에 없는 세션은 다음 조회 시 새로 집계되므로 무시
+        """
+        stats = self.gallery_stats_cache.get(("gallery_stats", item.get("session_id")))
+        if stats is None:
+            return
+
+        type_key = f"{item.get('user_type')}_items"
+        if type_key in stats:
+            stats[type_key] = max(0, stats[type_key] + delta)
+
+        contributors: Counter = stats["contributors"]
+        contributor = (item.get("user_name"), item.get("user_type"))
+        contributors[contributor] += delta
+        if contributors[contributor] <= 0:
+            del contributors[contributor]
+
+    async def _send(self, method: str, url: str, json_body: Optional[Any] = None,
+                    headers: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """재시도 대상 상태 코드에 대해 지수 백오프로 재시도하며 요청 전송"""
+        attempt = 0
+        while True:
+            response = await self.client.request(method, url, headers=headers or self.headers, json=json_body)
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                # 지수 백오프 후 재시도
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                attempt += 1
+                continue
+            return response
+
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Any] = None,
+                            headers: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        HTTP 요청을 보내고 응답을 처리하는 헬퍼 메서드
+        공통 에러 처리, 재시도와 응답 파싱을 담당
+
+        Args:
+            method: HTTP 메서드 (GET, POST, PUT, PATCH, DELETE)
+            endpoint: API 엔드포인트
+            data: 요청 본문 데이터
+            headers: 기본 헤더 대신 사용할 요청 헤더 (선택)
+
+        Returns:
+            API 응답 데이터
+
+        Raises:
+            DatabaseRejectedError: DB가 요청을 거부한 경우 (4xx)
+            HTTPException: 그 밖의 요청 실패 시
+        """
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'PATCH', 'DELETE'):
+            raise HTTPException(status_code=400, detail="Unsupported HTTP method")
+
+        url = f"{self.base_url}/rest/v1/{endpoint}"
+        json_body = data if method in ('POST', 'PUT', 'PATCH') else None
+
+        try:
+            response = await self._send(method, url, json_body, headers)
+            response.raise_for_status()
+            if not response.content:
+                return []
+            return response.json()
+
+        except httpx.ConnectError as e:
+            print(f"🔴 Database connection error: {str(e)}")
+            raise HTTPException(status_code=503, detail="Database connection failed")
+        except httpx.TimeoutException as e:
+            print(f"🔴 Database timeout error: {str(e)}")
+            raise HTTPException(status_code=504, detail="Database request timeout")
+        except httpx.HTTPStatusError as e:
+            print(f"🔴 Database request error: {str(e)}")
+            status_code = e.response.status_code
+            if 400 <= status_code < 500 and status_code not in RETRY_STATUS_CODES:
+                raise DatabaseRejectedError(status_code, f"Database error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+        except httpx.HTTPError as e:
+            print(f"🔴 Database request error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    async def _count_request(self, endpoint: str) -> int:
+        """
+        행 데이터 없이 개수만 조회 (HEAD + Prefer: count=exact)
+        Content-Range 헤더의 전체 개수를 파싱하여 반환
+
+        Args:
+            endpoint: 필터가 포함된 API 엔드포인트
+
+        Returns:
+            조건에 맞는 행 수
+
+        Raises:
+            HTTPException: 요청 실패 시
+        """
+        url = f"{self.base_url}/rest/v1/{endpoint}"
+        headers = {**self.headers, "Prefer": "count=exact"}
+
+        try:
+            response = await self._send('HEAD', url, headers=headers)
+            response.raise_for_status()
+            # 예: "0-9/42" 또는 "*/0"
+            total = response.headers.get("content-range", "").rpartition("/")[2]
+            return int(total) if total.isdigit() else 0
+
+        except httpx.ConnectError as e:
+            print(f"🔴 Database connection error: {str(e)}")
+            raise HTTPException(status_code=503, detail="Database connection failed")
+        except httpx.TimeoutException as e:
+            print(f"🔴 Database timeout error: {str(e)}")
+            raise HTTPException(status_code=504, detail="Database request timeout")
+        except httpx.HTTPError as e:
+            print(f"🔴 Database request error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    # 선생님 관련 데이터베이스 작업
+    async def get_teacher_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """이메일로 선생님 정보 조회"""
+        cache_key = ("teacher_email", email)
+        cached = self.entity_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        teachers = await self._make_request('GET', f'teachers?email=eq.{email}')
+        teacher = teachers[0] if teachers else None
+        if teacher:
+            self.entity_cache.set(cache_key, teacher)
+        return teacher
+
+    async def create_teacher(self, teacher_data: Dict[str, Any]) -> Dict[str, Any]:
+        """선생님 정보 생성"""
+        self.entity_cache.invalidate(("teacher_email", teacher_data.get("email")))
+        result = await self._make_request('POST', 'teachers', teacher_data)
+        return result[0] if isinstance(result, list) else result
+
+    async def get_teacher_sessions(self, teacher_id: int) -> List[Dict[str, Any]]:
+        """선생님의 클래스 세션 목록 조회"""
+        return await self._make_request('GET', f'class_sessions?teacher_id=eq.{teacher_id}')
+
+    # 클래스 세션 관련 데이터베이스 작업
+    async def get_session_by_class_code(self, class_code: str) -> Optional[Dict[str, Any]]:
+        """클래스 코드로 세션 조회"""
+        cached = self.entity_cache.get(("session_code", class_code))
+        if cached is not None:
+            return cached
+
+        sessions = await self._make_request('GET', f'class_sessions?class_code=eq.{class_code}')
+        session = sessions[0] if sessions else None
+        self._cache_session(session)
+        return session
+
+    async def create_class_session(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """클래스 세션 생성"""
+        self.entity_cache.invalidate(("session_code", session_data.get("class_code")))
+        result = await self._make_request('POST', 'class_sessions', session_data)
+        session = result[0] if isinstance(result, list) else result
+        self._cache_session(session)
+        return session
+
+    async def get_session_students(self, session_id: int) -> List[Dict[str, Any]]:
+        """세션에 참여한 학생 목록 조회"""
+        return await self._make_request('GET', f'students?session_id=eq.{session_id}')
+
+    # 학생 관련 데이터베이스 작업
+    async def get_student_by_name_and_code(self, name: str, class_code: str) -> Optional[Dict[str, Any]]:
+        """이름과 클래스 코드로 학생 조회"""
+        students = await self._make_request('GET', f'students?name=eq.{name}&class_code=eq.{class_code}')
+        return students[0] if students else None
+
+    async def create_student(self, student_data: Dict[str, Any]) -> Dict[str, Any]:
+        """학생 정보 생성"""
+        self.entity_cache.invalidate(("student_name", student_data.get("session_id"), student_data.get("name")))
+        result = await self._make_request('POST', 'students', student_data)
+        student = result[0] if isinstance(result, list) else result
+        self._cache_student(student)
+        return student
+
+    # 채팅 스레드 관련 데이터베이스 작업
+    async def get_or_create_chat_thread(self, user_id: int, session_id: int) -> Dict[str, Any]:
+        """
+        사용자별 채팅 스레드 조회 또는 생성
+        (user_id, session_id) 유니크 키 기준 upsert로 한 번의 요청에 처리하여
+        첫 메시지가 동시에 들어와도 스레드가 중복 생성되지 않음
+        """
+        cache_key = ("chat_thread", user_id, session_id)
+        cached = self.entity_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        headers = {**self.headers, "Prefer": "resolution=merge-duplicates,return=representation"}
+        thread_data = {
+            "user_id": user_id,
+            "session_id": session_id
+        }
+        result = await self._make_request('POST', 'chat_threads?on_conflict=user_id,session_id', thread_data, headers)
+        thread = result[0] if isinstance(result, list) else result
+        self._cache_chat_thread(thread)
+        return thread
+
+    async def get_thread_messages(self, thread_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """스레드의 채팅 메시지 조회 (시간순)"""
+        cached = self.thread_message_cache.get_oldest(thread_id, limit)
+        if cached is not None:
+            return cached
+
+        # 한 번만 조회하고, limit개를 다 채우지 못했으면 스레드 전체이므로 캐시에 저장
+        self.thread_message_cache.begin_load(thread_id)
+        try:
+            messages = await self._make_request(
+                'GET', f'chat_messages?thread_id=eq.{thread_id}&order=created_at.asc&limit={limit}'
+            )
+        except Exception:
+            self.thread_message_cache.cancel_load(thread_id)
+            raise
+        if len(messages) < limit:
+            self.thread_message_cache.store(thread_id, messages, complete=True)
+        else:
+            self.thread_message_cache.cancel_load(thread_id)
+        return messages
+
+    async def get_recent_thread_messages(self, thread_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """스레드의 최근 메시지 limit개 조회 (시간순으로 정렬하여 반환)"""
+        cached = self.thread_message_cache.get_recent(thread_id, limit)
+        if cached is not None:
+            return cached
+
+        if limit > self.thread_message_cache.messages_per_thread:
+            messages = await self._make_request(
+                'GET', f'chat_messages?thread_id=eq.{thread_id}&order=id.desc&limit={limit}'
+            )
+            return list(reversed(messages))
+
+        messages = await self._load_thread_messages(thread_id)
+        return messages[-limit:] if limit > 0 else []
+
+    async def _load_thread_messages(self, thread_id: int) -> List[Dict[str, Any]]:
+        """스레드의 최근 메시지를 캐시 크기만큼 읽어 메시지 캐시 채우기 (시간순으로 반환)"""
+        capacity = self.thread_message_cache.messages_per_thread
+        self.thread_message_cache.begin_load(thread_id)
+        try:
+            messages = await self._make_request(
+                'GET', f'chat_messages?thread_id=eq.{thread_id}&order=id.desc&limit={capacity}'
+            )
+        except Exception:
+            self.thread_message_cache.cancel_load(thread_id)
+            raise
+        messages = list(reversed(messages))
+        self.thread_message_cache.store(thread_id, messages, complete=len(messages) < capacity)
+        return messages
+
+    async def update_chat_thread_summary(self, thread_id: int, summary: str, summary_until_id: int) -> None:
+        """스레드의 이전 대화 요약과 요약에 포함된 마지막 메시지 ID 저장 (캐시된 스레드도 갱신)"""
+        result = await self._make_request('PATCH', f'chat_threads?id=eq.{thread_id}', {
+            "summary": summary,
+            "summary_until_id": summary_until_id
+        })
+        for thread in result if isinstance(result, list) else [result]:
+            self._cache_chat_thread(thread)
+
+    async def create_thread_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """스레드에 메시지 생성"""
+        result = await self._make_request('POST', 'chat_messages', message_data)
+        message = result[0] if isinstance(result, list) else result
+        if message:
+            self.thread_message_cache.append(message_data.get("thread_id"), message)
+        return message
+
+    async def create_thread_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        여러 메시지를 한 번의 요청으로 생성 (PostgREST 배열 POST)
+
+        Returns:
+            저장된 메시지 목록 (요청 순서와 동일)
+        """
+        if not messages:
+            return []
+        result = await self._make_request('POST', 'chat_messages', messages)
+        return result if isinstance(result, list) else [result]
+
+    # 갤러리 관련 데이터베이스 작업
+    async def create_gallery_item(self, session_id: int, user_id: int, user_name: str,
+                                  user_type: str, image_url: str, prompt: str,
+                                  title: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """갤러리 아이템 생성"""
+        try:
+            gallery_data = {
+                "session_id": session_id,
+                "user_id": user_id,
+                "user_name": user_name,
+                "user_type": user_type,
+                "image_url": image_url,
+                "prompt": prompt,
+                "title": title,
+                "created_at": "now()",
+                "updated_at": "now()"
+            }
+            result = await self._make_request('POST', 'gallery_items', gallery_data)
+            item = result[0] if isinstance(result, list) else result
+            if item:
+                self._apply_gallery_stats_delta(item, 1)
+            return item
+        except Exception as e:
+            print(f"🔴 Error creating gallery item: {str(e)}")
+            return None
+
+    async def get_gallery_stats(self, session_id: int) -> Dict[str, Any]:
+        """
+        세션별 갤러리 통계 조회
+        아이템 수는 count-only 요청으로, 참여자 수는 작성자 컬럼만 조회하여 집계하고
+        결과는 세션별로 캐시 (이후 생성/삭제 시 증분 갱신)
+
+        Returns:
+            total_items, student_items, teacher_items, unique_contributors를 담은 딕셔너리
+        """
+        cache_key = ("gallery_stats", session_id)
+        stats = self.gallery_stats_cache.get(cache_key)
+
+        if stats is None:
+            student_items, teacher_items, contributors = await asyncio.gather(
+                self._count_request(f'gallery_items?session_id=eq.{session_id}&user_type=eq.student'),
+                self._count_request(f'gallery_items?session_id=eq.{session_id}&user_type=eq.teacher'),
+                self._make_request('GET', f'gallery_items?select=user_name,user_type&session_id=eq.{session_id}')
+            )
+            stats = {
+                "student_items": student_items,
+                "teacher_items": teacher_items,
+                "contributors": Counter((row["user_name"], row["user_type"]) for row in contributors)
+            }
+            self.gallery_stats_cache.set(cache_key, stats)
+
+        return {
+            "total_items": stats["student_items"] + stats["teacher_items"],
+            "student_items": stats["student_items"],
+            "teacher_items": stats["teacher_items"],
+            "unique_contributors": len(stats["contributors"])
+        }
+
+    async def get_gallery_items_page(self, session_id: Optional[int] = None,
+                                     user_id: Optional[int] = None, user_type: Optional[str] = None,
+                                     cursor: Optional[str] = None, limit: int = 24,
+                                     include_image: bool = False) -> Dict[str, Any]:
+        """
+        갤러리 아이템 키셋 페이지 조회 (최신순)
+        (created_at, id) 커서 기준으로 다음 페이지를 조회하고 필요한 컬럼만 선택
+
+        Args:
+            session_id: 세션 ID 필터
+            user_id: 사용자 ID 필터
+            user_type: 사용자 타입 필터
+            cursor: 이전 페이지의 next_cursor (없으면 첫 페이지)
+            limit: 페이지 크기
+            include_image: image_url 컬럼 포함 여부
+
+        Returns:
+            items, next_cursor, has_more를 담은 딕셔너리
+
+        Raises:
+            ValueError: 커서 형식이 올바르지 않은 경우
+        """
+        columns = GALLERY_LIST_COLUMNS + (",image_url" if include_image else "")
+        filters = ""
+        if session_id is not None:
+            filters += f"&session_id=eq.{session_id}"
+        if user_id is not None:
+            filters += f"&user_id=eq.{user_id}"
+        if user_type is not None:
+            filters += f"&user_type=eq.{user_type}"
+        filters += keyset_filter(cursor)
+
+        try:
+            rows = await self._make_request(
+                'GET',
+                f'gallery_items?select={columns}{filters}&order=created_at.desc,id.desc&limit={limit + 1}'
+            )
+            return build_page(rows, limit)
+        except Exception as e:
+            print(f"🔴 Error fetching gallery page: {str(e)}")
+            return {"items": [], "next_cursor": None, "has_more": False}
+
+    async def get_gallery_item_by_id(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 갤러리 아이템 조회"""
+        try:
+            items = await self._make_request('GET', f'gallery_items?id=eq.{item_id}')
+            return items[0] if items else None
+        except Exception as e:
+            print(f"🔴 Error fetching gallery item: {str(e)}")
+            return None
+
+    async def get_gallery_item_image_info(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """
+        갤러리 아이템의 image_url과 session_id만 조회 (이미지 서빙용)
+        이미지 저장소 URL만 캐시하고, 아직 이전되지 않은 data: URL(수 MB)은 캐시하지 않음
+        """
+        cache_key = ("gallery_image", item_id)
+        cached = self.entity_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            items = await self._make_request('GET', f'gallery_items?select=image_url,session_id&id=eq.{item_id}')
+            info = items[0] if items and items[0].get("image_url") else None
+            if info and not info["image_url"].startswith("data:"):
+                self.entity_cache.set(cache_key, info)
+            return info
+        except Exception as e:
+            print(f"🔴 Error fetching gallery image url: {str(e)}")
+            return None
+
+    async def delete_gallery_item(self, item_id: int) -> bool:
+        """갤러리 아이템 삭제"""
+        try:
+            # 삭제된 행의 통계용 컬럼만 돌려받아 통계 캐시에 반영
+            deleted = await self._make_request(
+                'DELETE', f'gallery_items?id=eq.{item_id}&select=id,session_id,user_name,user_type'
+            )
+            for item in deleted if isinstance(deleted, list) else []:
+                self._apply_gallery_stats_delta(item, -1)
+            self.entity_cache.invalidate(("gallery_image", item_id))
+            return True
+        except Exception as e:
+            print(f"🔴 Error deleting gallery item: {str(e)}")
+            return False
+
+    async def get_gallery_items_by_user(self, user_id: int, user_type: str) -> List[Dict[str, Any]]:
+        """사용자별 갤러리 아이템 조회"""
+        try:
+            return await self._make_request('GET', f'gallery_items?user_id=eq.{user_id}&user_type=eq.{user_type}&order=created_at.desc')
+        except Exception as e:
+            print(f"🔴 Error fetching user gallery items: {str(e)}")
+            return []
+
+    async def get_inline_image_gallery_items(self, after_id: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """이미지가 data: URL로 행에 직접 저장된 갤러리 아이템 조회 (ID 오름차순, 마이그레이션용)"""
+        return await self._make_request(
+            'GET',
+            f'gallery_items?select=id,image_url&image_url=like.data:*&id=gt.{after_id}&order=id.asc&limit={limit}'
+        )
+
+    async def update_gallery_item(self, item_id: int, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """갤러리 아이템 업데이트"""
+        try:
+            update_data["updated_at"] = "now()"
+            result = await self._make_request('PATCH', f'gallery_items?id=eq.{item_id}', update_data)
+            self.entity_cache.invalidate(("gallery_image", item_id))
+            return result[0] if isinstance(result, list) and result else None
+        except Exception as e:
+            print(f"🔴 Error updating gallery item: {str(e)}")
+            return None
+
+    # 추가 헬퍼 메서드들
+    async def get_session_by_id(self, session_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 세션 조회"""
+        cached = self.entity_cache.get(("session", session_id))
+        if cached is not None:
+            return cached
+
+        try:
+            sessions = await self._make_request('GET', f'class_sessions?id=eq.{session_id}')
+            session = sessions[0] if sessions else None
+            self._cache_session(session)
+            return session
+        except Exception as e:
+            print(f"🔴 Error fetching session: {str(e)}")
+            return None
+
+    async def get_student_by_id(self, student_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 학생 조회"""
+        cached = self.entity_cache.get(("student", student_id))
+        if cached is not None:
+            return cached
+
+        try:
+            students = await self._make_request('GET', f'students?id=eq.{student_id}')
+            student = students[0] if students else None
+            self._cache_student(student)
+            return student
+        except Exception as e:
+            print(f"🔴 Error fetching student: {str(e)}")
+            return None
+
+    async def get_student_by_session_and_name(self, session_id: int, name: str) -> Optional[Dict[str, Any]]:
+        """세션과 이름으로 학생 조회"""
+        cached = self.entity_cache.get(("student_name", session_id, name))
+        if cached is not None:
+            return cached
+
+        try:
+            students = await self._make_request('GET', f'students?session_id=eq.{session_id}&name=eq.{name}')
+            student = students[0] if students else None
+            self._cache_student(student)
+            return student
+        except Exception as e:
+            print(f"🔴 Error fetching student by session and name: {str(e)}")
+            return None
+
+    async def delete_session(self, session_id: int) -> bool:
+        """
+        세션 삭제 및 관련 데이터 정리
+        CASCADE 설정으로 관련된 데이터들이 자동으로 삭제됨
+        """
+        try:
+            # 세션 삭제 (DB에서 CASCADE로 관련 테이블도 자동 삭제)
+            await self._make_request('DELETE', f'class_sessions?id=eq.{session_id}')
+
+            # 삭제된 세션의 채팅 스레드 (메시지 캐시도 함께 무효화)
+            thread_ids = [
+                value.get("id") for key, value in self.entity_cache.items()
+                if key[0] == "chat_thread" and value.get("session_id") == session_id
+            ]
+
+            # 삭제된 세션과 소속 학생, 채팅 스레드의 캐시 무효화
+            self.entity_cache.invalidate_where(
+                lambda key, value: (
+                    (key[0] in ("session", "session_code") and value.get("id") == session_id) or
+                    (key[0] in ("student", "student_name", "chat_thread") and value.get("session_id") == session_id)
+                )
+            )
+            for thread_id in thread_ids:
+                self.thread_message_cache.invalidate(thread_id)
+            self.gallery_stats_cache.invalidate(("gallery_stats", session_id))
+            print(f"✅ Session {session_id} deleted successfully")
+            return True
+        except Exception as e:
+            print(f"🔴 Error deleting session {session_id}: {str(e)}")
+            raise e
+
+
+# 프로세스 전역 싱글톤 인스턴스 (FastAPI lifespan에서 생성/정리)
+_database_service: Optional[AsyncDatabaseService] = None
+
+
+async def init_database_service() -> AsyncDatabaseService:
+    """애플리케이션 시작 시 공유 데이터베이스 서비스 생성"""
+    global _database_service
+    if _database_service is None:
+        _database_service = AsyncDatabaseService()
+    return _database_service
+
+
+async def close_database_service() -> None:
+    """애플리케이션 종료 시 연결 풀 정리"""
+    global _database_service
+    if _database_service is not None:
+        await _database_service.close()
+        _database_service = None
+
+
+def get_database_service() -> AsyncDatabaseService:
+    """
+    공유 데이터베이스 서비스 의존성
+    FastAPI Depends로 주입하여 요청 간 연결을 재사용
+
+    lifespan 밖(스크립트 등)에서 호출되면 인스턴스를 지연 생성
+    """
+    global _database_service
+    if _database_service is None:
+        _database_service = AsyncDatabaseService()
+    return _database_service
@@ -0,0 +1,142 @@
+"""
+채팅 컨텍스트 구성
+대화 기록을 그대로 다시 보내지 않고 토큰 예산(CHAT_CONTEXT_MAX_TOKENS) 안에 맞춰 구성
+
+- 시스템 프롬프트, 이전 대화 요약, 현재 메시지를 먼저 예산에서 빼고
+  남은 예산만큼 최근 메시지부터 거꾸로 채움 (긴 메시지는 CHAT_CONTEXT_MESSAGE_MAX_TOKENS로 잘라냄)
+- 예산을 넘어 빠진 오래된 메시지는 백그라운드에서 롤링 요약으로 합쳐
+  chat_threads.summary / summary_until_id에 저장하고 다음 요청부터 요약으로 대체
+- 첨부 파일은 저장된 메시지에 파일 이름만 남아 있으므로 기록에서는 참조로만 전달됨
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.core.config.settings import (
+    CHAT_CONTEXT_MAX_TOKENS,
+    CHAT_CONTEXT_FETCH_LIMIT,
+    CHAT_CONTEXT_MESSAGE_MAX_TOKENS,
+    CHAT_SUMMARY_MAX_TOKENS
+)
+from app.core.services.async_database_service import AsyncDatabaseService
+from app.core.services.openai_service import OpenAIService
+from app.core.utils.tokens import count_message_tokens, truncate_to_tokens
+
+# 스레드별 진행 중인 요약 작업 (같은 스레드 요약이 동시에 여러 번 실행되지 않도록)
+_summary_tasks: Dict[int, asyncio.Task] = {}
+
+
+async def load_context_messages(db_service: AsyncDatabaseService, thread: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """스레드의 최근 메시지 중 아직 요약에 포함되지 않은 메시지 조회 (시간순)"""
+    messages = await db_service.get_recent_thread_messages(thread["id"], limit=CHAT_CONTEXT_FETCH_LIMIT)
+    summary_until_id = thread.get("summary_until_id") or 0
+    # 아직 저장 대기 중인 메시지(id 없음)는 항상 요약 이후 메시지
+    return [msg for msg in messages if msg.get("id") is None or msg["id"] > summary_until_id]
+
+
+def _to_openai_message(msg: Dict[str, Any], model: Optional[str]) -> Dict[str, str]:
+    """DB 메시지를 OpenAI 메시지 형식으로 변환 (너무 긴 메시지는 잘라냄)"""
+    return {
+        "role": "assistant" if msg["is_ai_response"] else "user",
+        "content": truncate_to_tokens(msg["message"] or "", CHAT_CONTEXT_MESSAGE_MAX_TOKENS, model)
+    }
+
+
+def build_chat_context(
+    openai_service: OpenAIService,
+    db_service: AsyncDatabaseService,
+    thread: Optional[Dict[str, Any]],
+    previous_messages: List[Dict[str, Any]],
+    current_message: Dict[str, Any],
+    user_context: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    토큰 예산에 맞춘 OpenAI 메시지 목록 구성
+
+    Args:
+        openai_service: 토큰 계산용 모델과 요약 생성에 사용
+        db_service: 요약 저장에 사용
+        thread: chat_threads 행 (DB 연결 실패 시 None)
+        previous_messages: load_context_messages로 조회한 메시지 (시간순)
+        current_message: 현재 사용자 메시지 (OpenAI 형식, 멀티모달 가능)
+        user_context: 시스템 프롬프트 구성용 사용자 정보
+
+    Returns:
+        시스템 프롬프트를 제외한 메시지 목록 (요약 → 최근 기록 → 현재 메시지)
+    """
+    model = openai_service.model
+    summary = (thread or {}).get("summary")
+
+    budget = CHAT_CONTEXT_MAX_TOKENS
+    budget -= count_message_tokens(openai_service._create_system_message(user_context), model)
+    budget -= count_message_tokens(current_message, model)
+
+    summary_message = None
+    if summary:
+        summary_message = {
+            "role": "system",
+            "content": "[이전 대화 요약]\n" + truncate_to_tokens(summary, CHAT_SUMMARY_MAX_TOKENS, model)
+        }
+        budget -= count_message_tokens(summary_message, model)
+
+    # 최근 메시지부터 예산이 허락하는 만큼 포함
+    history: List[Dict[str, str]] = []
+    kept = 0
+    for msg in reversed(previous_messages):
+        openai_message = _to_openai_message(msg, model)
+        tokens = count_message_tokens(openai_message, model)
+        if tokens > budget:
+            break
+        budget -= tokens
+        history.append(openai_message)
+        kept += 1
+    history.reverse()
+
+    # 예산에서 빠진 오래된 메시지는 다음 요청부터 요약으로 대체
+    # (summary_until_id로 쓸 id가 있는 저장 완료 메시지만 요약)
+    overflow = [msg for msg in previous_messages[:len(previous_messages) - kept] if msg.get("id")]
+    if thread and overflow:
+        print(f"✂️ 컨텍스트 예산 초과: Thread {thread['id']}, 메시지 {len(overflow)}개 요약 예정")
+        schedule_summary_refresh(openai_service, db_service, thread, overflow)
+
+    messages = [summary_message] if summary_message else []
+    return messages + history + [current_message]
+
+
+def schedule_summary_refresh(
+    openai_service: OpenAIService,
+    db_service: AsyncDatabaseService,
+    thread: Dict[str, Any],
+    overflow: List[Dict[str, Any]]
+) -> None:
+    """빠진 메시지를 기존 요약에 합치는 작업을 백그라운드로 실행 (스레드당 하나만)"""
+    thread_id = thread["id"]
+    task = _summary_tasks.get(thread_id)
+    if task and not task.done():
+        return
+
+    _summary_tasks[thread_id] = asyncio.create_task(
+        _refresh_summary(openai_service, db_service, thread, overflow)
+    )
+
+
+async def _refresh_summary(
+    openai_service: OpenAIService,
+    db_service: AsyncDatabaseService,
+    thread: Dict[str, Any],
+    overflow: List[Dict[str, Any]]
+) -> None:
+    """롤링 요약 갱신 후 스레드에 저장 (실패해도 채팅에는 영향 없음)"""
+    thread_id = thread["id"]
+    try:
+        model = openai_service.model
+        summary = await openai_service.summarize_conversation(
+            [_to_openai_message(msg, model) for msg in overflow],
+            previous_summary=thread.get("summary"),
+            max_tokens=CHAT_SUMMARY_MAX_TOKENS
+        )
+        await db_service.update_chat_thread_summary(thread_id, summary, overflow[-1]["id"])
+        print(f"📝 대화 요약 갱신: Thread {thread_id}, 메시지 {len(overflow)}개")
+    except Exception as e:
+        print(f"⚠️ 대화 요약 갱신 실패 (Thread {thread_id}): {str(e)}")
+    finally:
+        _summary_tasks.pop(thread_id, None)
@@ -0,0 +1,242 @@
+"""
+이미지 생성 크레딧 제한기
+세션(수업)별, 사용자별 토큰 버킷으로 Stability 호출 전에 모델별 크레딧을 차감
+버킷이 비면 호출하지 않고 다시 시도할 수 있는 시각(Retry-After)을 알려 줌
+
+- 버킷은 용량(capacity)까지 분당 refill_per_minute 크레딧씩 다시 채워짐
+- Stability가 429를 반환하면 Retry-After 동안 모든 요청을 바로 거절하여
+  재시도가 몰리면서 전체가 느려지는 것을 막음
+- 상태는 프로세스 메모리에 두고, CREDIT_LIMITER_STATE_FILE이 설정되면 종료 시 저장/시작 시 복원
+"""
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config.settings import (
+    CREDIT_SESSION_CAPACITY,
+    CREDIT_SESSION_REFILL_PER_MINUTE,
+    CREDIT_USER_CAPACITY,
+    CREDIT_USER_REFILL_PER_MINUTE,
+    CREDIT_LIMITER_STATE_FILE
+)
+
+# 가득 찬 버킷을 정리하기 시작하는 버킷 수
+MAX_IDLE_BUCKETS = 10000
+
+
+class CreditLimitExceeded(Exception):
+    """크레딧 버킷이 비었거나 Stability가 요청을 제한 중인 경우"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After 헤더 값 (정수 초)"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    """용량과 충전 속도를 가진 크레딧 버킷"""
+
+    def __init__(self, capacity: float, refill_per_minute: float,
+                 tokens: Optional[float] = None, updated_at: Optional[float] = None):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_minute / 60.0
+        self.tokens = capacity if tokens is None else tokens
+        self.updated_at = time.time() if updated_at is None else updated_at
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, credits: float) -> float:
+        """credits만큼 채워질 때까지 남은 시간 (초, 충분하면 0)"""
+        if self.tokens >= credits:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return math.inf
+        return (credits - self.tokens) / self.refill_per_second
+
+    @property
+    def full(self) -> bool:
+        return self.tokens >= self.capacity
+
+
+class CreditLimiter:
+    """
+    세션/사용자 토큰 버킷 기반 크레딧 제한기
+    프로세스당 하나의 인스턴스를 공유
+    """
+
+    def __init__(self, session_capacity: int = CREDIT_SESSION_CAPACITY,
+                 session_refill_per_minute: float = CREDIT_SESSION_REFILL_PER_MINUTE,
+                 user_capacity: int = CREDIT_USER_CAPACITY,
+                 user_refill_per_minute: float = CREDIT_USER_REFILL_PER_MINUTE,
+                 state_file: Optional[str] = CREDIT_LIMITER_STATE_FILE):
+        self.limits = {
+            "session": (session_capacity, session_refill_per_minute),
+            "user": (user_capacity, user_refill_per_minute)
+        }
+        self.state_file = state_file
+        self._buckets: Dict[Tuple[str, int], TokenBucket] = {}
+        self.upstream_blocked_until = 0.0
+
+        # 통계
+        self.admitted = 0
+        self.rejected = 0
+        self.credits_charged = 0
+        self.credits_refunded = 0
+
+        if state_file:
+            self.load()
+
+    def _bucket(self, scope: str, owner_id: int, now: float) -> TokenBucket:
+        key = (scope, owner_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity, refill_per_minute = self.limits[scope]
+            bucket = TokenBucket(capacity, refill_per_minute, updated_at=now)
+            self._buckets[key] = bucket
+        bucket.refill(now)
+        return bucket
+
+    def charge(self, session_id: int, user_id: int, credits: int) -> None:
+        """
+        세션과 사용자 버킷에서 크레딧 차감 (둘 다 충분할 때만)
+
+        Raises:
+            CreditLimitExceeded: 버킷이 부족하거나 Stability가 요청을 제한 중인 경우
+        """
+        now = time.time()
+        if now < self.upstream_blocked_until:
+            self.rejected += 1
+            raise CreditLimitExceeded(
+                "이미지 생성 서비스 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                self.upstream_blocked_until - now
+            )
+
+        session_bucket = self._bucket("session", session_id, now)
+        user_bucket = self._bucket("user", user_id, now)
+        session_wait = session_bucket.wait_time(credits)
+        user_wait = user_bucket.wait_time(credits)
+        if session_wait > 0 or user_wait > 0:
+            self.rejected += 1
+            scope = "수업" if session_wait >= user_wait else "사용자"
+            raise CreditLimitExceeded(
+                f"{scope} 이미지 생성 크레딧이 부족합니다. 잠시 후 다시 시도해주세요.",
+                max(session_wait, user_wait)
+            )
+
+        session_bucket.tokens -= credits
+        user_bucket.tokens -= credits
+        self.admitted += 1
+        self.credits_charged += credits
+        self._prune()
+
+    def refund(self, session_id: int, user_id: int, credits: int) -> None:
+        """생성이 실패한 경우 차감한 크레딧 반환"""
+        now = time.time()
+        for scope, owner_id in (("session", session_id), ("user", user_id)):
+            bucket = self._bucket(scope, owner_id, now)
+            bucket.tokens = min(bucket.capacity, bucket.tokens + credits)
+        self.credits_refunded += credits
+
+    def block_upstream(self, seconds: float) -> None:
+        """Stability가 429를 반환한 경우 지정 시간 동안 모든 요청 거절"""
+        self.upstream_blocked_until = max(self.upstream_blocked_until, time.time() + seconds)
+
+    def remaining(self, scope: str, owner_id: int) -> Dict[str, Any]:
+        """버킷의 남은 크레딧과 충전 정보"""
+        bucket = self._bucket(scope, owner_id, time.time())
+        capacity, refill_per_minute = self.limits[scope]
+        return {
+            "remaining": int(bucket.tokens),
+            "capacity": capacity,
+            "refill_per_minute": refill_per_minute,
+            "seconds_until_full": round(bucket.wait_time(capacity), 1)
+        }
+
+    def _prune(self) -> None:
+        """버킷이 너무 많으면 가득 찬(기본 상태와 같은) 버킷 제거"""
+        if len(self._buckets) <= MAX_IDLE_BUCKETS:
+            return
+        now = time.time()
+        for key, bucket in list(self._buckets.items()):
+            bucket.refill(now)
+            if bucket.full:
+                del self._buckets[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """허용/거절 통계 반환"""
+        return {
+            "buckets": len(self._buckets),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "credits_charged": self.credits_charged,
+            "credits_refunded": self.credits_refunded,
+            "upstream_blocked_seconds": round(max(0.0, self.upstream_blocked_until - time.time()), 1)
+        }
+
+    def save(self) -> None:
+        """버킷 상태를 state_file에 저장 (가득 찬 버킷은 생략)"""
+        if not self.state_file:
+            return
+        now = time.time()
+        buckets = []
+        for (scope, owner_id), bucket in self._buckets.items():
+            bucket.refill(now)
+            if not bucket.full:
+                buckets.append({"scope": scope, "id": owner_id, "tokens": bucket.tokens, "updated_at": now})
+        state = {"buckets": buckets, "upstream_blocked_until": self.upstream_blocked_until}
+
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_file)
+
+    def load(self) -> None:
+        """state_file에서 버킷 상태 복원 (파일이 없거나 깨졌으면 무시)"""
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Failed to load credit limiter state: {str(e)}")
+            return
+
+        for entry in state.get("buckets", []):
+            scope = entry.get("scope")
+            if scope not in self.limits:
+                continue
+            capacity, refill_per_minute = self.limits[scope]
+            self._buckets[(scope, int(entry["id"]))] = TokenBucket(
+                capacity, refill_per_minute, tokens=float(entry["tokens"]), updated_at=float(entry["updated_at"])
+            )
+        self.upstream_blocked_until = float(state.get("upstream_blocked_until", 0.0))
+
+
+# 프로세스 전역 싱글톤 인스턴스 (FastAPI lifespan에서 상태 저장)
+_credit_limiter: Optional[CreditLimiter] = None
+
+
+def get_credit_limiter() -> CreditLimiter:
+    """공유 크레딧 제한기 반환 (최초 호출 시 생성, 저장된 상태가 있으면 복원)"""
+    global _credit_limiter
+    if _credit_limiter is None:
+        _credit_limiter = CreditLimiter()
+    return _credit_limiter
+
+
+def save_credit_limiter() -> None:
+    """애플리케이션 종료 시 버킷 상태 저장"""
+    if _credit_limiter is not None:
+        try:
+            _credit_limiter.save()
+        except OSError as e:
+            print(f"⚠️ Failed to save credit limiter state: {str(e)}")
@@ -11,7 +11,7 @@ from fastapi import HTTPException
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from app.core.config.settings import SUPABASE_URL, get_supabase_headers
+from app.core.config.settings import SUPABASE_URL, DB_POOL_SIZE, get_supabase_headers
 
 
 class DatabaseService:
@@ -39,8 +39,8 @@ class DatabaseService:
         # HTTP 어댑터 설정
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
-            pool_connections=10,  # 연결 풀 크기
-            pool_maxsize=10
+            pool_connections=DB_POOL_SIZE,  # 연결 풀 크기
+            pool_maxsize=DB_POOL_SIZE
         )
         
         self.session.mount("http://", adapter)
@@ -49,7 +49,8 @@ class DatabaseService:
         # 타임아웃 설정
         self.timeout = (5, 30)  # (연결 타임아웃, 읽기 타임아웃)
 
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                      headers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         HTTP 요청을 보내고 응답을 처리하는 헬퍼 메서드
         공통 에러 처리와 응답 파싱을 담당
@@ -58,6 +59,7 @@ class DatabaseService:
             method: HTTP 메서드 (GET, POST, PUT, DELETE)
             endpoint: API 엔드포인트
             data: 요청 본문 데이터
+            headers: 기본 헤더 대신 사용할 요청 헤더 (선택)
             
         Returns:
             API 응답 데이터
@@ -66,18 +68,19 @@ class DatabaseService:
             HTTPException: 요청 실패 시
         """
         url = f"{self.base_url}/rest/v1/{endpoint}"
+        headers = headers or self.headers
         
         try:
             if method.upper() == 'GET':
-                response = self.session.get(url, headers=self.headers, timeout=self.timeout)
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
             elif method.upper() == 'POST':
-                response = self.session.post(url, headers=self.headers, json=data, timeout=self.timeout)
+                response = self.session.post(url, headers=headers, json=data, timeout=self.timeout)
             elif method.upper() == 'PUT':
-                response = self.session.put(url, headers=self.headers, json=data, timeout=self.timeout)
+                response = self.session.put(url, headers=headers, json=data, timeout=self.timeout)
             elif method.upper() == 'PATCH':
-                response = self.session.patch(url, headers=self.headers, json=data, timeout=self.timeout)
+                response = self.session.patch(url, headers=headers, json=data, timeout=self.timeout)
             elif method.upper() == 'DELETE':
-                response = self.session.delete(url, headers=self.headers, timeout=self.timeout)
+                response = self.session.delete(url, headers=headers, timeout=self.timeout)
             else:
                 raise HTTPException(status_code=400, detail="Unsupported HTTP method")
                 
@@ -142,20 +145,17 @@ class DatabaseService:
 
     # 채팅 스레드 관련 데이터베이스 작업
     def get_or_create_chat_thread(self, user_id: int, session_id: int) -> Dict[str, Any]:
-        """사용자별 채팅 스레드 조회 또는 생성"""
-        # 기존 스레드 조회
-        threads = self._make_request('GET', f'chat_threads?user_id=eq.{user_id}&session_id=eq.{session_id}')
-        
-        if threads:
-            return threads[0]
-        
-        # 새 스레드 생성
+        """
+        사용자별 채팅 스레드 조회 또는 생성
+        (user_id, session_id) 유니크 키 기준 upsert로 한 번의 요청에 처리하여
+        첫 메시지가 동시에 들어와도 스레드가 중복 생성되지 않음
+        """
+        headers = {**self.headers, "Prefer": "resolution=merge-duplicates,return=representation"}
         thread_data = {
             "user_id": user_id,
-            "session_id": session_id,
-            "created_at": "now()"
+            "session_id": session_id
         }
-        result = self._make_request('POST', 'chat_threads', thread_data)
+        result = self._make_request('POST', 'chat_threads?on_conflict=user_id,session_id', thread_data, headers)
         return result[0] if isinstance(result, list) else result
 
     def get_thread_messages(self, thread_id: int, limit: int = 50) -> List[Dict[str, Any]]:
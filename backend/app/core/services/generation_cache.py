@@ -0,0 +1,188 @@
+"""
+이미지 생성 결과 캐시
+시드가 지정된 Stability 요청은 같은 입력이면 같은 이미지를 반환하므로
+정규화된 요청(엔드포인트, 폼 필드, 입력 이미지 해시)의 SHA-256을 키로 결과를 디스크에 저장
+수업에서 같은 예시 프롬프트를 반복 생성할 때 API 호출과 크레딧 없이 바로 응답
+
+- 전체 크기가 GENERATION_CACHE_MAX_MB를 넘으면 가장 오래 사용되지 않은 결과부터 삭제 (LRU)
+- 사용 순서는 파일 mtime에 기록하여 재시작 후에도 유지
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional
+
+from app.core.config.settings import (
+    GENERATION_CACHE_ENABLED,
+    GENERATION_CACHE_DIR,
+    GENERATION_CACHE_MAX_MB
+)
+
+CACHE_FILE_SUFFIX = ".bin"
+
+
+def request_fingerprint(endpoint: str, data: Mapping[str, Any], image: Optional[bytes] = None) -> str:
+    """
+    정규화된 생성 요청의 SHA-256 해시
+
+    Args:
+        endpoint: Stability API 엔드포인트
+        data: API로 보내는 폼 필드
+        image: 입력 이미지 바이트 (image-to-image, 스케치)
+    """
+    canonical = {
+        "endpoint": endpoint,
+        "data": {key: str(value) for key, value in data.items()},
+        "image": hashlib.sha256(image).hexdigest() if image else None
+    }
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def generation_cache_key(endpoint: str, data: Mapping[str, Any],
+                         image: Optional[bytes] = None) -> Optional[str]:
+    """캐시 키 생성 (시드가 없거나 0이면 결과가 매번 달라지므로 None)"""
+    seed = data.get("seed")
+    if seed is None or str(seed) == "0":
+        return None
+    return request_fingerprint(endpoint, data, image)
+
+
+class GenerationCache:
+    """
+    크기 제한이 있는 디스크 LRU 캐시
+    프로세스당 하나의 인스턴스를 공유 (색인은 메모리, 데이터는 파일)
+    """
+
+    def __init__(self, root_dir: str = GENERATION_CACHE_DIR,
+                 max_bytes: int = GENERATION_CACHE_MAX_MB * 1024 * 1024):
+        self.root_dir = os.path.abspath(root_dir)
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # 키 -> 파일 크기 (오래된 순)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._load_index()
+
+    def path_for(self, key: str) -> str:
+        """키를 파일 경로로 변환 (앞 두 글자로 디렉터리 분산)"""
+        return os.path.join(self.root_dir, key[:2], key + CACHE_FILE_SUFFIX)
+
+    def _load_index(self) -> None:
+        """기존 파일을 mtime 순으로 색인 (재시작 후 LRU 순서 복원)"""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root_dir):
+            for filename in filenames:
+                if not filename.endswith(CACHE_FILE_SUFFIX):
+                    continue
+                stat = os.stat(os.path.join(dirpath, filename))
+                entries.append((stat.st_mtime, filename[:-len(CACHE_FILE_SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.total_bytes += size
+
+    def _read_file(self, key: str) -> Optional[bytes]:
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # 최근 사용 시각 기록
+            return data
+        except FileNotFoundError:
+            return None
+
+    def _write_file(self, key: str, data: bytes) -> None:
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _delete_file(self, key: str) -> None:
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """캐시된 결과 조회 (없으면 None)"""
+        if key not in self._index:
+            self.misses += 1
+            return None
+
+        self._index.move_to_end(key)
+        data = await asyncio.to_thread(self._read_file, key)
+        if data is None:
+            # 다른 프로세스가 삭제한 경우
+            self._forget(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    async def set(self, key: str, data: bytes) -> None:
+        """결과 저장 후 용량을 넘으면 LRU 항목 삭제"""
+        if len(data) > self.max_bytes:
+            return
+
+        await asyncio.to_thread(self._write_file, key, data)
+        self._forget(key)
+        self._index[key] = len(data)
+        self.total_bytes += len(data)
+        self.stores += 1
+
+        evicted = []
+        while self.total_bytes > self.max_bytes and self._index:
+            old_key = next(iter(self._index))
+            self._forget(old_key)
+            evicted.append(old_key)
+        for old_key in evicted:
+            await asyncio.to_thread(self._delete_file, old_key)
+        self.evictions += len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 통계와 사용량 반환"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions
+        }
+
+
+# 프로세스 전역 싱글톤 인스턴스
+_generation_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> Optional[GenerationCache]:
+    """공유 생성 결과 캐시 반환 (GENERATION_CACHE_ENABLED가 false이면 None)"""
+    global _generation_cache
+    if not GENERATION_CACHE_ENABLED:
+        return None
+    if _generation_cache is None:
+        _generation_cache = GenerationCache()
+    return _generation_cache
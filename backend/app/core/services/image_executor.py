@@ -0,0 +1,119 @@
+"""
+이미지 처리 실행기
+Pillow 디코딩/변환/인코딩 작업을 이벤트 루프 밖 프로세스 풀에서 실행
+업로드가 몰려도 채팅 스트리밍 등 다른 요청이 같은 워커에서 멈추지 않도록 함
+
+- IMAGE_WORKERS개의 프로세스로 작업을 실행 (0이면 스레드 풀 사용, 개발/테스트용)
+- 풀에 넘긴 작업이 IMAGE_MAX_PENDING개를 넘으면 호출자는 빈 자리가 날 때까지 대기
+- 대기/실행 중 작업 수와 처리 시간 통계 제공
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config.settings import IMAGE_WORKERS, IMAGE_MAX_PENDING
+
+
+class ImageProcessingExecutor:
+    """
+    크기가 제한된 이미지 처리 실행기
+    프로세스당 하나의 인스턴스를 공유
+    """
+
+    def __init__(self, max_workers: int = IMAGE_WORKERS, max_pending: int = IMAGE_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers) if max_workers > 0
+            else ThreadPoolExecutor(max_workers=1, thread_name_prefix="image")
+        )
+        self._slots = asyncio.Semaphore(max_pending)
+
+        # 큐 상태 및 처리 통계
+        self.waiting = 0        # 자리가 나기를 기다리는 작업 수
+        self.in_flight = 0      # 풀에 제출되어 대기/실행 중인 작업 수
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self._total_wait_seconds = 0.0
+        self._total_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        함수를 이미지 처리 풀에서 실행하고 결과 반환
+        func와 인자는 pickle 가능해야 함 (모듈 최상위 함수, 바이트/기본 타입)
+        """
+        enqueued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.waiting + self.in_flight)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        submitted_at = time.perf_counter()
+        self._total_wait_seconds += submitted_at - enqueued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._total_seconds += time.perf_counter() - enqueued_at
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이와 처리 시간 통계 반환"""
+        finished = self.completed + self.failed
+        return {
+            "mode": "process" if self.max_workers > 0 else "thread",
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting + self.in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": round(self._total_wait_seconds / finished * 1000, 2) if finished else 0.0,
+            "avg_total_ms": round(self._total_seconds / finished * 1000, 2) if finished else 0.0
+        }
+
+    def shutdown(self) -> None:
+        """풀 종료 (대기 중인 작업은 취소)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 프로세스 전역 싱글톤 인스턴스 (FastAPI lifespan에서 생성/정리)
+_image_executor: Optional[ImageProcessingExecutor] = None
+
+
+def init_image_executor() -> ImageProcessingExecutor:
+    """애플리케이션 시작 시 공유 이미지 처리 실행기 생성"""
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = ImageProcessingExecutor()
+    return _image_executor
+
+
+def shutdown_image_executor() -> None:
+    """애플리케이션 종료 시 이미지 처리 풀 정리"""
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown()
+        _image_executor = None
+
+
+def get_image_executor() -> ImageProcessingExecutor:
+    """
+    공유 이미지 처리 실행기 반환
+    lifespan 밖(스크립트 등)에서 호출되면 그 자리에서 생성
+    """
+    return init_image_executor()
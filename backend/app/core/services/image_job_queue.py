@@ -0,0 +1,278 @@
+"""
+이미지 생성 백그라운드 작업 큐
+Stability AI 호출을 HTTP 요청과 분리하여 실행하고 결과를 메모리에 보관
+클라이언트는 작업 ID로 상태를 조회(폴링)하거나 SSE로 완료 알림을 받음
+
+- 전체 동시 실행 수는 IMAGE_JOB_WORKERS개로 제한
+- 세션(수업)마다 IMAGE_JOB_SESSION_CONCURRENCY개까지만 동시에 실행하여
+  한 반 전체가 동시에 생성 버튼을 눌러도 다른 반을 밀어내지 않고 순서대로 처리
+- 세션당 대기+실행 작업이 IMAGE_JOB_SESSION_MAX_QUEUED개를 넘으면 제출 거부
+- 완료된 작업은 IMAGE_JOB_RESULT_TTL_SECONDS초 동안 보관 후 제거
+- publish 콜백을 넘기면 생성이 끝난 뒤 같은 작업 안에서 갤러리에 게시하고 결과 항목을 기록
+"""
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.config.settings import (
+    IMAGE_JOB_WORKERS,
+    IMAGE_JOB_SESSION_CONCURRENCY,
+    IMAGE_JOB_SESSION_MAX_QUEUED,
+    IMAGE_JOB_RESULT_TTL_SECONDS
+)
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# 생성 이미지 바이트를 받아 {"success", "item" | "error"}를 반환하는 게시 함수
+PublishCallback = Callable[[bytes], Awaitable[Dict[str, Any]]]
+
+
+class ImageJobQueueFull(Exception):
+    """세션의 대기 작업이 상한에 도달한 경우"""
+    pass
+
+
+class ImageJob:
+    """이미지 생성 작업 하나의 상태와 결과"""
+
+    def __init__(self, session_id: int, user_id: int, kind: str, media_type: str, filename: str):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.user_id = user_id
+        self.kind = kind
+        self.media_type = media_type
+        self.filename = filename
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.gallery_item: Optional[Dict[str, Any]] = None
+        self.gallery_error: Optional[str] = None
+        # 중복 게시 방지 (더블 클릭/재시도가 동시에 게시하지 않도록)
+        self.publish_lock = asyncio.Lock()
+        self.done = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 상태 정보 (결과 바이트 제외)"""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "status_code": self.status_code,
+            "gallery_item": self.gallery_item,
+            "gallery_error": self.gallery_error
+        }
+
+
+class ImageJobQueue:
+    """
+    세션별 동시 실행 제한이 있는 이미지 생성 작업 큐
+    프로세스당 하나의 인스턴스를 공유
+    """
+
+    def __init__(self, max_workers: int = IMAGE_JOB_WORKERS,
+                 session_concurrency: int = IMAGE_JOB_SESSION_CONCURRENCY,
+                 session_max_queued: int = IMAGE_JOB_SESSION_MAX_QUEUED,
+                 result_ttl: int = IMAGE_JOB_RESULT_TTL_SECONDS):
+        self.max_workers = max_workers
+        self.session_concurrency = session_concurrency
+        self.session_max_queued = session_max_queued
+        self.result_ttl = result_ttl
+        self._workers = asyncio.Semaphore(max_workers)
+        self._session_slots: Dict[int, asyncio.Semaphore] = {}
+        self._session_active: Dict[int, int] = {}
+        self._jobs: Dict[str, ImageJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+        # 처리 통계
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._total_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+
+    def submit(self, run: Callable[[], Awaitable[bytes]], session_id: int, user_id: int,
+               kind: str, media_type: str, filename: str,
+               publish: Optional[PublishCallback] = None) -> ImageJob:
+        """
+        작업 등록 후 바로 반환 (실행은 백그라운드에서 진행)
+
+        Args:
+            run: 이미지 바이트를 반환하는 코루틴 함수
+            session_id: 동시 실행 제한 단위가 되는 세션 ID
+            user_id: 요청한 사용자 ID
+            kind: 작업 종류 (core, sd35, ultra, sketch)
+            media_type: 결과 이미지 MIME 타입
+            filename: 결과 다운로드 파일명
+            publish: 생성 이미지를 갤러리에 게시하는 코루틴 함수 (선택)
+
+        Raises:
+            ImageJobQueueFull: 세션의 대기 작업이 상한에 도달한 경우
+        """
+        self._evict_expired()
+
+        if self._session_active.get(session_id, 0) >= self.session_max_queued:
+            self.rejected += 1
+            raise ImageJobQueueFull(f"세션의 이미지 생성 대기열이 가득 찼습니다 (최대 {self.session_max_queued}개)")
+
+        job = ImageJob(session_id, user_id, kind, media_type, filename)
+        self._jobs[job.id] = job
+        self._session_active[session_id] = self._session_active.get(session_id, 0) + 1
+        self._tasks[job.id] = asyncio.create_task(self._run(job, run, publish))
+        return job
+
+    def get(self, job_id: str) -> Optional[ImageJob]:
+        """작업 조회 (만료된 작업은 None)"""
+        self._evict_expired()
+        return self._jobs.get(job_id)
+
+    def position(self, job: ImageJob) -> int:
+        """같은 세션에서 이 작업보다 먼저 대기 중인 작업 수 (실행 중이거나 끝났으면 0)"""
+        if job.status != JOB_QUEUED:
+            return 0
+        return sum(
+            1 for other in self._jobs.values()
+            if other.session_id == job.session_id and other.status == JOB_QUEUED
+            and other.created_at < job.created_at
+        )
+
+    def describe(self, job: ImageJob) -> Dict[str, Any]:
+        """상태 정보에 대기 순서를 더한 딕셔너리"""
+        info = job.to_dict()
+        info["position"] = self.position(job)
+        return info
+
+    async def _run(self, job: ImageJob, run: Callable[[], Awaitable[bytes]],
+                   publish: Optional[PublishCallback] = None) -> None:
+        """세션 슬롯 -> 전체 슬롯 순으로 자리를 얻은 뒤 작업 실행"""
+        session_slots = self._session_slots.setdefault(
+            job.session_id, asyncio.Semaphore(self.session_concurrency)
+        )
+        try:
+            # 세션 슬롯을 먼저 잡아, 한 세션의 대기 작업이 전체 슬롯을 점유하지 않게 함
+            async with session_slots:
+                async with self._workers:
+                    job.status = JOB_RUNNING
+                    job.started_at = time.time()
+                    self._total_wait_seconds += job.started_at - job.created_at
+                    try:
+                        job.result = await run()
+                        if publish is not None:
+                            await self.publish(job, publish)
+                        job.status = JOB_SUCCEEDED
+                        self.completed += 1
+                    except HTTPException as e:
+                        job.status = JOB_FAILED
+                        job.error = str(e.detail)
+                        job.status_code = e.status_code
+                        self.failed += 1
+                    except Exception as e:
+                        print(f"🔴 Image job {job.id} failed: {str(e)}")
+                        job.status = JOB_FAILED
+                        job.error = "이미지 생성 중 오류가 발생했습니다"
+                        job.status_code = 500
+                        self.failed += 1
+                    self._total_run_seconds += time.time() - job.started_at
+        except asyncio.CancelledError:
+            job.status = JOB_FAILED
+            job.error = "작업이 취소되었습니다"
+            job.status_code = 503
+            raise
+        finally:
+            job.finished_at = time.time()
+            self._session_active[job.session_id] -= 1
+            if self._session_active[job.session_id] == 0:
+                del self._session_active[job.session_id]
+                self._session_slots.pop(job.session_id, None)
+            self._tasks.pop(job.id, None)
+            job.done.set()
+
+    async def publish(self, job: ImageJob, publish: PublishCallback) -> None:
+        """
+        생성 결과를 갤러리에 게시하고 항목(또는 오류)을 작업에 기록
+        게시에 실패해도 생성된 이미지는 그대로 결과로 남김
+        동시에 들어온 게시 요청은 순서대로 처리하고, 이미 게시되었으면 다시 게시하지 않음
+        """
+        async with job.publish_lock:
+            if job.gallery_item is not None:
+                return
+            published = await publish(job.result)
+            if published["success"]:
+                job.gallery_item = published["item"]
+                job.gallery_error = None
+            else:
+                job.gallery_error = published["error"]
+
+    def _evict_expired(self) -> None:
+        """보관 시간이 지난 완료 작업 제거"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 상태와 처리 시간 통계 반환"""
+        statuses = [job.status for job in self._jobs.values()]
+        finished = self.completed + self.failed
+        return {
+            "workers": self.max_workers,
+            "session_concurrency": self.session_concurrency,
+            "queued": statuses.count(JOB_QUEUED),
+            "running": statuses.count(JOB_RUNNING),
+            "stored_results": statuses.count(JOB_SUCCEEDED) + statuses.count(JOB_FAILED),
+            "active_sessions": len(self._session_active),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self._total_wait_seconds / finished * 1000, 2) if finished else 0.0,
+            "avg_run_ms": round(self._total_run_seconds / finished * 1000, 2) if finished else 0.0
+        }
+
+    async def shutdown(self) -> None:
+        """실행/대기 중인 작업 취소"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# 프로세스 전역 싱글톤 인스턴스 (FastAPI lifespan에서 정리)
+_image_job_queue: Optional[ImageJobQueue] = None
+
+
+def get_image_job_queue() -> ImageJobQueue:
+    """공유 이미지 생성 작업 큐 반환 (최초 호출 시 생성)"""
+    global _image_job_queue
+    if _image_job_queue is None:
+        _image_job_queue = ImageJobQueue()
+    return _image_job_queue
+
+
+async def shutdown_image_job_queue() -> None:
+    """애플리케이션 종료 시 남은 작업 취소"""
+    global _image_job_queue
+    if _image_job_queue is not None:
+        await _image_job_queue.shutdown()
+        _image_job_queue = None
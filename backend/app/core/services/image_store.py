@@ -0,0 +1,507 @@
+"""
+이미지 저장소 서비스
+갤러리 이미지 바이트를 DB 행 대신 별도 저장소에 보관
+SHA-256 콘텐츠 주소 방식으로 저장하여 같은 이미지는 한 번만 저장되고,
+DB에는 이미지 URL만 기록
+
+지원 백엔드:
+- local: 로컬 파일 시스템 (IMAGE_STORE_DIR)
+- s3: S3 호환 오브젝트 스토리지 (AWS S3, MinIO 등, boto3 필요)
+
+저장소 URL은 DB 행에서 저장 키를 찾는 데만 사용하고 API 응답에는 내보내지 않음
+이미지는 세션 접근 권한을 확인하는 /gallery/image/{id}로만 제공 (public_gallery_item)
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config.settings import (
+    GALLERY_RENDITION_SIZES,
+    GALLERY_RENDITION_FORMATS,
+    IMAGE_STORE_BACKEND,
+    IMAGE_STORE_DIR,
+    IMAGE_PUBLIC_BASE_URL,
+    S3_ENDPOINT_URL,
+    S3_BUCKET,
+    S3_ACCESS_KEY,
+    S3_SECRET_KEY,
+    S3_REGION
+)
+from app.core.utils.image_renditions import supported_formats
+from app.core.utils.image_processing import build_renditions
+from app.core.services.image_executor import get_image_executor
+
+# 이미지 포맷별 확장자와 Content-Type
+IMAGE_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "WEBP": ("webp", "image/webp"),
+    "AVIF": ("avif", "image/avif"),
+}
+
+# 저장소 내 이미지 키 접두사
+IMAGE_KEY_PREFIX = "images"
+RENDITION_KEY_PREFIX = "renditions"
+
+# 실제로 생성할 렌디션 포맷 (Pillow가 지원하는 것만)
+RENDITION_FORMATS = supported_formats(GALLERY_RENDITION_FORMATS)
+
+# 스트리밍 시 한 번에 읽는 바이트 수
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def content_key(data: bytes, image_format: str) -> str:
+    """
+    이미지 바이트의 SHA-256으로 저장 키 생성
+    디렉터리당 파일 수를 줄이기 위해 해시 앞 2자리로 분산
+
+    예: images/3f/3fa9...c1.jpg
+    """
+    return digest_key(hashlib.sha256(data).hexdigest(), image_format)
+
+
+def digest_key(digest: str, image_format: str) -> str:
+    """SHA-256 해시로 원본 이미지 저장 키 생성"""
+    extension = IMAGE_FORMATS.get(image_format.upper(), ("bin", ""))[0]
+    return f"{IMAGE_KEY_PREFIX}/{digest[:2]}/{digest}.{extension}"
+
+
+def rendition_key(digest: str, size: str, image_format: str) -> str:
+    """
+    원본 해시 기준 렌디션 저장 키 생성
+    렌디션은 원본에서 결정적으로 만들어지므로 원본 해시만으로 위치가 정해짐
+
+    예: renditions/3f/3fa9...c1/640.webp
+    """
+    extension = IMAGE_FORMATS[image_format][0]
+    return f"{RENDITION_KEY_PREFIX}/{digest[:2]}/{digest}/{size}.{extension}"
+
+
+def digest_from_key(key: str) -> str:
+    """저장 키에서 SHA-256 해시 추출 (ETag 등에 사용)"""
+    return os.path.basename(key).split(".", 1)[0]
+
+
+def content_type_for_key(key: str) -> str:
+    """저장 키의 확장자로 Content-Type 추정"""
+    extension = key.rsplit(".", 1)[-1].lower()
+    for ext, content_type in IMAGE_FORMATS.values():
+        if ext == extension:
+            return content_type
+    return "application/octet-stream"
+
+
+# data: URL의 MIME 타입별 이미지 포맷
+MIME_FORMATS = {
+    "image/jpeg": "JPEG",
+    "image/jpg": "JPEG",
+    "image/png": "PNG",
+    "image/webp": "WEBP",
+}
+
+
+def parse_data_url(data_url: str) -> Optional[Tuple[bytes, str]]:
+    """
+    data:image/...;base64,... 형식을 (이미지 바이트, 포맷)으로 변환
+
+    Returns:
+        (bytes, format) 또는 형식이 올바르지 않으면 None
+    """
+    header, _, payload = data_url.partition(",")
+    if not header.startswith("data:") or not header.endswith(";base64"):
+        return None
+
+    mime_type = header[len("data:"):-len(";base64")].lower()
+    image_format = MIME_FORMATS.get(mime_type)
+    if not image_format:
+        return None
+
+    try:
+        return base64.b64decode(payload, validate=True), image_format
+    except (binascii.Error, ValueError):
+        return None
+
+
+def gallery_image_path(item_id: int) -> str:
+    """갤러리 이미지를 권한 확인 후 제공하는 API 경로 (user_id/user_type 쿼리 필요)"""
+    return f"/gallery/image/{item_id}"
+
+
+def public_gallery_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """API 응답용 갤러리 아이템 사본 (image_url의 저장소 URL을 /gallery/image 경로로 교체)"""
+    if not item.get("image_url"):
+        return item
+    return {**item, "image_url": gallery_image_path(item["id"])}
+
+
+async def iter_memory_range(data: bytes, start: int = 0, end: Optional[int] = None,
+                            chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """메모리에 있는 이미지 바이트의 [start, end] 구간을 청크 단위로 내보냄"""
+    stop = len(data) if end is None else end + 1
+    view = memoryview(data)
+    for offset in range(start, stop, chunk_size):
+        yield bytes(view[offset:min(offset + chunk_size, stop)])
+
+
+class ImageStore(ABC):
+    """
+    이미지 저장소 기본 클래스
+    각 백엔드는 _write/_read/_exists/_delete/_size/_iter_range를 구현
+    """
+
+    def __init__(self, public_base_url: str):
+        self.public_base_url = public_base_url.rstrip("/")
+
+    def url_for(self, key: str) -> str:
+        """저장 키를 공개 URL로 변환"""
+        return f"{self.public_base_url}/{key}"
+
+    def key_from_url(self, url: str) -> Optional[str]:
+        """이 저장소의 공개 URL에서 저장 키 추출 (다른 URL이면 None)"""
+        prefix = f"{self.public_base_url}/"
+        if url and url.startswith(prefix):
+            return url[len(prefix):]
+        return None
+
+    async def save(self, data: bytes, image_format: str) -> str:
+        """
+        이미지를 저장하고 공개 URL 반환
+        같은 내용의 이미지가 이미 있으면 다시 쓰지 않음
+
+        Args:
+            data: 이미지 바이트
+            image_format: PIL 이미지 포맷 (JPEG, PNG, WEBP)
+
+        Returns:
+            저장된 이미지의 공개 URL
+        """
+        key = content_key(data, image_format)
+        await self.put(key, data)
+        return self.url_for(key)
+
+    async def put(self, key: str, data: bytes) -> None:
+        """지정한 키로 저장 (이미 있으면 건너뜀)"""
+        if not await self.exists(key):
+            await self._write(key, data, content_type_for_key(key))
+
+    async def load(self, key: str) -> Optional[bytes]:
+        """저장 키로 이미지 바이트 조회 (없으면 None)"""
+        return await self._read(key)
+
+    async def exists(self, key: str) -> bool:
+        """저장 키 존재 여부 확인"""
+        return await self._exists(key)
+
+    async def delete(self, key: str) -> None:
+        """저장 키 삭제"""
+        await self._delete(key)
+
+    async def size(self, key: str) -> Optional[int]:
+        """저장된 이미지 크기 (바이트, 없으면 None)"""
+        return await self._size(key)
+
+    async def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None,
+                         chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        이미지의 [start, end] 구간을 청크 단위로 스트리밍
+
+        Args:
+            key: 저장 키
+            start: 시작 바이트 위치
+            end: 마지막 바이트 위치 (포함, None이면 끝까지)
+            chunk_size: 청크 크기
+        """
+        async for chunk in self._iter_range(key, start, end, chunk_size):
+            yield chunk
+
+    @abstractmethod
+    async def _write(self, key: str, data: bytes, content_type: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _read(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _size(self, key: str) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _iter_range(self, key: str, start: int, end: Optional[int], chunk_size: int) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+
+class LocalImageStore(ImageStore):
+    """
+    로컬 파일 시스템 이미지 저장소
+    임시 파일에 쓴 뒤 rename하여 부분적으로 쓰인 파일이 노출되지 않도록 함
+    """
+
+    def __init__(self, root_dir: str, public_base_url: str):
+        super().__init__(public_base_url)
+        self.root_dir = os.path.abspath(root_dir)
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        """저장 키를 파일 경로로 변환 (루트 밖 경로 차단)"""
+        path = os.path.abspath(os.path.join(self.root_dir, key))
+        if not path.startswith(self.root_dir + os.sep):
+            raise ValueError("Invalid image key")
+        return path
+
+    def _write_file(self, key: str, data: bytes) -> None:
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read_file(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path_for(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _delete_file(self, key: str) -> None:
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    async def _write(self, key: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(self._write_file, key, data)
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read_file, key)
+
+    async def _exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self.path_for(key))
+
+    async def _delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete_file, key)
+
+    def _file_size(self, key: str) -> Optional[int]:
+        try:
+            return os.path.getsize(self.path_for(key))
+        except FileNotFoundError:
+            return None
+
+    async def _size(self, key: str) -> Optional[int]:
+        return await asyncio.to_thread(self._file_size, key)
+
+    async def _iter_range(self, key: str, start: int, end: Optional[int], chunk_size: int) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self.path_for(key), "rb")
+        try:
+            await asyncio.to_thread(f.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                read_size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await asyncio.to_thread(f.read, read_size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+
+class S3ImageStore(ImageStore):
+    """
+    S3 호환 오브젝트 스토리지 이미지 저장소
+    endpoint_url을 지정하면 MinIO 등 S3 호환 서버 사용 가능
+    boto3 호출은 블로킹이므로 스레드에서 실행
+    """
+
+    def __init__(self, bucket: str, public_base_url: str, endpoint_url: Optional[str] = None,
+                 access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 region: Optional[str] = None, client=None):
+        super().__init__(public_base_url)
+        self.bucket = bucket
+
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("IMAGE_STORE_BACKEND=s3 requires the boto3 package")
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                region_name=region
+            )
+        self.client = client
+
+    def _head(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except Exception as e:
+            # botocore ClientError의 404만 "없음"으로 처리
+            status = getattr(e, "response", {}).get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if status == 404:
+                return False
+            raise
+
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"].read()
+        except Exception as e:
+            status = getattr(e, "response", {}).get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if status == 404:
+                return None
+            raise
+
+    async def _write(self, key: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            # 콘텐츠 주소 키이므로 내용이 바뀌지 않음
+            CacheControl="public, max-age=31536000, immutable"
+        )
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def _exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._head, key)
+
+    async def _delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    def _object_size(self, key: str) -> Optional[int]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except Exception as e:
+            status = getattr(e, "response", {}).get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if status == 404:
+                return None
+            raise
+
+    async def _size(self, key: str) -> Optional[int]:
+        return await asyncio.to_thread(self._object_size, key)
+
+    async def _iter_range(self, key: str, start: int, end: Optional[int], chunk_size: int) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        response = await asyncio.to_thread(
+            self.client.get_object, Bucket=self.bucket, Key=key, Range=byte_range
+        )
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+
+def create_image_store() -> ImageStore:
+    """설정(IMAGE_STORE_BACKEND)에 맞는 이미지 저장소 생성"""
+    if IMAGE_STORE_BACKEND == "s3":
+        if not S3_BUCKET:
+            raise RuntimeError("S3_BUCKET must be set when IMAGE_STORE_BACKEND=s3")
+        public_base_url = IMAGE_PUBLIC_BASE_URL or f"{(S3_ENDPOINT_URL or '').rstrip('/')}/{S3_BUCKET}"
+        return S3ImageStore(
+            bucket=S3_BUCKET,
+            public_base_url=public_base_url,
+            endpoint_url=S3_ENDPOINT_URL,
+            access_key=S3_ACCESS_KEY,
+            secret_key=S3_SECRET_KEY,
+            region=S3_REGION
+        )
+
+    if IMAGE_STORE_BACKEND != "local":
+        raise RuntimeError(f"Unknown IMAGE_STORE_BACKEND: {IMAGE_STORE_BACKEND}")
+    return LocalImageStore(IMAGE_STORE_DIR, IMAGE_PUBLIC_BASE_URL or "http://localhost:8000/media")
+
+
+async def store_renditions(store: ImageStore, digest: str, image_data: bytes) -> Dict[Tuple[str, str], int]:
+    """
+    원본 이미지의 모든 렌디션을 생성하여 저장
+    PIL 작업은 CPU를 사용하므로 이미지 처리 풀에서 실행
+
+    Returns:
+        (렌디션 이름, 포맷) -> 저장된 바이트 수
+    """
+    renditions = await get_image_executor().run(
+        build_renditions, image_data, GALLERY_RENDITION_SIZES, RENDITION_FORMATS
+    )
+    return await save_renditions(store, digest, renditions)
+
+
+async def save_renditions(store: ImageStore, digest: str,
+                          renditions: Dict[Tuple[str, str], bytes]) -> Dict[Tuple[str, str], int]:
+    """
+    이미 생성된 렌디션을 원본 해시 기준 키로 저장
+
+    Returns:
+        (렌디션 이름, 포맷) -> 저장된 바이트 수
+    """
+    await asyncio.gather(*(
+        store.put(rendition_key(digest, size, image_format), data)
+        for (size, image_format), data in renditions.items()
+    ))
+    return {key: len(data) for key, data in renditions.items()}
+
+
+async def get_or_create_rendition(store: ImageStore, digest: str, size: str, image_format: str,
+                                  load_original: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[Tuple[str, int]]:
+    """
+    렌디션 키와 크기 반환 (없으면 원본에서 생성 후 저장)
+    업로드 시 렌디션 생성에 실패했거나 이전에 저장된 이미지도 첫 요청 때 채워짐
+
+    Returns:
+        (저장 키, 바이트 수) 또는 원본이 없으면 None
+    """
+    key = rendition_key(digest, size, image_format)
+    byte_size = await store.size(key)
+    if byte_size is not None:
+        return key, byte_size
+
+    original = await load_original()
+    if original is None:
+        return None
+    sizes = await store_renditions(store, digest, original)
+    return key, sizes[(size, image_format)]
+
+
+# 프로세스 전역 싱글톤 인스턴스
+_image_store: Optional[ImageStore] = None
+
+
+def get_image_store() -> ImageStore:
+    """
+    FastAPI 의존성 주입용 이미지 저장소 반환
+    최초 호출 시 설정에 맞는 저장소 생성
+    """
+    global _image_store
+    if _image_store is None:
+        _image_store = create_image_store()
+    return _image_store
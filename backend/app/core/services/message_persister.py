@@ -0,0 +1,372 @@
+"""
+채팅 메시지 write-behind 저장
+AI 응답이 끝난 뒤 사용자/AI 메시지를 하나씩 POST하며 기다리지 않고,
+큐에 넣은 즉시 반환한 뒤 백그라운드에서 모아서 한 번의 배열 POST로 저장
+
+- 큐에 넣는 즉시 스레드 메시지 캐시에 추가하므로 다음 대화에서도 바로 보임
+  (저장 전에는 id가 없고, 저장되면 같은 dict에 id 등 DB 값이 채워짐)
+- 저장 실패 시 지수 백오프로 재시도하고, 그래도 실패하면 스풀 파일(JSON Lines)에 추가
+- 종료 시 CHAT_PERSIST_SHUTDOWN_TIMEOUT 안에 저장하지 못한 메시지는 스풀 파일에 기록하고
+  다음 시작 시 다시 큐에 넣어 저장
+- 다시 넣은 메시지는 모두 저장(또는 다시 스풀)된 뒤에 .replay 파일을 지우므로
+  그 전에 프로세스가 죽어도 다음 시작 시 다시 저장 (중복 저장될 수 있음)
+- 여러 워커가 동시에 시작해도 .lock 파일의 배타적 잠금을 얻은 워커 하나만 스풀 파일을 다시 저장
+- DB가 배치를 거부하면(4xx, 예: 세션이 삭제되어 외래 키 위반) 배치를 반씩 나눠 다시 저장하고
+  끝까지 거부된 메시지만 .rejected 파일에 기록 (재시도/스풀하지 않음)
+"""
+import asyncio
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 다시 저장 (단일 워커로 실행)
+    fcntl = None
+from typing import Any, Dict, List, Optional
+
+from app.core.config.settings import (
+    CHAT_PERSIST_QUEUE_SIZE,
+    CHAT_PERSIST_BATCH_SIZE,
+    CHAT_PERSIST_FLUSH_INTERVAL,
+    CHAT_PERSIST_MAX_RETRIES,
+    CHAT_PERSIST_SHUTDOWN_TIMEOUT,
+    CHAT_PERSIST_SPOOL_FILE
+)
+from app.core.services.async_database_service import (
+    AsyncDatabaseService,
+    DatabaseRejectedError,
+    get_database_service
+)
+
+
+class MessagePersister:
+    """
+    채팅 메시지 일괄 저장기
+    프로세스당 하나의 인스턴스와 백그라운드 작업 하나를 공유
+    """
+
+    def __init__(self, db_service: AsyncDatabaseService,
+                 queue_size: int = CHAT_PERSIST_QUEUE_SIZE,
+                 batch_size: int = CHAT_PERSIST_BATCH_SIZE,
+                 flush_interval: float = CHAT_PERSIST_FLUSH_INTERVAL,
+                 max_retries: int = CHAT_PERSIST_MAX_RETRIES,
+                 spool_file: Optional[str] = CHAT_PERSIST_SPOOL_FILE,
+                 backoff_factor: float = 0.5):
+        self.db_service = db_service
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spool_file = spool_file
+        self.backoff_factor = backoff_factor
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # 모으는 중이거나 저장 중인 배치 (종료 시 저장하지 못했으면 스풀 파일에 기록)
+        self._inflight: List[Dict[str, Any]] = []
+        # 스풀 파일에서 다시 넣었지만 아직 저장되지 않은 메시지 (id(message))
+        self._replay_pending: set = set()
+        # 스풀 파일을 다시 저장하는 중인지와 그동안 잡고 있는 잠금 파일
+        self._replaying = False
+        self._replay_lock = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # 처리 통계
+        self.saved = 0
+        self.batches = 0
+        self.retries = 0
+        self.spooled = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """백그라운드 저장 작업 시작 후 스풀 파일에 남은 메시지 다시 큐에 넣기"""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        if not self._acquire_replay_lock():
+            return
+        self._replaying = True
+        overflow = []
+        for message in self._read_spool():
+            if self._queue.full():
+                overflow.append(message)
+            else:
+                self._queue.put_nowait(message)
+                self._replay_pending.add(id(message))
+        # 큐에 다 넣지 못한 메시지는 다음 시작 때 다시 시도
+        if self._append_spool(overflow):
+            self._finish_replay([])
+
+    async def enqueue(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        메시지 저장 요청 (큐가 가득 찬 경우에만 대기)
+
+        Args:
+            message_data: chat_messages 행 데이터
+
+        Returns:
+            저장 예정 메시지 (저장이 끝나면 id 등 DB 값이 채워짐)
+        """
+        message = dict(message_data)
+        await self._queue.put(message)
+        self.db_service.thread_message_cache.append(message.get("thread_id"), message)
+        return message
+
+    async def _run(self) -> None:
+        """큐에서 메시지를 모아 배치 단위로 저장"""
+        while True:
+            batch = self._inflight = [await self._queue.get()]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._save_batch(batch)
+            self._inflight = []
+
+    async def _save_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """배치 저장 (실패 시 재시도, 재시도 횟수를 넘으면 스풀 파일에 기록)"""
+        rows = [self._row(message) for message in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                saved = await self.db_service.create_thread_messages(rows)
+                for message, saved_message in zip(batch, saved):
+                    message.update(saved_message)
+                self.saved += len(batch)
+                self.batches += 1
+                self._finish_replay(batch)
+                return
+            except DatabaseRejectedError as e:
+                await self._save_rejected_batch(batch, e)
+                return
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    print(f"⚠️ 메시지 {len(batch)}개 저장 실패, 스풀 파일에 기록: {str(e)}")
+                    if self._append_spool(rows):
+                        self._finish_replay(batch)
+                    return
+                self.retries += 1
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def _save_rejected_batch(self, batch: List[Dict[str, Any]], error: DatabaseRejectedError) -> None:
+        """
+        DB가 거부한 배치 처리
+        여러 개면 반씩 나눠 다시 저장하여 문제 없는 메시지는 저장되도록 하고,
+        한 개만 남아도 거부되면 .rejected 파일에 기록하고 버림
+        """
+        if len(batch) > 1:
+            print(f"⚠️ 메시지 {len(batch)}개 배치 저장 거부됨 ({error.upstream_status}), 나눠서 다시 저장")
+            middle = len(batch) // 2
+            await self._save_batch(batch[:middle])
+            await self._save_batch(batch[middle:])
+            return
+
+        print(f"🗑️ 저장이 거부된 메시지 기록 (thread_id={batch[0].get('thread_id')}): {error.detail}")
+        self._append_lines(self.spool_file + ".rejected" if self.spool_file else None,
+                           [self._row(message) for message in batch])
+        self.rejected += len(batch)
+        self._finish_replay(batch)
+
+    @staticmethod
+    def _row(message: Dict[str, Any]) -> Dict[str, Any]:
+        """저장할 행 데이터 (캐시용으로 붙은 값 제외)"""
+        return {key: value for key, value in message.items() if key != "id"}
+
+    def _append_spool(self, rows: List[Dict[str, Any]]) -> bool:
+        """저장하지 못한 메시지를 스풀 파일 끝에 추가 (기록에 실패하면 False)"""
+        if not self._append_lines(self.spool_file, rows):
+            return False
+        self.spooled += len(rows)
+        return True
+
+    @staticmethod
+    def _append_lines(path: Optional[str], rows: List[Dict[str, Any]]) -> bool:
+        """메시지를 JSON Lines 파일 끝에 추가 (기록에 실패하면 False)"""
+        if not rows:
+            return True
+        if not path:
+            print(f"⚠️ 스풀 파일이 설정되지 않아 메시지 {len(rows)}개 유실")
+            return False
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return True
+        except OSError as e:
+            print(f"⚠️ 파일 기록 실패 ({path}, 메시지 {len(rows)}개): {str(e)}")
+            return False
+
+    def _acquire_replay_lock(self) -> bool:
+        """
+        스풀 파일 재저장용 배타적 잠금 획득 (잠금 없이 기다리지 않음)
+        다른 워커가 잡고 있으면 False - 그 워커가 .replay 파일까지 처리
+        잠금은 다시 넣은 메시지가 모두 저장되거나 종료할 때 해제 (프로세스가 죽으면 OS가 해제)
+        """
+        if not self.spool_file:
+            return False
+        if fcntl is None:
+            return True
+        lock_path = self.spool_file + ".lock"
+        try:
+            directory = os.path.dirname(lock_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            lock_file = open(lock_path, "a")
+        except OSError as e:
+            print(f"⚠️ 스풀 잠금 파일 열기 실패: {str(e)}")
+            return False
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            print("ℹ️ 다른 워커가 스풀 파일을 다시 저장하는 중")
+            return False
+        self._replay_lock = lock_file
+        return True
+
+    def _release_replay_lock(self) -> None:
+        """스풀 파일 재저장 잠금 해제"""
+        self._replaying = False
+        if self._replay_lock is not None:
+            fcntl.flock(self._replay_lock.fileno(), fcntl.LOCK_UN)
+            self._replay_lock.close()
+            self._replay_lock = None
+
+    def _read_spool(self) -> List[Dict[str, Any]]:
+        """
+        스풀 파일의 메시지를 .replay 파일로 옮긴 뒤 읽기 (깨진 줄은 무시)
+        이전 실행에서 지우지 못한 .replay 파일이 있으면 스풀 파일 내용을 그 뒤에 이어 붙임
+        .replay 파일은 다시 넣은 메시지가 모두 저장된 뒤 _finish_replay에서 제거
+        """
+        if not self.spool_file:
+            return []
+        replay_path = self.spool_file + ".replay"
+        try:
+            if os.path.exists(replay_path):
+                with open(self.spool_file, encoding="utf-8") as src, \
+                        open(replay_path, "a", encoding="utf-8") as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.spool_file)
+            else:
+                os.replace(self.spool_file, replay_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ 스풀 파일 읽기 실패: {str(e)}")
+            return []
+
+        messages = []
+        try:
+            with open(replay_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        messages.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            print(f"⚠️ 스풀 파일 읽기 실패: {str(e)}")
+            return []
+        if messages:
+            print(f"📥 스풀 파일의 메시지 {len(messages)}개 다시 저장")
+        return messages
+
+    def _finish_replay(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        다시 넣은 메시지가 저장(또는 다시 스풀)되면 표시 해제
+        모두 끝나면 .replay 파일을 제거하고 재저장 잠금 해제
+        """
+        if not self._replaying:
+            return
+        for message in batch:
+            self._replay_pending.discard(id(message))
+        if self._replay_pending:
+            return
+        try:
+            os.remove(self.spool_file + ".replay")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ .replay 파일 제거 실패: {str(e)}")
+        self._release_replay_lock()
+
+    def stats(self) -> Dict[str, Any]:
+        """저장 통계 반환"""
+        return {
+            "queued": self._queue.qsize(),
+            "inflight": len(self._inflight),
+            "saved": self.saved,
+            "batches": self.batches,
+            "retries": self.retries,
+            "spooled": self.spooled,
+            "rejected": self.rejected
+        }
+
+    async def shutdown(self, timeout: float = CHAT_PERSIST_SHUTDOWN_TIMEOUT) -> None:
+        """남은 메시지 저장을 timeout까지 기다리고, 저장하지 못한 메시지는 스풀 파일에 기록"""
+        if self._worker is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (self._queue.qsize() or self._inflight) and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+
+        remaining = list(self._inflight)
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        self._inflight = []
+        if remaining:
+            print(f"💾 저장하지 못한 메시지 {len(remaining)}개를 스풀 파일에 기록")
+            if self._append_spool([self._row(message) for message in remaining]):
+                self._finish_replay(remaining)
+        # 다시 저장을 끝내지 못했으면 .replay 파일은 남겨 두고 잠금만 해제 (다음 시작 시 다시 저장)
+        self._release_replay_lock()
+
+
+def as_response_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    API 응답용 메시지 사본 (응답 형태 유지)
+    저장 전이라 id가 없으면 저장 실패 시와 같이 id 0으로 채움
+    """
+    return {"id": 0, **message}
+
+
+# 프로세스 전역 싱글톤 인스턴스 (FastAPI lifespan에서 시작/정리)
+_message_persister: Optional[MessagePersister] = None
+
+
+def init_message_persister() -> MessagePersister:
+    """애플리케이션 시작 시 메시지 저장기 시작 (스풀 파일에 남은 메시지 다시 저장)"""
+    return get_message_persister()
+
+
+def get_message_persister() -> MessagePersister:
+    """공유 메시지 저장기 반환 (최초 호출 시 생성 및 시작)"""
+    global _message_persister
+    if _message_persister is None:
+        _message_persister = MessagePersister(get_database_service())
+        _message_persister.start()
+    return _message_persister
+
+
+async def shutdown_message_persister() -> None:
+    """애플리케이션 종료 시 남은 메시지 저장 또는 스풀 파일 기록"""
+    global _message_persister
+    if _message_persister is not None:
+        await _message_persister.shutdown()
+        _message_persister = None
@@ -7,7 +7,8 @@ OpenAI GPT 모델을 활용한 AI 응답 생성 서비스
 import os
 import asyncio
 import base64
-from typing import List, Dict, Any, Optional, Union
+import time
+from typing import List, Dict, Any, Optional, Union, AsyncIterator
 from pathlib import Path
 from fastapi import HTTPException, UploadFile
 from openai import OpenAI, AsyncOpenAI
@@ -15,6 +16,69 @@ from openai.types.chat import ChatCompletion
 from openai.types import FileObject
 
 from app.core.config.settings import OPENAI_API_KEY, OPENAI_MODEL
+from app.core.services.response_cache import get_response_cache, response_cache_key
+
+# 채팅 응답 샘플링 파라미터 (응답 캐시 키에도 포함)
+COMPLETION_PARAMS = {
+    "max_tokens": 500,
+    "temperature": 0.7,
+    "presence_penalty": 0.1,
+    "frequency_penalty": 0.1
+}
+
+
+class StreamMetrics:
+    """스트리밍 응답 통계 (첫 토큰까지 걸린 시간, 완료/취소/실패 수)"""
+    
+    def __init__(self):
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.active = 0
+        self._ttft_count = 0
+        self._ttft_total = 0.0
+        self._ttft_max = 0.0
+    
+    def start(self) -> None:
+        self.started += 1
+        self.active += 1
+    
+    def finish(self, outcome: str) -> None:
+        """스트림 종료 기록 (outcome: completed, cancelled, failed)"""
+        self.active -= 1
+        if outcome == "completed":
+            self.completed += 1
+        elif outcome == "failed":
+            self.failed += 1
+        else:
+            self.cancelled += 1
+    
+    def record_first_token(self, seconds: float) -> None:
+        self._ttft_count += 1
+        self._ttft_total += seconds
+        self._ttft_max = max(self._ttft_max, seconds)
+    
+    def stats(self) -> Dict[str, Any]:
+        """스트림 수와 첫 토큰 시간 통계 반환"""
+        return {
+            "active": self.active,
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "avg_ttft_ms": round(self._ttft_total / self._ttft_count * 1000, 2) if self._ttft_count else 0.0,
+            "max_ttft_ms": round(self._ttft_max * 1000, 2)
+        }
+
+
+# 프로세스 전역 스트리밍 통계
+_stream_metrics = StreamMetrics()
+
+
+def get_stream_stats() -> Dict[str, Any]:
+    """비동기 스트리밍 응답 통계 반환"""
+    return _stream_metrics.stats()
 
 
 class OpenAIService:
@@ -74,6 +138,13 @@ class OpenAIService:
             # 전체 대화 컨텍스트 구성
             full_messages = [system_message] + messages
             
+            # 반복 질문이면 캐시된 응답 반환
+            cache_key = self._response_cache_key(messages, user_context)
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                print("♻️ 캐시된 AI 응답 사용")
+                return cached_response
+            
             print(f"📝 전송할 메시지 개수: {len(full_messages)}")
             for i, msg in enumerate(full_messages):
                 print(f"  {i+1}. {msg['role']}: {msg['content'][:50]}...")
@@ -83,11 +154,8 @@ class OpenAIService:
             completion: ChatCompletion = self.client.chat.completions.create(
                 model=self.model,
                 messages=full_messages,
-                max_tokens=500,
-                temperature=0.7,
-                presence_penalty=0.1,
-                frequency_penalty=0.1,
-                stream=False  # 스트리밍 비활성화
+                stream=False,  # 스트리밍 비활성화
+                **COMPLETION_PARAMS
             )
             
             print("✅ OpenAI API 호출 성공!")
@@ -96,6 +164,7 @@ class OpenAIService:
             if completion.choices and completion.choices[0].message.content:
                 response = completion.choices[0].message.content.strip()
                 print(f"📤 AI 응답: {response[:100]}...")
+                self._store_cached_response(cache_key, response, user_context)
                 return response
             else:
                 print("❌ AI 응답이 비어있습니다.")
@@ -136,21 +205,25 @@ class OpenAIService:
             # 전체 대화 컨텍스트 구성
             full_messages = [system_message] + messages
             
-            # 비동기 OpenAI API 호출
-            async with self.async_client:
-                completion: ChatCompletion = await self.async_client.chat.completions.create(
-                    model=self.model,
-                    messages=full_messages,
-                    max_tokens=500,
-                    temperature=0.7,
-                    presence_penalty=0.1,
-                    frequency_penalty=0.1,
-                    stream=False
-                )
+            # 반복 질문이면 캐시된 응답 반환
+            cache_key = self._response_cache_key(messages, user_context)
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                return cached_response
+            
+            # 비동기 OpenAI API 호출 (클라이언트는 요청 간 재사용하므로 닫지 않음)
+            completion: ChatCompletion = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=full_messages,
+                stream=False,
+                **COMPLETION_PARAMS
+            )
             
             # 안전한 응답 추출
             if completion.choices and completion.choices[0].message.content:
-                return completion.choices[0].message.content.strip()
+                response = completion.choices[0].message.content.strip()
+                self._store_cached_response(cache_key, response, user_context)
+                return response
             else:
                 raise HTTPException(status_code=500, detail="AI 응답이 비어있습니다.")
             
@@ -181,24 +254,183 @@ class OpenAIService:
             # 전체 대화 컨텍스트 구성
             full_messages = [system_message] + messages
             
+            # 반복 질문이면 캐시된 응답을 한 번에 전달
+            cache_key = self._response_cache_key(messages, user_context)
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                yield cached_response
+                return
+            
             # 스트리밍 OpenAI API 호출
             stream = self.client.chat.completions.create(
                 model=self.model,
                 messages=full_messages,
-                max_tokens=500,
-                temperature=0.7,
-                presence_penalty=0.1,
-                frequency_penalty=0.1,
-                stream=True
+                stream=True,
+                **COMPLETION_PARAMS
             )
             
+            collected_chunks = []
             for chunk in stream:
                 if chunk.choices[0].delta.content:
+                    collected_chunks.append(chunk.choices[0].delta.content)
                     yield chunk.choices[0].delta.content
+            
+            # 끝까지 받은 응답만 캐시
+            response = "".join(collected_chunks).strip()
+            if response:
+                self._store_cached_response(cache_key, response, user_context)
                     
         except Exception as e:
             yield f"오류: {str(e)}"
     
+    async def generate_response_stream_async(
+        self,
+        messages: List[Dict[str, Any]],
+        user_context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        비동기 스트리밍 방식으로 AI 응답 생성
+        이벤트 루프를 막지 않고 델타를 받는 대로 전달하며, 첫 토큰까지 걸린 시간을 기록
+        소비자가 중간에 닫거나(aclose) 작업이 취소되면 OpenAI 스트림도 바로 닫아 업스트림 요청을 끊음
+        
+        Args:
+            messages: 대화 히스토리
+            user_context: 사용자 정보
+            
+        Yields:
+            스트리밍 응답 델타
+            
+        Raises:
+            openai.APIError 등: OpenAI API 호출 실패 시 (호출한 쪽에서 오류 이벤트로 변환)
+        """
+        # 시스템 메시지 설정
+        system_message = self._create_system_message(user_context)
+        
+        # 전체 대화 컨텍스트 구성
+        full_messages = [system_message] + messages
+        
+        # 반복 질문이면 캐시된 응답을 한 번에 전달
+        cache_key = self._response_cache_key(messages, user_context)
+        cached_response = self._get_cached_response(cache_key)
+        if cached_response is not None:
+            yield cached_response
+            return
+        
+        started_at = time.perf_counter()
+        _stream_metrics.start()
+        stream = None
+        outcome = "cancelled"  # 예외 없이 중간에 닫히면 (aclose, 작업 취소) 취소로 집계
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=full_messages,
+                stream=True,
+                **COMPLETION_PARAMS
+            )
+            
+            collected_chunks = []
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                if not collected_chunks:
+                    ttft = time.perf_counter() - started_at
+                    _stream_metrics.record_first_token(ttft)
+                    print(f"⏱️ 첫 토큰까지 {ttft * 1000:.0f}ms")
+                collected_chunks.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+            outcome = "completed"
+            
+            # 끝까지 받은 응답만 캐시
+            response = "".join(collected_chunks).strip()
+            if response:
+                self._store_cached_response(cache_key, response, user_context)
+        except Exception:
+            outcome = "failed"
+            raise
+        finally:
+            _stream_metrics.finish(outcome)
+            if outcome != "completed" and stream is not None:
+                # 클라이언트가 떠났거나 실패한 경우 남은 응답을 받지 않도록 업스트림 연결 종료
+                await stream.close()
+    
+    async def summarize_conversation(self, messages: List[Dict[str, Any]], previous_summary: Optional[str] = None,
+                                     max_tokens: int = 400) -> str:
+        """
+        대화 기록 요약 (컨텍스트 예산을 넘는 오래된 대화를 대체할 요약 생성)
+        
+        Args:
+            messages: 요약할 대화 메시지 (role, content)
+            previous_summary: 이전까지의 요약 (있으면 이어서 갱신)
+            max_tokens: 요약 최대 토큰 수
+            
+        Returns:
+            갱신된 요약 텍스트
+        """
+        transcript = "\n".join(
+            f"{'AI' if message['role'] == 'assistant' else '사용자'}: {message['content']}"
+            for message in messages
+        )
+        prompt = ""
+        if previous_summary:
+            prompt += f"[지금까지의 요약]\n{previous_summary}\n\n"
+        prompt += f"[새 대화]\n{transcript}"
+        
+        completion: ChatCompletion = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "교육용 AI 채팅의 이전 대화를 요약합니다. 지금까지의 요약과 새 대화를 합쳐 "
+                        "학생/선생님이 물어본 내용, 설명한 핵심 개념, 첨부한 파일 이름, 남은 질문을 "
+                        "한국어로 간결하게 정리하세요."
+                    )
+                },
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.3
+        )
+        if completion.choices and completion.choices[0].message.content:
+            return completion.choices[0].message.content.strip()
+        raise HTTPException(status_code=500, detail="대화 요약이 비어있습니다.")
+    
+    def _response_cache_key(self, messages: List[Dict[str, Any]],
+                            user_context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        응답 캐시 키 생성 (캐시 비활성화, 첨부 파일, 긴 대화 기록이면 None)
+        user_context의 session_id 단위로 캐시를 공유
+        시스템 프롬프트는 이름을 뺀 변형(사용자 유형만 반영)으로 해시하여
+        같은 수업의 다른 학생이 같은 질문을 해도 캐시를 공유
+        """
+        if get_response_cache() is None:
+            return None
+        user_type = user_context.get('user_type', 'student') if user_context else None
+        shared_system_message = self._create_system_message({'user_type': user_type} if user_context else None)
+        scope = user_context.get('session_id') if user_context else None
+        return response_cache_key(self.model, shared_system_message, messages, COMPLETION_PARAMS, scope)
+    
+    def _get_cached_response(self, cache_key: Optional[str]) -> Optional[str]:
+        """캐시된 응답 조회 (없으면 None)"""
+        cache = get_response_cache()
+        if cache is None or cache_key is None:
+            return None
+        return cache.get(cache_key)
+    
+    def _store_cached_response(self, cache_key: Optional[str], response: str,
+                               user_context: Optional[Dict[str, Any]] = None) -> None:
+        """
+        생성된 응답을 캐시에 저장
+        응답에 대화 상대의 이름이 들어 있으면 다른 학생에게 그대로 보여줄 수 없으므로 저장하지 않음
+        """
+        cache = get_response_cache()
+        if cache is None or cache_key is None:
+            return
+        user_name = user_context.get('user_name') if user_context else None
+        if user_name and user_name in response:
+            return
+        cache.set(cache_key, response)
+    
     def _create_system_message(self, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
         """
         시스템 메시지 생성 (AI의 역할과 행동 방식 정의)
@@ -244,7 +476,8 @@ class OpenAIService:
         
         return {"role": "system", "content": base_prompt}
     
-    def generate_educational_response(self, question: str, subject: Optional[str] = None, level: Optional[str] = None) -> str:
+    def generate_educational_response(self, question: str, subject: Optional[str] = None, level: Optional[str] = None,
+                                      user_context: Optional[Dict[str, Any]] = None) -> str:
         """
         교육적 질문에 대한 특화된 응답 생성
         
@@ -252,6 +485,7 @@ class OpenAIService:
             question: 교육 관련 질문
             subject: 과목 (선택사항)
             level: 학습 수준 (선택사항)
+            user_context: 사용자 정보 (선택사항, session_id 단위로 응답 캐시 공유)
             
         Returns:
             교육적 AI 응답
@@ -265,7 +499,7 @@ class OpenAIService:
             }
         ]
         
-        return self.generate_response(messages)
+        return self.generate_response(messages, user_context)
     
     def upload_file(self, file_path: Union[str, Path], purpose: str = "assistants") -> FileObject:
         """
@@ -481,4 +715,25 @@ class OpenAIService:
         if hasattr(self.client, 'close'):
             self.client.close()
         if hasattr(self.async_client, 'close'):
-            asyncio.create_task(self.async_client.close())
\ No newline at end of file
+            asyncio.create_task(self.async_client.close())
+
+
+# 프로세스 전역 싱글톤 인스턴스 (요청마다 클라이언트/연결 풀을 새로 만들지 않도록 공유)
+_openai_service: Optional[OpenAIService] = None
+
+
+def get_openai_service() -> OpenAIService:
+    """공유 OpenAI 서비스 반환 (최초 호출 시 생성)"""
+    global _openai_service
+    if _openai_service is None:
+        _openai_service = OpenAIService()
+    return _openai_service
+
+
+async def close_openai_service() -> None:
+    """애플리케이션 종료 시 공유 OpenAI 클라이언트 정리"""
+    global _openai_service
+    if _openai_service is not None:
+        _openai_service.client.close()
+        await _openai_service.async_client.close()
+        _openai_service = None
@@ -0,0 +1,90 @@
+"""
+OpenAI 응답 캐시
+같은 수업의 학생들이 거의 같은 질문("광합성이 뭐야?")을 반복하는 경우
+모델, 시스템 프롬프트, 정규화된 메시지, 샘플링 파라미터가 같으면 저장된 응답을 재사용
+
+- 첨부 파일이 없고 대화 기록이 OPENAI_RESPONSE_CACHE_MAX_MESSAGES개 이하인 요청만 대상
+- 키에 세션 ID를 포함하여 다른 수업과는 응답을 공유하지 않음
+- OPENAI_RESPONSE_CACHE_ENABLED가 true일 때만 사용 (기본 비활성)
+"""
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Mapping, Optional
+
+from app.core.config.settings import (
+    OPENAI_RESPONSE_CACHE_ENABLED,
+    OPENAI_RESPONSE_CACHE_TTL_SECONDS,
+    OPENAI_RESPONSE_CACHE_MAX_ENTRIES,
+    OPENAI_RESPONSE_CACHE_MAX_MESSAGES
+)
+from app.core.utils.cache import TTLCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message_text(text: str) -> str:
+    """공백을 하나로 합치고 대소문자를 무시하도록 정규화"""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def response_cache_key(model: str, system_message: Mapping[str, Any], messages: List[Dict[str, Any]],
+                       params: Mapping[str, Any], scope: Any = None) -> Optional[str]:
+    """
+    응답 캐시 키 생성
+
+    Args:
+        model: OpenAI 모델 이름
+        system_message: _create_system_message가 만든 시스템 메시지
+        messages: 시스템 메시지를 제외한 대화 메시지
+        params: 샘플링 파라미터 (temperature, max_tokens 등)
+        scope: 캐시 공유 범위 (세션 ID)
+
+    Returns:
+        SHA-256 키 (첨부가 있거나 대화가 길어 캐시 대상이 아니면 None)
+    """
+    if not messages or len(messages) > OPENAI_RESPONSE_CACHE_MAX_MESSAGES:
+        return None
+
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, str):
+            # 이미지/파일이 포함된 멀티모달 메시지
+            return None
+        normalized.append([message.get("role"), normalize_message_text(content)])
+
+    canonical = {
+        "model": model,
+        "system": system_message.get("content"),
+        "messages": normalized,
+        "params": dict(params),
+        "scope": scope
+    }
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# 프로세스 전역 싱글톤 인스턴스
+_response_cache: Optional[TTLCache] = None
+
+
+def get_response_cache() -> Optional[TTLCache]:
+    """공유 응답 캐시 반환 (OPENAI_RESPONSE_CACHE_ENABLED가 false이면 None)"""
+    global _response_cache
+    if not OPENAI_RESPONSE_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        _response_cache = TTLCache(
+            max_entries=OPENAI_RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=OPENAI_RESPONSE_CACHE_TTL_SECONDS
+        )
+    return _response_cache
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """응답 캐시 통계 (비활성화된 경우 enabled: false)"""
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "max_messages": OPENAI_RESPONSE_CACHE_MAX_MESSAGES, **cache.stats()}
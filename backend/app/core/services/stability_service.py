@@ -3,79 +3,348 @@ Stability AI 이미지 생성 서비스
 Reference 폴더의 예시 코드를 기반으로 교육 시스템에 맞게 최적화된 서비스 클래스
 """
 import os
-import requests
-import io
-from typing import Optional, Dict, Any, BinaryIO
-from PIL import Image
+import base64
+import math
+from typing import Optional, Dict, Any, BinaryIO, AsyncIterator, Awaitable, Callable, Iterator, Union
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
 
+import httpx
+
+from app.core.config.settings import (
+    STABILITY_POOL_SIZE,
+    STABILITY_TIMEOUT,
+    STABILITY_CONNECT_TIMEOUT
+)
+from app.core.services.credit_limiter import get_credit_limiter
+from app.core.services.generation_cache import (
+    GenerationCache,
+    generation_cache_key,
+    get_generation_cache,
+    request_fingerprint
+)
+from app.core.utils import image_processing
+from app.core.utils.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
+# 프로세스 전역 공유 HTTP 클라이언트 (연결 재사용, FastAPI lifespan에서 정리)
+_stability_client: Optional[httpx.AsyncClient] = None
+
+
+def get_stability_client() -> httpx.AsyncClient:
+    """Stability AI 호출용 공유 HTTP 클라이언트 반환 (최초 호출 시 생성)"""
+    global _stability_client
+    if _stability_client is None or _stability_client.is_closed:
+        _stability_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(STABILITY_TIMEOUT, connect=STABILITY_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=STABILITY_POOL_SIZE,
+                max_keepalive_connections=STABILITY_POOL_SIZE
+            )
+        )
+    return _stability_client
+
+
+# 업스트림 응답을 스트리밍할 때 한 번에 읽는 바이트 수
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Stability가 429를 보내면서 Retry-After를 주지 않은 경우 요청을 막아 둘 시간 (초)
+DEFAULT_UPSTREAM_RETRY_AFTER = 10.0
+
+# 동일한 생성 요청 합치기 (서비스 인스턴스와 무관하게 프로세스 전역 공유)
+_generation_flights = SingleFlight()
+
+
+def get_generation_flight_stats() -> Dict[str, Any]:
+    """진행 중인 생성 요청 합치기 통계 반환"""
+    return _generation_flights.stats()
+
+
+class GenerationUsage:
+    """
+    생성 요청 하나가 Stability API를 실제로 호출했는지 기록
+    생성 결과 캐시 적중이나 진행 중인 같은 요청에 합류한 경우에는 호출하지 않은 것으로 남음
+    """
+
+    def __init__(self):
+        self.upstream = False
+
+
+_generation_usage: ContextVar[Optional[GenerationUsage]] = ContextVar("generation_usage", default=None)
+
+
+@contextmanager
+def track_generation_usage() -> Iterator[GenerationUsage]:
+    """
+    블록 안에서 실행되는 생성 호출의 Stability API 호출 여부 기록 (크레딧 반환 판단용)
+    요청 합치기 작업은 시작한 요청의 컨텍스트를 복사하므로 API 호출은 처음 요청한 쪽에만 기록됨
+    이미 기록 중이면 바깥 기록을 그대로 사용
+    """
+    usage = _generation_usage.get()
+    if usage is not None:
+        yield usage
+        return
+    usage = GenerationUsage()
+    token = _generation_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _generation_usage.reset(token)
+
+
+def _record_upstream_call() -> None:
+    """현재 생성 요청이 Stability API를 호출했음을 기록"""
+    usage = _generation_usage.get()
+    if usage is not None:
+        usage.upstream = True
+
+
+async def close_stability_client() -> None:
+    """애플리케이션 종료 시 공유 HTTP 클라이언트 정리"""
+    global _stability_client
+    if _stability_client is not None:
+        await _stability_client.aclose()
+        _stability_client = None
+
+
+class ImageStream:
+    """
+    Stability 응답 이미지를 청크 단위로 전달하는 스트림
+    전체 이미지를 메모리에 모으지 않고 업스트림 청크를 그대로 흘려보냄
+    """
+    
+    def __init__(self, chunks: AsyncIterator[bytes], media_type: str,
+                 close: Optional[Callable[[], Awaitable[None]]] = None):
+        self.media_type = media_type.split(";", 1)[0].strip()
+        self._chunks = chunks
+        self._close = close
+        self.size = 0
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, media_type: str) -> "ImageStream":
+        """이미 메모리에 있는 이미지를 스트림으로 감쌈 (JSON artifacts 응답 등)"""
+        async def chunks():
+            view = memoryview(data)
+            for offset in range(0, len(data), STREAM_CHUNK_SIZE):
+                yield bytes(view[offset:offset + STREAM_CHUNK_SIZE])
+        return cls(chunks(), media_type)
+    
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        """청크를 내보내며 크기를 갱신 (끝나거나 중단되면 업스트림 연결 정리)"""
+        try:
+            async for chunk in self._chunks:
+                self.size += len(chunk)
+                yield chunk
+        finally:
+            await self.aclose()
+    
+    async def aclose(self) -> None:
+        if self._close is not None:
+            close, self._close = self._close, None
+            await close()
+
+
 class StabilityServiceError(Exception):
     """Stability AI 서비스 관련 예외"""
-    def __init__(self, message: str, status_code: Optional[int] = None, response_data: Optional[Dict] = None):
+    def __init__(self, message: str, status_code: Optional[int] = None, response_data: Optional[Dict] = None,
+                 retry_after: Optional[float] = None):
         super().__init__(message)
         self.status_code = status_code
         self.response_data = response_data
+        self.retry_after = retry_after
+    
+    @property
+    def headers(self) -> Optional[Dict[str, str]]:
+        """HTTPException으로 전달할 응답 헤더 (요청 제한 시 Retry-After)"""
+        if self.retry_after is None:
+            return None
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
 
 class StabilityService:
     """Stability AI 이미지 생성 서비스"""
     
     BASE_URL = "https://api.stability.ai"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None,
+                 cache: Optional[GenerationCache] = None):
         """
         Args:
             api_key: Stability AI API 키 (None일 경우 환경변수에서 가져옴)
+            client: 사용할 HTTP 클라이언트 (None일 경우 프로세스 공유 클라이언트)
+            cache: 시드 고정 생성 결과 캐시 (None일 경우 프로세스 공유 캐시)
         """
         self.api_key = api_key or os.getenv("STABILITY_API_KEY")
         if not self.api_key:
             raise StabilityServiceError("STABILITY_API_KEY가 설정되지 않았습니다.")
         
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Accept": "application/json"
-        }
+        self.client = client or get_stability_client()
+        self.cache = cache
     
     def _get_enum_value(self, value: Any) -> Any:
         """Enum 멤버인 경우 .value를, 그렇지 않으면 원래 값을 반환"""
         return value.value if isinstance(value, Enum) else value
 
-    def _make_request(self, endpoint: str, method: str = "POST", data: Optional[Dict] = None, 
-                     files: Optional[Dict] = None) -> requests.Response:
-        """API 요청을 보내고 응답을 처리"""
-        url = f"{self.BASE_URL}{endpoint}"
+    def _timeout(self, timeout: Optional[float]) -> httpx.Timeout:
+        """호출별 타임아웃 (연결은 짧게, 생성 대기는 timeout초)"""
+        return httpx.Timeout(timeout or STABILITY_TIMEOUT, connect=STABILITY_CONNECT_TIMEOUT)
+    
+    async def _post_image(self, endpoint: str, label: str, data: Dict[str, Any], files: Dict[str, Any],
+                          timeout: Optional[float] = None) -> bytes:
+        """
+        이미지 생성 요청
+        - 같은 요청(엔드포인트/폼 필드/입력 이미지)이 이미 진행 중이면 그 결과를 함께 받음
+          (수업 중 같은 예시 프롬프트를 동시에 누르는 경우 API 호출 한 번으로 처리)
+        - 시드가 지정된 요청은 생성 결과 캐시를 먼저 확인
+        """
+        input_image = next((value[1] for value in files.values() if isinstance(value, tuple)), None)
+        fingerprint = request_fingerprint(endpoint, data, input_image)
+        return await _generation_flights.do(
+            fingerprint,
+            lambda: self._cached_request_image(endpoint, label, data, files, timeout, input_image)
+        )
+    
+    async def _cached_request_image(self, endpoint: str, label: str, data: Dict[str, Any],
+                                    files: Dict[str, Any], timeout: Optional[float],
+                                    input_image: Optional[bytes]) -> bytes:
+        """시드 고정 요청은 캐시에서 찾고, 없으면 API 호출 후 저장"""
+        cache = self.cache or get_generation_cache()
+        cache_key = generation_cache_key(endpoint, data, input_image) if cache is not None else None
+        if cache_key is None:
+            return await self._request_image(endpoint, label, data, files, timeout)
         
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"{label} 생성 결과 캐시 적중: {cache_key[:12]}")
+            return cached
+        
+        image_data = await self._request_image(endpoint, label, data, files, timeout)
+        try:
+            await cache.set(cache_key, image_data)
+        except OSError as e:
+            logger.warning(f"생성 결과 캐시 저장 실패: {str(e)}")
+        return image_data
+    
+    def _parse_retry_after(self, value: Optional[str]) -> float:
+        """Retry-After 헤더(초)를 파싱 (없거나 날짜 형식이면 기본값)"""
+        try:
+            return max(1.0, float(value))
+        except (TypeError, ValueError):
+            return DEFAULT_UPSTREAM_RETRY_AFTER
+    
+    def _request_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Accept": "image/*"
+        }
+    
+    def _raise_for_status(self, response: httpx.Response, label: str) -> None:
+        """200이 아닌 응답을 StabilityServiceError로 변환 (429면 업스트림 요청 차단)"""
+        if response.status_code == 200:
+            return
+        
+        error_data = None
+        try:
+            error_data = response.json()
+        except Exception:
+            pass
+        
+        retry_after = None
+        if response.status_code == 429:
+            # 재시도가 몰리지 않도록 Retry-After 동안 새 요청을 크레딧 제한기에서 바로 거절
+            retry_after = self._parse_retry_after(response.headers.get("retry-after"))
+            get_credit_limiter().block_upstream(retry_after)
+            logger.warning(f"{label} API 요청 제한 (429), {retry_after:.0f}초 동안 요청 차단")
+        
+        raise StabilityServiceError(
+            f"{label} API 요청 실패: {response.status_code} - {response.text}",
+            status_code=response.status_code,
+            response_data=error_data,
+            retry_after=retry_after
+        )
+    
+    def _image_from_response(self, response: httpx.Response) -> bytes:
+        """이미지 응답 본문, 또는 JSON artifacts의 base64 이미지를 바이트로 반환"""
+        if response.headers.get('content-type', '').startswith('image/'):
+            return response.content
         try:
-            if method == "POST":
-                response = requests.post(url, headers=self.headers, json=data, files=files, timeout=60)
+            json_data = response.json()
+            if 'artifacts' in json_data and len(json_data['artifacts']) > 0:
+                return base64.b64decode(json_data['artifacts'][0]['base64'])
             else:
-                response = requests.get(url, headers=self.headers, timeout=60)
-            
-            if response.status_code != 200:
-                error_data = None
-                try:
-                    error_data = response.json()
-                except:
-                    pass
-                
-                raise StabilityServiceError(
-                    f"API 요청 실패: {response.status_code} - {response.text}",
-                    status_code=response.status_code,
-                    response_data=error_data
-                )
-            
-            return response
-            
-        except requests.exceptions.RequestException as e:
+                raise StabilityServiceError("이미지 데이터를 찾을 수 없습니다.")
+        except Exception as e:
+            raise StabilityServiceError(f"응답 처리 오류: {str(e)}")
+    
+    async def _request_image(self, endpoint: str, label: str, data: Dict[str, Any], files: Dict[str, Any],
+                             timeout: Optional[float] = None) -> bytes:
+        """
+        multipart 이미지 생성 요청을 보내고 이미지 바이트 반환
+        
+        Args:
+            endpoint: API 엔드포인트
+            label: 오류 메시지에 표시할 모델 이름
+            data: 폼 필드
+            files: 파일 필드 (API가 multipart를 요구하므로 비어 있지 않아야 함)
+            timeout: 호출별 타임아웃 (초, None이면 STABILITY_TIMEOUT)
+        """
+        try:
+            url = f"{self.BASE_URL}{endpoint}"
+            _record_upstream_call()
+            response = await self.client.post(
+                url, headers=self._request_headers(), data=data, files=files, timeout=self._timeout(timeout)
+            )
+            self._raise_for_status(response, label)
+            return self._image_from_response(response)
+                    
+        except httpx.TimeoutException as e:
+            raise StabilityServiceError(f"요청 시간 초과: {str(e)}", status_code=504)
+        except httpx.HTTPError as e:
             raise StabilityServiceError(f"네트워크 오류: {str(e)}")
     
-    def generate_core_image(self, prompt: str, aspect_ratio: str = "1:1", 
-                          output_format: str = "png", style_preset: Optional[str] = None,
-                          negative_prompt: Optional[str] = None, seed: Optional[int] = None) -> bytes:
+    async def _open_image_stream(self, endpoint: str, label: str, data: Dict[str, Any], files: Dict[str, Any],
+                                 timeout: Optional[float] = None) -> "ImageStream":
+        """
+        multipart 이미지 생성 요청을 보내고 응답 본문을 읽지 않은 채 스트림으로 반환
+        상태 코드와 헤더만 확인하므로 오류는 본문 전송 전에 StabilityServiceError로 발생
+        캐시/요청 합치기는 전체 바이트가 필요하므로 이 경로에서는 사용하지 않음
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+        request = self.client.build_request(
+            "POST", url, headers=self._request_headers(), data=data, files=files, timeout=self._timeout(timeout)
+        )
+        _record_upstream_call()
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.TimeoutException as e:
+            raise StabilityServiceError(f"요청 시간 초과: {str(e)}", status_code=504)
+        except httpx.HTTPError as e:
+            raise StabilityServiceError(f"네트워크 오류: {str(e)}")
+        
+        content_type = response.headers.get('content-type', '')
+        if response.status_code == 200 and content_type.startswith('image/'):
+            return ImageStream(response.aiter_bytes(STREAM_CHUNK_SIZE), content_type, response.aclose)
+        
+        # 오류 응답이나 JSON(artifacts) 응답은 작으므로 읽어서 기존 방식으로 처리
+        try:
+            await response.aread()
+        except httpx.HTTPError as e:
+            raise StabilityServiceError(f"네트워크 오류: {str(e)}")
+        finally:
+            await response.aclose()
+        self._raise_for_status(response, label)
+        image_data = self._image_from_response(response)
+        return ImageStream.from_bytes(image_data, f"image/{data.get('output_format', 'png')}")
+    
+    async def generate_core_image(self, prompt: str, aspect_ratio: str = "1:1", 
+                                  output_format: str = "png", style_preset: Optional[str] = None,
+                                  negative_prompt: Optional[str] = None, seed: Optional[int] = None,
+                                  timeout: Optional[float] = None, stream: bool = False) -> Union[bytes, "ImageStream"]:
         """
         Stable Image Core로 이미지 생성
+        stream=True이면 바이트 대신 ImageStream 반환 (캐시/요청 합치기 미적용)
         """
         data = {
             "prompt": prompt,
@@ -94,52 +363,20 @@ class StabilityService:
         
         logger.info(f"Core 이미지 생성 요청: {prompt[:50]}...")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Accept": "image/*"
-        }
-        
-        try:
-            url = f"{self.BASE_URL}/v2beta/stable-image/generate/core"
-            response = requests.post(url, headers=headers, data=data, files=files, timeout=60)
-            
-            if response.status_code != 200:
-                error_data = None
-                try:
-                    error_data = response.json()
-                except:
-                    pass
-                
-                raise StabilityServiceError(
-                    f"Core API 요청 실패: {response.status_code} - {response.text}",
-                    status_code=response.status_code,
-                    response_data=error_data
-                )
-            
-            if response.headers.get('content-type', '').startswith('image/'):
-                return response.content
-            else:
-                try:
-                    json_data = response.json()
-                    if 'artifacts' in json_data and len(json_data['artifacts']) > 0:
-                        import base64
-                        return base64.b64decode(json_data['artifacts'][0]['base64'])
-                    else:
-                        raise StabilityServiceError("이미지 데이터를 찾을 수 없습니다.")
-                except Exception as e:
-                    raise StabilityServiceError(f"응답 처리 오류: {str(e)}")
-                    
-        except requests.exceptions.RequestException as e:
-            raise StabilityServiceError(f"네트워크 오류: {str(e)}")
+        if stream:
+            return await self._open_image_stream("/v2beta/stable-image/generate/core", "Core", data, files, timeout)
+        return await self._post_image("/v2beta/stable-image/generate/core", "Core", data, files, timeout)
     
-    def generate_sd35_image(self, prompt: str, mode: str = "text-to-image",
-                           model: str = "sd3.5-large", image: Optional[bytes] = None,
-                           strength: Optional[float] = None, aspect_ratio: Optional[str] = "1:1",
-                           output_format: str = "png", style_preset: Optional[str] = None,
-                           negative_prompt: Optional[str] = None, seed: Optional[int] = None,
-                           cfg_scale: Optional[float] = None) -> bytes:
+    async def generate_sd35_image(self, prompt: str, mode: str = "text-to-image",
+                                  model: str = "sd3.5-large", image: Optional[bytes] = None,
+                                  strength: Optional[float] = None, aspect_ratio: Optional[str] = "1:1",
+                                  output_format: str = "png", style_preset: Optional[str] = None,
+                                  negative_prompt: Optional[str] = None, seed: Optional[int] = None,
+                                  cfg_scale: Optional[float] = None, timeout: Optional[float] = None,
+                                  stream: bool = False) -> Union[bytes, "ImageStream"]:
         """
         Stable Diffusion 3.5로 이미지 생성
+        stream=True이면 바이트 대신 ImageStream 반환 (캐시/요청 합치기 미적용)
         """
         mode_value = self._get_enum_value(mode)
         model_value = self._get_enum_value(model)
@@ -161,8 +398,8 @@ class StabilityService:
             if strength is None:
                 raise StabilityServiceError("image-to-image 모드에서는 strength가 필요합니다.")
             
-            files["image"] = ("image.png", io.BytesIO(image), "image/png")
-            data["strength"] = strength
+            files["image"] = ("image.png", image, "image/png")
+            data["strength"] = str(strength)
         
         if style_preset:
             data["style_preset"] = self._get_enum_value(style_preset)
@@ -175,56 +412,23 @@ class StabilityService:
         
         logger.info(f"SD3.5 이미지 생성 요청: {mode_value} - {prompt[:50]}...")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Accept": "image/*"
-        }
+        # SD3.5 API는 모든 모드에서 multipart/form-data를 요구
+        # text-to-image 모드에서는 빈 files 딕셔너리를 전달
+        if mode_value == "text-to-image":
+            files["none"] = ""  # 문서 예시에 따른 빈 files 항목
         
-        try:
-            url = f"{self.BASE_URL}/v2beta/stable-image/generate/sd3"
-            
-            # SD3.5 API는 모든 모드에서 multipart/form-data를 요구
-            # text-to-image 모드에서는 빈 files 딕셔너리를 전달
-            if mode_value == "text-to-image":
-                files["none"] = ""  # 문서 예시에 따른 빈 files 항목
-            
-            response = requests.post(url, headers=headers, data=data, files=files, timeout=60)
-            
-            if response.status_code != 200:
-                error_data = None
-                try:
-                    error_data = response.json()
-                except:
-                    pass
-                
-                raise StabilityServiceError(
-                    f"SD3.5 API 요청 실패: {response.status_code} - {response.text}",
-                    status_code=response.status_code,
-                    response_data=error_data
-                )
-            
-            if response.headers.get('content-type', '').startswith('image/'):
-                return response.content
-            else:
-                try:
-                    json_data = response.json()
-                    if 'artifacts' in json_data and len(json_data['artifacts']) > 0:
-                        import base64
-                        return base64.b64decode(json_data['artifacts'][0]['base64'])
-                    else:
-                        raise StabilityServiceError("이미지 데이터를 찾을 수 없습니다.")
-                except Exception as e:
-                    raise StabilityServiceError(f"응답 처리 오류: {str(e)}")
-                    
-        except requests.exceptions.RequestException as e:
-            raise StabilityServiceError(f"네트워크 오류: {str(e)}")
+        if stream:
+            return await self._open_image_stream("/v2beta/stable-image/generate/sd3", "SD3.5", data, files, timeout)
+        return await self._post_image("/v2beta/stable-image/generate/sd3", "SD3.5", data, files, timeout)
     
-    def generate_ultra_image(self, prompt: str, aspect_ratio: str = "1:1",
-                           output_format: str = "png", image: Optional[bytes] = None,
-                           strength: Optional[float] = None, style_preset: Optional[str] = None,
-                           negative_prompt: Optional[str] = None, seed: Optional[int] = None) -> bytes:
+    async def generate_ultra_image(self, prompt: str, aspect_ratio: str = "1:1",
+                                   output_format: str = "png", image: Optional[bytes] = None,
+                                   strength: Optional[float] = None, style_preset: Optional[str] = None,
+                                   negative_prompt: Optional[str] = None, seed: Optional[int] = None,
+                                   timeout: Optional[float] = None, stream: bool = False) -> Union[bytes, "ImageStream"]:
         """
         Stable Image Ultra로 이미지 생성
+        stream=True이면 바이트 대신 ImageStream 반환 (캐시/요청 합치기 미적용)
         """
         files = {}
         data = {
@@ -234,9 +438,11 @@ class StabilityService:
         }
         
         if image:
-            files["image"] = ("image.png", io.BytesIO(image), "image/png")
+            files["image"] = ("image.png", image, "image/png")
             if strength is not None:
-                data["strength"] = strength
+                data["strength"] = str(strength)
+        else:
+            files["none"] = ""  # multipart/form-data 요청을 위한 빈 항목
         
         if style_preset:
             data["style_preset"] = self._get_enum_value(style_preset)
@@ -247,57 +453,25 @@ class StabilityService:
         
         logger.info(f"Ultra 이미지 생성 요청: {prompt[:50]}...")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Accept": "image/*"
-        }
-        
-        try:
-            url = f"{self.BASE_URL}/v2beta/stable-image/generate/ultra"
-            response = requests.post(url, headers=headers, data=data, files=files, timeout=60)
-            
-            if response.status_code != 200:
-                error_data = None
-                try:
-                    error_data = response.json()
-                except:
-                    pass
-                
-                raise StabilityServiceError(
-                    f"Ultra API 요청 실패: {response.status_code} - {response.text}",
-                    status_code=response.status_code,
-                    response_data=error_data
-                )
-            
-            if response.headers.get('content-type', '').startswith('image/'):
-                return response.content
-            else:
-                try:
-                    json_data = response.json()
-                    if 'artifacts' in json_data and len(json_data['artifacts']) > 0:
-                        import base64
-                        return base64.b64decode(json_data['artifacts'][0]['base64'])
-                    else:
-                        raise StabilityServiceError("이미지 데이터를 찾을 수 없습니다.")
-                except Exception as e:
-                    raise StabilityServiceError(f"응답 처리 오류: {str(e)}")
-                    
-        except requests.exceptions.RequestException as e:
-            raise StabilityServiceError(f"네트워크 오류: {str(e)}")
+        if stream:
+            return await self._open_image_stream("/v2beta/stable-image/generate/ultra", "Ultra", data, files, timeout)
+        return await self._post_image("/v2beta/stable-image/generate/ultra", "Ultra", data, files, timeout)
     
-    def sketch_to_image(self, prompt: str, image: bytes, control_strength: float = 0.7,
-                       output_format: str = "png", style_preset: Optional[str] = None,
-                       negative_prompt: Optional[str] = None, seed: Optional[int] = None) -> bytes:
+    async def sketch_to_image(self, prompt: str, image: bytes, control_strength: float = 0.7,
+                              output_format: str = "png", style_preset: Optional[str] = None,
+                              negative_prompt: Optional[str] = None, seed: Optional[int] = None,
+                              timeout: Optional[float] = None, stream: bool = False) -> Union[bytes, "ImageStream"]:
         """
         스케치를 이미지로 변환
+        stream=True이면 바이트 대신 ImageStream 반환 (캐시/요청 합치기 미적용)
         """
         files = {
-            "image": ("sketch.png", io.BytesIO(image), "image/png")
+            "image": ("sketch.png", image, "image/png")
         }
         
         data = {
             "prompt": prompt,
-            "control_strength": control_strength,
+            "control_strength": str(control_strength),
             "output_format": self._get_enum_value(output_format)
         }
         
@@ -310,114 +484,35 @@ class StabilityService:
         
         logger.info(f"스케치→이미지 변환 요청: {prompt[:50]}...")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Accept": "image/*"
-        }
-        
-        try:
-            url = f"{self.BASE_URL}/v2beta/stable-image/control/sketch"
-            response = requests.post(url, headers=headers, data=data, files=files, timeout=60)
-            
-            if response.status_code != 200:
-                error_data = None
-                try:
-                    error_data = response.json()
-                except:
-                    pass
-                
-                raise StabilityServiceError(
-                    f"Sketch API 요청 실패: {response.status_code} - {response.text}",
-                    status_code=response.status_code,
-                    response_data=error_data
-                )
-            
-            if response.headers.get('content-type', '').startswith('image/'):
-                return response.content
-            else:
-                try:
-                    json_data = response.json()
-                    if 'artifacts' in json_data and len(json_data['artifacts']) > 0:
-                        import base64
-                        return base64.b64decode(json_data['artifacts'][0]['base64'])
-                    else:
-                        raise StabilityServiceError("이미지 데이터를 찾을 수 없습니다.")
-                except Exception as e:
-                    raise StabilityServiceError(f"응답 처리 오류: {str(e)}")
-                    
-        except requests.exceptions.RequestException as e:
-            raise StabilityServiceError(f"네트워크 오류: {str(e)}")
+        if stream:
+            return await self._open_image_stream("/v2beta/stable-image/control/sketch", "Sketch", data, files, timeout)
+        return await self._post_image("/v2beta/stable-image/control/sketch", "Sketch", data, files, timeout)
     
     def validate_image_file(self, image_file: BinaryIO) -> Dict[str, Any]:
         """
         이미지 파일 검증
         """
-        try:
-            image = Image.open(image_file)
-            
-            width, height = image.size
-            format_name = image.format
-            mode = image.mode
-            
-            image_file.seek(0, 2)
-            file_size = image_file.tell()
-            image_file.seek(0)
-            
-            max_size = 50 * 1024 * 1024
-            min_resolution = 64
-            max_pixels = 9437184
-            
-            errors = []
-            
-            if file_size > max_size:
-                errors.append(f"파일 크기가 {max_size // (1024*1024)}MB를 초과합니다.")
-            
-            if width < min_resolution or height < min_resolution:
-                errors.append(f"이미지 해상도가 {min_resolution}x{min_resolution}보다 작습니다.")
-            
-            if width * height > max_pixels:
-                errors.append(f"이미지 픽셀 수가 {max_pixels}를 초과합니다.")
-            
-            aspect_ratio = width / height
-            if aspect_ratio < 0.4 or aspect_ratio > 2.5:
-                errors.append("이미지 종횡비가 지원 범위(1:2.5 ~ 2.5:1)를 벗어납니다.")
-            
-            supported_formats = ['JPEG', 'PNG', 'WEBP']
-            if format_name not in supported_formats:
-                errors.append(f"지원되지 않는 이미지 형식입니다. 지원 형식: {', '.join(supported_formats)}")
-            
-            return {
-                "valid": len(errors) == 0,
-                "error": "; ".join(errors) if errors else None,
-                "info": {
-                    "width": width,
-                    "height": height,
-                    "format": format_name,
-                    "mode": mode,
-                    "file_size": file_size,
-                    "aspect_ratio": round(aspect_ratio, 2)
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "valid": False,
-                "error": f"이미지 파일 처리 오류: {str(e)}",
-                "info": None
-            }
+        image_file.seek(0)
+        image_data = image_file.read()
+        image_file.seek(0)
+        return image_processing.validate_generation_image(image_data)
+    
+    async def validate_image_file_async(self, image_data: bytes) -> Dict[str, Any]:
+        """
+        이미지 파일 검증
+        헤더만 읽으므로 이미지 처리 풀을 거치지 않고 바로 실행
+        """
+        return image_processing.validate_generation_image(image_data)
     
     def get_image_info(self, image_data: bytes) -> Dict[str, Any]:
         """
         이미지 바이너리 데이터의 정보 조회
         """
-        try:
-            image = Image.open(io.BytesIO(image_data))
-            return {
-                "width": image.width,
-                "height": image.height,
-                "format": image.format,
-                "mode": image.mode,
-                "size": len(image_data)
-            }
-        except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+        return image_processing.get_image_info(image_data)
+    
+    async def get_image_info_async(self, image_data: bytes) -> Dict[str, Any]:
+        """
+        이미지 바이너리 데이터의 정보 조회
+        헤더만 읽으므로 이미지 처리 풀을 거치지 않고 바로 실행
+        """
+        return image_processing.get_image_info(image_data)
@@ -0,0 +1,273 @@
+"""
+인메모리 캐시 유틸리티
+LRU + TTL 정책을 가진 프로세스 내 캐시 제공
+자주 조회되지만 거의 변하지 않는 데이터의 반복 조회 비용을 줄이기 위해 사용
+"""
+import json
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class TTLCache:
+    """
+    LRU + TTL 캐시
+    최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    TTL이 지난 항목은 조회 시점에 만료 처리
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        캐시에서 값 조회
+
+        Returns:
+            캐시된 값 (없거나 만료된 경우 None)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        # 최근 사용 항목으로 이동
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """캐시에 값 저장 (용량 초과 시 LRU 항목 제거)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """특정 키 무효화"""
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        조건에 맞는 모든 항목 무효화
+
+        Args:
+            predicate: (키, 값)을 받아 제거 여부를 반환하는 함수
+
+        Returns:
+            제거된 항목 수
+        """
+        keys = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def items(self) -> List[tuple]:
+        """(키, 값) 목록 반환 (만료 여부와 관계없이 현재 저장된 항목)"""
+        return [(key, value) for key, (_, value) in self._entries.items()]
+
+    def clear(self) -> None:
+        """전체 캐시 비우기"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+def _message_size(message: Dict[str, Any]) -> int:
+    """메시지 하나가 차지하는 대략적인 바이트 수 (JSON 직렬화 기준)"""
+    return len(json.dumps(message, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class _ThreadBuffer:
+    """스레드 하나의 최근 메시지 링 버퍼"""
+
+    def __init__(self, messages: List[Dict[str, Any]], max_messages: int, complete: bool, expires_at: float):
+        self.messages: deque = deque(maxlen=max_messages)
+        self.size = 0
+        # 스레드의 메시지 전체를 담고 있는지 (오래된 메시지가 밀려나면 False)
+        self.complete = complete
+        self.expires_at = expires_at
+        for message in messages:
+            self.append(message)
+
+    def append(self, message: Dict[str, Any]) -> int:
+        """메시지 추가 후 증가한 바이트 수 반환 (가득 차면 가장 오래된 메시지 제거)"""
+        delta = _message_size(message)
+        if len(self.messages) == self.messages.maxlen:
+            delta -= _message_size(self.messages[0])
+            self.complete = False
+        self.messages.append(message)
+        self.size += delta
+        return delta
+
+
+class ThreadMessageCache:
+    """
+    스레드별 최근 메시지 캐시
+    스레드마다 최근 messages_per_thread개를 링 버퍼로 유지하고,
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 스레드부터 제거
+
+    - 첫 조회 시 DB에서 읽어 채우고(store), 이후 새 메시지는 append로 이어 붙임
+    - 채우는 도중 같은 스레드에 메시지가 추가되면 조회 결과가 이미 낡았으므로 저장하지 않음
+    - 다른 워커 프로세스의 쓰기를 반영하기 위해 ttl_seconds가 지나면 다시 읽음
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, messages_per_thread: int = 100,
+                 ttl_seconds: float = 600.0):
+        self.max_bytes = max_bytes
+        self.messages_per_thread = messages_per_thread
+        self.ttl_seconds = ttl_seconds
+        self._threads: "OrderedDict[Hashable, _ThreadBuffer]" = OrderedDict()
+        # 조회 중인 스레드 -> 조회 도중 메시지가 추가되었는지
+        self._loading: Dict[Hashable, bool] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_buffer(self, thread_id: Hashable) -> Optional[_ThreadBuffer]:
+        """만료되지 않은 스레드 버퍼 반환 (최근 사용으로 이동)"""
+        buffer = self._threads.get(thread_id)
+        if buffer is None:
+            return None
+        if buffer.expires_at < time.monotonic():
+            self.invalidate(thread_id)
+            return None
+        self._threads.move_to_end(thread_id)
+        return buffer
+
+    def get_recent(self, thread_id: Hashable, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        스레드의 최근 메시지 limit개 조회 (시간순)
+
+        Returns:
+            메시지 목록 (캐시에 없거나 limit개를 채울 수 없으면 None)
+        """
+        buffer = self._get_buffer(thread_id)
+        if buffer is None or (len(buffer.messages) < limit and not buffer.complete):
+            self.misses += 1
+            return None
+        self.hits += 1
+        messages = list(buffer.messages)
+        return messages[-limit:] if limit > 0 else []
+
+    def get_oldest(self, thread_id: Hashable, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        스레드의 처음 메시지 limit개 조회 (시간순)
+
+        Returns:
+            메시지 목록 (스레드 전체를 담고 있지 않으면 None)
+        """
+        buffer = self._get_buffer(thread_id)
+        if buffer is None or not buffer.complete:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(buffer.messages)[:limit]
+
+    def begin_load(self, thread_id: Hashable) -> None:
+        """DB 조회 시작 표시 (조회 도중 추가되는 메시지 감지용)"""
+        self._loading.setdefault(thread_id, False)
+
+    def cancel_load(self, thread_id: Hashable) -> None:
+        """DB 조회 실패 시 조회 중 표시 해제"""
+        self._loading.pop(thread_id, None)
+
+    def store(self, thread_id: Hashable, messages: List[Dict[str, Any]], complete: bool) -> None:
+        """
+        DB에서 읽은 최근 메시지(시간순)로 스레드 버퍼 채우기
+
+        Args:
+            thread_id: 스레드 ID
+            messages: 최근 메시지 목록
+            complete: 스레드의 메시지 전체인지 여부
+        """
+        if self._loading.pop(thread_id, False):
+            # 조회 도중 새 메시지가 추가되어 결과가 낡음
+            return
+
+        self.invalidate(thread_id)
+        buffer = _ThreadBuffer(
+            messages[-self.messages_per_thread:], self.messages_per_thread,
+            complete and len(messages) <= self.messages_per_thread,
+            time.monotonic() + self.ttl_seconds
+        )
+        self._threads[thread_id] = buffer
+        self.size += buffer.size
+        self._evict()
+
+    def append(self, thread_id: Hashable, message: Dict[str, Any]) -> None:
+        """새로 저장된 메시지를 캐시된 스레드 버퍼에 추가"""
+        if thread_id in self._loading:
+            self._loading[thread_id] = True
+
+        buffer = self._threads.get(thread_id)
+        if buffer is None:
+            return
+        self.size += buffer.append(message)
+        self._threads.move_to_end(thread_id)
+        self._evict()
+
+    def invalidate(self, thread_id: Hashable) -> None:
+        """스레드 버퍼 제거"""
+        buffer = self._threads.pop(thread_id, None)
+        if buffer is not None:
+            self.size -= buffer.size
+
+    def _evict(self) -> None:
+        """전체 크기가 max_bytes 이하가 될 때까지 LRU 스레드 제거"""
+        while self.size > self.max_bytes and self._threads:
+            _, buffer = self._threads.popitem(last=False)
+            self.size -= buffer.size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """전체 캐시 비우기"""
+        self._threads.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "threads": len(self._threads),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "messages_per_thread": self.messages_per_thread,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
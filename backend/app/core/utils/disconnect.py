@@ -0,0 +1,68 @@
+"""
+클라이언트 연결 끊김 감지 유틸리티
+브라우저가 요청을 취소하면 진행 중인 외부 API 호출(이미지 생성 등)도 함께 취소하여
+이미 떠난 사용자를 위해 연결/크레딧을 쓰지 않도록 함
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+# nginx 관례: 클라이언트가 응답 전에 연결을 닫음
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T],
+                               poll_interval: float = 0.5) -> T:
+    """
+    awaitable을 실행하면서 클라이언트 연결을 주기적으로 확인
+    연결이 끊기면 작업을 취소하고 HTTPException(499) 발생
+
+    Args:
+        request: 현재 요청
+        awaitable: 실행할 코루틴
+        poll_interval: 연결 확인 주기 (초)
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    finally:
+        # 라우트 자체가 취소된 경우에도 하위 작업을 남기지 않음
+        if not task.done():
+            task.cancel()
+
+
+async def stream_until_disconnect(request: Request, source: AsyncIterator[T],
+                                  poll_interval: float = 0.5) -> AsyncIterator[T]:
+    """
+    source의 항목을 그대로 전달하면서 클라이언트 연결을 주기적으로 확인
+    연결이 끊기거나 소비자가 중간에 멈추면 source를 닫아(aclose) 업스트림 스트림도 함께 종료
+
+    Args:
+        request: 현재 요청
+        source: 전달할 비동기 이터레이터 (비동기 제너레이터)
+        poll_interval: 연결 확인 최소 간격 (초)
+    """
+    next_check = time.monotonic() + poll_interval
+    try:
+        async for item in source:
+            yield item
+            if time.monotonic() >= next_check:
+                if await request.is_disconnected():
+                    break
+                next_check = time.monotonic() + poll_interval
+    finally:
+        await source.aclose()
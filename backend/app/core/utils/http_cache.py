@@ -0,0 +1,126 @@
+"""
+HTTP 캐시/부분 요청 유틸리티
+ETag 비교(If-None-Match, If-Range)와 Range 헤더 해석을 담당
+이미지처럼 내용이 바뀌지 않는 리소스를 브라우저/프록시가 캐시할 수 있도록 사용
+"""
+from typing import AsyncIterator, Callable, Mapping, Optional, Tuple
+
+from fastapi.responses import Response, StreamingResponse
+
+# 내용이 바뀌지 않는 리소스용 Cache-Control (1년)
+# 세션 접근 권한을 확인한 응답이므로 공유 프록시에는 저장하지 않음 (private)
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def make_etag(digest: str) -> str:
+    """콘텐츠 해시로 강한(strong) ETag 생성"""
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 확인
+    약한 비교를 사용하므로 W/ 접두사는 무시
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 바이트 Range 헤더를 (시작, 끝) 위치로 변환 (끝 포함)
+
+    Args:
+        range_header: Range 요청 헤더 (예: "bytes=0-1023", "bytes=500-", "bytes=-500")
+        size: 리소스 전체 크기
+
+    Returns:
+        (start, end) 또는 Range 헤더가 없거나 해석할 수 없으면 None (전체 응답)
+
+    Raises:
+        ValueError: 범위가 리소스 크기를 벗어난 경우 (416 응답 대상)
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    spec = range_header[len("bytes="):].strip()
+    # 여러 구간 요청은 지원하지 않고 전체 응답으로 처리
+    if "," in spec or "-" not in spec:
+        return None
+
+    start_text, end_text = (part.strip() for part in spec.split("-", 1))
+    if not (start_text or end_text) or not all(part.isdigit() for part in (start_text, end_text) if part):
+        return None
+
+    if not start_text:
+        # 마지막 N바이트
+        suffix = int(end_text)
+        if suffix == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - suffix, 0), size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def cached_stream_response(
+    request_headers: Mapping[str, str],
+    etag: str,
+    content_type: str,
+    size: int,
+    open_range: Callable[[int, Optional[int]], AsyncIterator[bytes]],
+    vary: Optional[str] = None
+) -> Response:
+    """
+    ETag/Range를 처리한 캐시 가능한 스트리밍 응답 생성
+
+    - If-None-Match가 일치하면 본문 없이 304
+    - Range 요청이면 해당 구간만 206 (If-Range가 다르면 전체 응답)
+    - 범위를 벗어나면 416
+
+    Args:
+        request_headers: 요청 헤더
+        etag: 리소스의 강한 ETag
+        content_type: 응답 Content-Type
+        size: 리소스 전체 크기
+        open_range: (start, end)를 받아 해당 구간 바이트를 내보내는 비동기 이터레이터 생성 함수
+        vary: 응답이 달라지는 요청 헤더 (예: 포맷 협상 시 Accept)
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes"
+    }
+    if vary:
+        headers["Vary"] = vary
+
+    if etag_matches(request_headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request_headers.get("range")
+    if_range = request_headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(open_range(0, None), media_type=content_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(open_range(start, end), status_code=206, media_type=content_type, headers=headers)
@@ -0,0 +1,295 @@
+"""
+Pillow 이미지 처리 함수 모음
+- probe_image: 헤더만 읽어 포맷/크기/모드/프레임 수 확인 (픽셀 디코딩 없음, 검증용)
+- decode_image: 실제 픽셀이 필요한 경우의 단일 디코딩 경로 (디컴프레션 밤 차단 포함)
+- 디코딩/변환/인코딩처럼 CPU를 많이 쓰는 함수는 이미지 처리 프로세스 풀에서 실행되므로
+  모듈 최상위에 두고 바이트/기본 타입만 주고받음 (pickle 가능해야 함)
+"""
+import io
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from PIL import Image
+
+from app.core.config.settings import IMAGE_MAX_PIXELS
+from app.core.utils.image_renditions import encode_renditions
+
+# 갤러리 업로드 허용 포맷
+GALLERY_ALLOWED_FORMATS = ['JPEG', 'PNG', 'WebP']
+
+# 이미지 생성(Stability) 입력 이미지 제약
+GENERATION_MAX_FILE_SIZE = 50 * 1024 * 1024
+GENERATION_MIN_RESOLUTION = 64
+GENERATION_MAX_PIXELS = 9437184
+GENERATION_SUPPORTED_FORMATS = ['JPEG', 'PNG', 'WEBP']
+
+
+class ImageProbeError(ValueError):
+    """이미지 헤더를 읽을 수 없거나 허용 크기를 넘는 경우"""
+    pass
+
+
+def probe_image(image_data: bytes, max_pixels: int = IMAGE_MAX_PIXELS) -> Dict[str, Any]:
+    """
+    이미지 헤더만 읽어 기본 정보 조회 (픽셀 디코딩 없음)
+    선언된 픽셀 수가 max_pixels를 넘으면 메모리 할당 전에 거부 (디컴프레션 밤 방지)
+
+    Returns:
+        format, width, height, mode, frames, file_size를 담은 딕셔너리
+
+    Raises:
+        ImageProbeError: 이미지가 아니거나 픽셀 수가 너무 큰 경우
+    """
+    try:
+        with Image.open(io.BytesIO(image_data)) as image:
+            width, height = image.size
+            info = {
+                "format": image.format,
+                "width": width,
+                "height": height,
+                "mode": image.mode,
+                "frames": getattr(image, "n_frames", 1),
+                "file_size": len(image_data)
+            }
+    except Image.DecompressionBombError as e:
+        raise ImageProbeError(f"Image is too large: {str(e)}")
+    except Exception as e:
+        raise ImageProbeError(f"Cannot identify image: {str(e)}")
+
+    if width * height > max_pixels:
+        raise ImageProbeError(f"Image is too large: {width}x{height} exceeds {max_pixels} pixels")
+    return info
+
+
+def decode_image(image_data: bytes, max_dimension: Optional[int] = None,
+                 max_pixels: int = IMAGE_MAX_PIXELS) -> Image.Image:
+    """
+    이미지를 RGB 픽셀로 디코딩 (헤더 검사 후에만 할당)
+    JPEG는 max_dimension에 맞춰 DCT 단계에서 축소 디코딩하여 메모리/시간 절약
+
+    Raises:
+        ImageProbeError: probe_image와 동일
+    """
+    probe_image(image_data, max_pixels)
+    image = Image.open(io.BytesIO(image_data))
+    if max_dimension and image.format == "JPEG":
+        image.draft("RGB", (max_dimension, max_dimension))
+    image.load()
+    return to_rgb(image)
+
+
+def to_rgb(image: Image.Image) -> Image.Image:
+    """투명 배경은 흰색으로 채워 RGB로 변환"""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def _encode_gallery_image(image: Image.Image, image_format: str, max_bytes: Optional[int]) -> bytes:
+    """정규화된 이미지를 인코딩 (max_bytes 지정 시 품질/해상도를 낮춰 맞춤)"""
+    def encode(img: Image.Image, quality: int) -> bytes:
+        img_buffer = io.BytesIO()
+        img.save(img_buffer, format=image_format, quality=quality, optimize=True)
+        return img_buffer.getvalue()
+
+    processed_image_data = encode(image, 85)
+    if max_bytes is None:
+        return processed_image_data
+
+    # Start with higher quality and reduce if file is still too large
+    quality = 80
+    while len(processed_image_data) > max_bytes and quality >= 60:
+        processed_image_data = encode(image, quality)
+        quality -= 5
+
+    # If still too large after compression, resize further
+    scale_factor = 0.8
+    while len(processed_image_data) > max_bytes and scale_factor > 0.3:
+        new_size = (int(image.size[0] * scale_factor), int(image.size[1] * scale_factor))
+        processed_image_data = encode(image.resize(new_size, Image.Resampling.LANCZOS), 70)
+        scale_factor -= 0.1
+
+    return processed_image_data
+
+
+def process_gallery_upload(image_data: bytes, image_format: str, max_dimension: int = 1920,
+                           max_bytes: Optional[int] = None, rendition_sizes: Optional[Dict[str, int]] = None,
+                           rendition_formats: Iterable[str] = ()) -> Tuple[bytes, Dict[Tuple[str, str], bytes]]:
+    """
+    갤러리 업로드 이미지를 한 번만 디코딩하여 저장본과 렌디션을 함께 생성
+    RGB 변환 후 긴 변을 max_dimension 이하로 줄이고 다시 인코딩
+
+    Args:
+        image_data: 업로드된 이미지 바이트
+        image_format: 저장 포맷 (PIL 포맷 이름)
+        max_dimension: 최대 가로/세로 픽셀
+        max_bytes: 지정 시 이 크기 이하가 될 때까지 품질/해상도를 낮춤
+        rendition_sizes: 렌디션 이름 -> 긴 변 픽셀 (없으면 렌디션 생성 안 함)
+        rendition_formats: 렌디션 포맷 목록
+
+    Returns:
+        (저장본 바이트, (렌디션 이름, 포맷) -> 바이트)
+
+    Raises:
+        Exception: 이미지를 열거나 인코딩할 수 없는 경우
+    """
+    image = decode_image(image_data, max_dimension)
+
+    # Resize if too large
+    if image.size[0] > max_dimension or image.size[1] > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+    processed_image_data = _encode_gallery_image(image, image_format, max_bytes)
+    renditions = encode_renditions(image, rendition_sizes, rendition_formats) if rendition_sizes else {}
+    return processed_image_data, renditions
+
+
+def process_generated_image(image_data: bytes, max_dimension: int = 1920, max_bytes: Optional[int] = None,
+                            rendition_sizes: Optional[Dict[str, int]] = None,
+                            rendition_formats: Iterable[str] = ()) -> Tuple[bytes, str, Dict[Tuple[str, str], bytes]]:
+    """
+    생성된 이미지(Stability 결과)를 갤러리 저장용으로 처리
+    한 번만 디코딩하여 렌디션을 만들고, 원본이 갤러리 제한 안이면 다시 인코딩하지 않고 그대로 저장
+
+    Args:
+        image_data: 생성된 이미지 바이트
+        max_dimension: 최대 가로/세로 픽셀 (넘으면 다시 인코딩)
+        max_bytes: 최대 바이트 수 (넘으면 다시 인코딩)
+        rendition_sizes: 렌디션 이름 -> 긴 변 픽셀 (없으면 렌디션 생성 안 함)
+        rendition_formats: 렌디션 포맷 목록
+
+    Returns:
+        (저장본 바이트, 저장 포맷, (렌디션 이름, 포맷) -> 바이트)
+
+    Raises:
+        Exception: 이미지를 열거나 인코딩할 수 없는 경우
+    """
+    info = probe_image(image_data)
+    image_format = (info["format"] or "").upper()
+    if image_format not in GENERATION_SUPPORTED_FORMATS:
+        raise ImageProbeError(f"Unsupported format: {info['format']}")
+
+    image = decode_image(image_data, max_dimension)
+    renditions = encode_renditions(image, rendition_sizes, rendition_formats) if rendition_sizes else {}
+
+    within_limits = (
+        max(info["width"], info["height"]) <= max_dimension
+        and (max_bytes is None or len(image_data) <= max_bytes)
+    )
+    if within_limits:
+        return image_data, image_format, renditions
+
+    if image.size[0] > max_dimension or image.size[1] > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    return _encode_gallery_image(image, image_format, max_bytes), image_format, renditions
+
+
+def build_renditions(image_data: bytes, sizes: Dict[str, int],
+                     formats: Iterable[str]) -> Dict[Tuple[str, str], bytes]:
+    """저장된 이미지를 디코딩하여 렌디션 생성 (렌디션이 없는 기존 이미지용)"""
+    return encode_renditions(decode_image(image_data, max(sizes.values())), sizes, formats)
+
+
+def validate_gallery_image(file_data: bytes, max_size_mb: int) -> Dict[str, Any]:
+    """
+    갤러리 업로드 이미지 검증 (크기, 헤더, 포맷) - 픽셀 디코딩 없음
+
+    Returns:
+        valid, error 또는 format, size를 담은 딕셔너리
+    """
+    try:
+        # Check file size
+        file_size_mb = len(file_data) / (1024 * 1024)
+        if file_size_mb > max_size_mb:
+            return {"valid": False, "error": f"File too large. Maximum size is {max_size_mb}MB"}
+
+        # Check if it's a valid image (header only)
+        try:
+            info = probe_image(file_data)
+        except ImageProbeError as e:
+            error = str(e) if str(e).startswith("Image is too large") else "Invalid image file"
+            return {"valid": False, "error": error}
+
+        # Check format
+        if info["format"] not in GALLERY_ALLOWED_FORMATS:
+            return {"valid": False, "error": f"Unsupported format. Allowed: {', '.join(GALLERY_ALLOWED_FORMATS)}"}
+
+        return {"valid": True, "format": info["format"], "size": (info["width"], info["height"])}
+
+    except Exception as e:
+        return {"valid": False, "error": f"File validation error: {str(e)}"}
+
+
+def validate_generation_image(image_data: bytes) -> Dict[str, Any]:
+    """
+    이미지 생성 입력 이미지 검증 (파일 크기, 해상도, 픽셀 수, 종횡비, 포맷)
+
+    Returns:
+        valid, error, info를 담은 딕셔너리
+    """
+    try:
+        info = probe_image(image_data)
+
+        width, height = info["width"], info["height"]
+        format_name = info["format"]
+        mode = info["mode"]
+        file_size = info["file_size"]
+
+        errors = []
+
+        if file_size > GENERATION_MAX_FILE_SIZE:
+            errors.append(f"파일 크기가 {GENERATION_MAX_FILE_SIZE // (1024*1024)}MB를 초과합니다.")
+
+        if width < GENERATION_MIN_RESOLUTION or height < GENERATION_MIN_RESOLUTION:
+            errors.append(f"이미지 해상도가 {GENERATION_MIN_RESOLUTION}x{GENERATION_MIN_RESOLUTION}보다 작습니다.")
+
+        if width * height > GENERATION_MAX_PIXELS:
+            errors.append(f"이미지 픽셀 수가 {GENERATION_MAX_PIXELS}를 초과합니다.")
+
+        aspect_ratio = width / height
+        if aspect_ratio < 0.4 or aspect_ratio > 2.5:
+            errors.append("이미지 종횡비가 지원 범위(1:2.5 ~ 2.5:1)를 벗어납니다.")
+
+        if format_name not in GENERATION_SUPPORTED_FORMATS:
+            errors.append(f"지원되지 않는 이미지 형식입니다. 지원 형식: {', '.join(GENERATION_SUPPORTED_FORMATS)}")
+
+        return {
+            "valid": len(errors) == 0,
+            "error": "; ".join(errors) if errors else None,
+            "info": {
+                "width": width,
+                "height": height,
+                "format": format_name,
+                "mode": mode,
+                "file_size": file_size,
+                "aspect_ratio": round(aspect_ratio, 2)
+            }
+        }
+
+    except Exception as e:
+        return {
+            "valid": False,
+            "error": f"이미지 파일 처리 오류: {str(e)}",
+            "info": None
+        }
+
+
+def get_image_info(image_data: bytes) -> Dict[str, Any]:
+    """이미지 바이트의 크기/포맷/모드 정보 조회 (헤더만 읽음)"""
+    try:
+        info = probe_image(image_data)
+        return {
+            "width": info["width"],
+            "height": info["height"],
+            "format": info["format"],
+            "mode": info["mode"],
+            "frames": info["frames"],
+            "size": len(image_data)
+        }
+    except Exception as e:
+        return {"error": str(e)}
@@ -0,0 +1,83 @@
+"""
+갤러리 이미지 리사이즈(렌디션) 유틸리티
+원본 이미지에서 긴 변 기준 여러 크기의 축소본을 WebP/AVIF/JPEG로 생성
+갤러리 그리드처럼 작은 타일에는 원본 대신 작은 렌디션을 내려보내 전송량을 줄임
+"""
+import io
+from typing import Dict, Iterable, Optional, Tuple
+
+from PIL import Image, features
+
+# 포맷별 인코딩 옵션
+ENCODE_OPTIONS = {
+    "WEBP": {"quality": 80, "method": 4},
+    "AVIF": {"quality": 60},
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+}
+
+# 포맷별 Accept 헤더 MIME 타입
+FORMAT_MIME_TYPES = {
+    "WEBP": "image/webp",
+    "AVIF": "image/avif",
+    "JPEG": "image/jpeg",
+}
+
+
+def supported_formats(formats: Iterable[str]) -> Tuple[str, ...]:
+    """설치된 Pillow가 인코딩할 수 있는 포맷만 반환 (JPEG는 항상 포함)"""
+    result = []
+    for image_format in formats:
+        image_format = image_format.upper()
+        if image_format == "WEBP" and not features.check("webp"):
+            continue
+        if image_format == "AVIF" and not features.check("avif"):
+            continue
+        if image_format in ENCODE_OPTIONS and image_format not in result:
+            result.append(image_format)
+    if "JPEG" not in result:
+        result.append("JPEG")
+    return tuple(result)
+
+
+def negotiate_format(accept: Optional[str], formats: Iterable[str]) -> str:
+    """
+    Accept 헤더를 보고 클라이언트가 받을 수 있는 첫 번째 포맷 선택
+    명시되지 않으면 JPEG로 대체
+    """
+    accept = (accept or "").lower()
+    for image_format in formats:
+        if image_format == "JPEG":
+            continue
+        if FORMAT_MIME_TYPES[image_format] in accept:
+            return image_format
+    return "JPEG"
+
+
+def encode_renditions(image: Image.Image, sizes: Dict[str, int],
+                      formats: Iterable[str]) -> Dict[Tuple[str, str], bytes]:
+    """
+    디코딩된 RGB 이미지 한 장에서 크기 x 포맷 조합의 렌디션 생성
+
+    Args:
+        image: 디코딩된 RGB 이미지
+        sizes: 렌디션 이름 -> 긴 변 픽셀 (원본보다 크게 늘리지는 않음)
+        formats: 생성할 포맷 목록 (WEBP, AVIF, JPEG)
+
+    Returns:
+        (렌디션 이름, 포맷) -> 인코딩된 바이트
+    """
+    renditions = {}
+
+    # 큰 크기부터 줄여 나가며 이전 결과를 재사용
+    current = image
+    for name, long_edge in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        if max(current.size) > long_edge:
+            current = current.copy()
+            current.thumbnail((long_edge, long_edge), Image.Resampling.LANCZOS)
+
+        for image_format in formats:
+            buffer = io.BytesIO()
+            current.save(buffer, format=image_format, **ENCODE_OPTIONS[image_format])
+            renditions[(name, image_format)] = buffer.getvalue()
+
+    return renditions
@@ -0,0 +1,73 @@
+"""
+키셋(커서) 페이지네이션 유틸리티
+(created_at, id) 쌍을 불투명한 커서 문자열로 인코딩/디코딩
+OFFSET 없이 마지막으로 본 행 이후부터 조회하여 페이지가 깊어져도 비용이 일정
+"""
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+
+
+def encode_cursor(created_at: str, item_id: int) -> str:
+    """
+    마지막 행의 (created_at, id)를 커서 문자열로 인코딩
+
+    Args:
+        created_at: 마지막 행의 생성 시각 (ISO 문자열)
+        item_id: 마지막 행의 ID
+
+    Returns:
+        URL-safe base64 커서 문자열
+    """
+    raw = json.dumps([created_at, item_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    커서 문자열을 (created_at, id)로 디코딩
+
+    Raises:
+        ValueError: 커서 형식이 올바르지 않은 경우
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(created_at), int(item_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(cursor: Optional[str]) -> str:
+    """
+    PostgREST용 키셋 조건 생성 (created_at DESC, id DESC 정렬 기준)
+
+    Returns:
+        쿼리스트링 조각 (커서가 없으면 빈 문자열)
+    """
+    if not cursor:
+        return ""
+    created_at, item_id = decode_cursor(cursor)
+    ts = quote(created_at, safe="")
+    return f"&or=(created_at.lt.{ts},and(created_at.eq.{ts},id.lt.{item_id}))"
+
+
+def build_page(rows: list, limit: int) -> Dict[str, Any]:
+    """
+    limit + 1개로 조회한 결과로 페이지 응답 구성
+
+    Args:
+        rows: limit + 1개까지 조회된 행 목록
+        limit: 페이지 크기
+
+    Returns:
+        items, next_cursor, has_more를 담은 딕셔너리
+    """
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return {"items": items, "next_cursor": next_cursor, "has_more": has_more}
@@ -0,0 +1,69 @@
+"""
+single-flight 유틸리티
+같은 키로 동시에 들어온 비동기 호출을 하나로 합쳐 실제 작업은 한 번만 실행하고
+결과(또는 예외)를 기다리던 모든 호출자에게 나눠 줌
+대기자가 모두 떠난 경우에만 실제 작업을 취소
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    """진행 중인 호출 하나와 그 대기자 수"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    키별 진행 중 호출 합치기
+    호출이 끝나면 키를 비우므로 결과를 저장하지는 않음 (캐시가 아님)
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0      # 실제로 실행된 호출 수
+        self.shared = 0     # 진행 중인 호출에 합류한 요청 수
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key로 진행 중인 호출이 있으면 합류하고, 없으면 func()를 실행
+
+        Args:
+            key: 호출을 구분하는 키 (정규화된 요청 해시 등)
+            func: 실제 작업 코루틴을 만드는 함수
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(func()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        flight.waiters += 1
+        try:
+            # 한 대기자가 취소되어도 공유 작업은 계속 진행
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # 취소된 작업에 새 호출자가 합류하지 않도록 키를 먼저 비움
+                self._finish(key, flight)
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """진행 중인 호출 수와 합류 통계 반환"""
+        return {
+            "in_flight": len(self._flights),
+            "waiters": sum(flight.waiters for flight in self._flights.values()),
+            "calls": self.calls,
+            "shared": self.shared
+        }
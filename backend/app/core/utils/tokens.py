@@ -0,0 +1,71 @@
+"""
+토큰 수 계산 유틸리티
+tiktoken이 설치되어 있으면 모델 토크나이저로 정확히 계산하고,
+없으면 문자 종류별 근사치(영문 약 4자당 1토큰, 한글 등은 1자당 1토큰)를 사용
+대화 컨텍스트를 토큰 예산에 맞출 때 사용하므로 약간 크게 세는 쪽으로 근사
+"""
+import math
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# 메시지 하나마다 붙는 역할/구분자 토큰 수 (OpenAI 채팅 형식 기준)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# 첨부 이미지 하나의 토큰 수 근사치 (high detail 512px 타일 4개 기준)
+IMAGE_TOKENS = 765
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: Optional[str]):
+    """모델에 맞는 tiktoken 인코딩 (tiktoken이 없으면 None)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("o200k_base")
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """텍스트의 토큰 수"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def count_message_tokens(message: Dict[str, Any], model: Optional[str] = None) -> int:
+    """채팅 메시지 하나의 토큰 수 (멀티모달 content 포함)"""
+    content = message.get("content")
+    if isinstance(content, str):
+        tokens = count_tokens(content, model)
+    else:
+        tokens = 0
+        for part in content or []:
+            if part.get("type") == "text":
+                tokens += count_tokens(part.get("text", ""), model)
+            elif part.get("type") == "image_url":
+                tokens += IMAGE_TOKENS
+    return tokens + MESSAGE_OVERHEAD_TOKENS
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """텍스트를 max_tokens 이하로 자르고 생략 표시를 붙임"""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    # 이진 탐색으로 예산 안에 들어가는 가장 긴 앞부분 찾기
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + " …(생략)"
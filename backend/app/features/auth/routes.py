@@ -2,9 +2,10 @@
 Auth routes
 API endpoints for authentication
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from .service import AuthService
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
 from app.core.models.schemas import (
     TeacherSignupRequest,
     TeacherLoginRequest,
@@ -14,11 +15,15 @@ from app.core.models.schemas import (
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-auth_service = AuthService()
+
+
+def get_auth_service(db_service: AsyncDatabaseService = Depends(get_database_service)) -> AuthService:
+    """인증 서비스 의존성 (공유 데이터베이스 서비스 주입)"""
+    return AuthService(db_service)
 
 
 @router.post("/teacher/signup", response_model=TeacherResponse)
-async def signup_teacher(request: TeacherSignupRequest):
+async def signup_teacher(request: TeacherSignupRequest, auth_service: AuthService = Depends(get_auth_service)):
     """
     선생님 회원가입 API
     
@@ -31,11 +36,11 @@ async def signup_teacher(request: TeacherSignupRequest):
     Raises:
         HTTPException: 이메일 중복 시 400 에러
     """
-    return auth_service.signup_teacher(request)
+    return await auth_service.signup_teacher(request)
 
 
 @router.post("/teacher/login", response_model=LoginResponse)
-async def login_teacher(request: TeacherLoginRequest):
+async def login_teacher(request: TeacherLoginRequest, auth_service: AuthService = Depends(get_auth_service)):
     """
     선생님 로그인 API
     
@@ -48,11 +53,11 @@ async def login_teacher(request: TeacherLoginRequest):
     Raises:
         HTTPException: 인증 실패 시 401 에러
     """
-    return auth_service.login_teacher(request)
+    return await auth_service.login_teacher(request)
 
 
 @router.post("/student/login", response_model=LoginResponse)
-async def login_student(request: StudentLoginRequest):
+async def login_student(request: StudentLoginRequest, auth_service: AuthService = Depends(get_auth_service)):
     """
     학생 로그인 API
     클래스 코드를 통해 학생이 클래스 세션에 참여
@@ -66,4 +71,4 @@ async def login_student(request: StudentLoginRequest):
     Raises:
         HTTPException: 클래스 코드 무효하거나 만료된 경우 401 에러
     """
-    return auth_service.login_student(request)
\ No newline at end of file
+    return await auth_service.login_student(request)
\ No newline at end of file
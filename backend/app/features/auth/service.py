@@ -5,7 +5,7 @@ Business logic for authentication operations
 from fastapi import HTTPException
 from datetime import datetime
 
-from app.core.services.database_service import DatabaseService
+from app.core.services.async_database_service import AsyncDatabaseService
 from app.core.utils.security import hash_password
 from app.core.models.schemas import (
     TeacherSignupRequest, 
@@ -22,10 +22,10 @@ class AuthService:
     선생님과 학생의 회원가입 및 로그인 기능을 담당
     """
     
-    def __init__(self):
-        self.db_service = DatabaseService()
+    def __init__(self, db_service: AsyncDatabaseService):
+        self.db_service = db_service
 
-    def signup_teacher(self, request: TeacherSignupRequest) -> TeacherResponse:
+    async def signup_teacher(self, request: TeacherSignupRequest) -> TeacherResponse:
         """
         선생님 회원가입 처리
         이메일 중복 확인 후 계정 생성
@@ -40,7 +40,7 @@ class AuthService:
             HTTPException: 이메일 중복 시 400 에러
         """
         # 이메일 중복 확인
-        existing_teacher = self.db_service.get_teacher_by_email(request.email)
+        existing_teacher = await self.db_service.get_teacher_by_email(request.email)
         if existing_teacher:
             raise HTTPException(status_code=400, detail="Teacher already exists")
         
@@ -51,10 +51,10 @@ class AuthService:
             "password": hash_password(request.password)
         }
         
-        created_teacher = self.db_service.create_teacher(teacher_data)
+        created_teacher = await self.db_service.create_teacher(teacher_data)
         return TeacherResponse(**created_teacher)
 
-    def login_teacher(self, request: TeacherLoginRequest) -> LoginResponse:
+    async def login_teacher(self, request: TeacherLoginRequest) -> LoginResponse:
         """
         선생님 로그인 처리
         이메일과 비밀번호 검증
@@ -69,7 +69,7 @@ class AuthService:
             HTTPException: 인증 실패 시 401 에러
         """
         # 이메일로 선생님 정보 조회
-        teacher = self.db_service.get_teacher_by_email(request.email)
+        teacher = await self.db_service.get_teacher_by_email(request.email)
         if not teacher:
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
@@ -86,7 +86,7 @@ class AuthService:
             user_type="teacher"
         )
 
-    def login_student(self, request: StudentLoginRequest) -> LoginResponse:
+    async def login_student(self, request: StudentLoginRequest) -> LoginResponse:
         """
         학생 로그인 처리
         클래스 코드 검증 후 세션 참여 또는 기존 학생 정보 반환
@@ -101,7 +101,7 @@ class AuthService:
             HTTPException: 클래스 코드 무효하거나 만료된 경우 401 에러
         """
         # 클래스 코드로 세션 조회
-        session = self.db_service.get_session_by_class_code(request.class_code)
+        session = await self.db_service.get_session_by_class_code(request.class_code)
         if not session:
             raise HTTPException(status_code=401, detail="Invalid class code")
         
@@ -112,7 +112,7 @@ class AuthService:
                 raise HTTPException(status_code=401, detail="Class code has expired")
         
         # 기존 학생 정보 확인
-        existing_student = self.db_service.get_student_by_name_and_code(
+        existing_student = await self.db_service.get_student_by_name_and_code(
             request.name, 
             request.class_code
         )
@@ -127,7 +127,7 @@ class AuthService:
                 "class_code": request.class_code,
                 "session_id": session["id"]
             }
-            student_response = self.db_service.create_student(student_data)
+            student_response = await self.db_service.create_student(student_data)
         
         return LoginResponse(
             user=student_response,
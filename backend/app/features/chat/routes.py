@@ -3,20 +3,27 @@ Chat routes
 API endpoints for chat operations
 """
 import json
-import time
+from contextlib import aclosing
 from datetime import datetime
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import StreamingResponse
 
 from .service import ChatService
+from app.core.services.openai_service import get_openai_service
+from app.core.services.message_persister import get_message_persister
+from app.core.utils.disconnect import stream_until_disconnect
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
 from .models import ChatRequest, ChatResponse, ChatHistoryResponse, ChatHealthResponse
 
 router = APIRouter(prefix="/chat", tags=["chat"])
-chat_service = ChatService()
+
+def get_chat_service(db_service: AsyncDatabaseService = Depends(get_database_service)) -> ChatService:
+    """채팅 서비스 의존성 (공유 데이터베이스/OpenAI 서비스 주입)"""
+    return ChatService(db_service, get_openai_service())
 
 
 @router.post("/ai", response_model=ChatResponse)
-async def chat_with_ai(request: ChatRequest):
+async def chat_with_ai(request: ChatRequest, chat_service: ChatService = Depends(get_chat_service)):
     """
     AI와 스레드 기반 1:1 채팅
     사용자별로 대화 기록이 유지됨
@@ -26,7 +33,7 @@ async def chat_with_ai(request: ChatRequest):
 
 
 @router.post("/ai/stream")
-async def chat_with_ai_stream(request: Request):
+async def chat_with_ai_stream(request: Request, chat_service: ChatService = Depends(get_chat_service)):
     """
     AI와 스트리밍 방식 1:1 채팅 (파일 첨부 지원)
     사용자별로 대화 기록이 유지되며, 응답을 실시간으로 스트리밍
@@ -39,44 +46,27 @@ async def chat_with_ai_stream(request: Request):
             
             collected_response = ""
             
-            # 파일 첨부가 있는 경우 업로드 파일 객체 변환
-            upload_files = []
-            if chat_data["files"]:
-                for file in chat_data["files"]:
-                    if file.filename:
-                        # 파일 포인터를 처음으로 리셋
-                        file.file.seek(0)
-                        upload_files.append(file)
-            
-            # 스트리밍 응답 생성 - 파일 첨부 여부에 따라 다른 함수 사용
-            if upload_files:
-                # 파일 첨부가 있는 경우 새로운 generate_response_with_files 사용
-                # 하지만 스트리밍은 지원하지 않으므로 일반 응답 생성 후 청크로 나누어 전송
-                full_response = chat_service.openai_service.generate_response_with_files(
+            # 업스트림 응답을 받는 대로 스트리밍 (첨부 파일은 이미 openai_messages에 포함됨)
+            # 클라이언트가 떠나면 OpenAI 스트림도 종료
+            deltas = stream_until_disconnect(
+                request,
+                chat_service.openai_service.generate_response_stream_async(
                     chat_data["openai_messages"], 
-                    upload_files, 
                     chat_data["user_context"]
                 )
-                
-                # 응답을 청크로 나누어 스트리밍 효과 생성
-                words = full_response.split()
-                for i, word in enumerate(words):
-                    chunk = word + (" " if i < len(words) - 1 else "")
+            )
+            async with aclosing(deltas):
+                async for chunk in deltas:
                     collected_response += chunk
+                    # Server-Sent Events 형식으로 청크 전송
                     yield f"data: {json.dumps({'type': 'chunk', 'content': chunk})}\n\n"
-                    time.sleep(0.05)  # 스트리밍 효과를 위한 딜레이
-            else:
-                # 파일 첨부가 없는 경우 기존 스트리밍 방식 사용
-                for chunk in chat_service.openai_service.generate_response_stream(
-                    chat_data["openai_messages"], 
-                    chat_data["user_context"]
-                ):
-                    if chunk and chunk.strip():
-                        collected_response += chunk
-                        # Server-Sent Events 형식으로 청크 전송
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk})}\n\n"
             
-            # 최종 응답을 데이터베이스에 저장
+            # 응답 도중 연결이 끊긴 경우 저장하지 않고 종료
+            if await request.is_disconnected():
+                print("⚠️ 클라이언트 연결 종료, 스트리밍 중단")
+                return
+            
+            # 최종 응답 저장 예약 (응답을 막지 않도록 백그라운드에서 일괄 저장)
             if chat_data["thread_id"] and chat_data["thread_id"] > 0:
                 try:
                     # 사용자 메시지 저장 (파일 첨부 정보 포함)
@@ -95,7 +85,7 @@ async def chat_with_ai_stream(request: Request):
                         "created_at": datetime.now().isoformat()
                     }
                     
-                    chat_service.db_service.create_thread_message(user_message_data)
+                    await get_message_persister().enqueue(user_message_data)
                     
                     # AI 응답 저장
                     ai_message_data = {
@@ -108,8 +98,8 @@ async def chat_with_ai_stream(request: Request):
                         "created_at": datetime.now().isoformat()
                     }
                     
-                    chat_service.db_service.create_thread_message(ai_message_data)
-                    print(f"✅ 메시지 저장 성공")
+                    await get_message_persister().enqueue(ai_message_data)
+                    print(f"✅ 메시지 저장 예약")
                     
                 except Exception as e:
                     print(f"⚠️ 메시지 저장 실패: {str(e)}")
@@ -135,7 +125,7 @@ async def chat_with_ai_stream(request: Request):
 
 
 @router.get("/history/{user_id}/{session_id}", response_model=ChatHistoryResponse)
-async def get_chat_history(user_id: int, session_id: int):
+async def get_chat_history(user_id: int, session_id: int, chat_service: ChatService = Depends(get_chat_service)):
     """
     사용자별 채팅 기록 조회
     """
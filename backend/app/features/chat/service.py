@@ -4,11 +4,13 @@ Business logic for chat operations with OpenAI integration
 """
 import base64
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from fastapi import HTTPException, Request, UploadFile
 
 from app.core.services.openai_service import OpenAIService
-from app.core.services.database_service import DatabaseService
+from app.core.services.async_database_service import AsyncDatabaseService
+from app.core.services.message_persister import get_message_persister, as_response_message
+from app.core.services.chat_context import build_chat_context, load_context_messages
 from .models import ChatRequest, ChatResponse, ChatHistoryResponse
 
 
@@ -18,9 +20,9 @@ class ChatService:
     OpenAI API와 데이터베이스 연동을 담당
     """
     
-    def __init__(self):
-        self.openai_service = OpenAIService()
-        self.db_service = DatabaseService()
+    def __init__(self, db_service: AsyncDatabaseService, openai_service: Optional[OpenAIService] = None):
+        self.openai_service = openai_service or OpenAIService()
+        self.db_service = db_service
 
     async def chat_with_ai(self, request: ChatRequest) -> ChatResponse:
         """
@@ -33,43 +35,39 @@ class ChatService:
         
         # 1. 데이터베이스 스레드 조회 시도 (실패해도 계속 진행)
         try:
-            thread = self.db_service.get_or_create_chat_thread(request.user_id, request.session_id)
+            thread = await self.db_service.get_or_create_chat_thread(request.user_id, request.session_id)
             thread_id = thread["id"]
             
-            # 기존 대화 기록 조회 시도
-            previous_messages = self.db_service.get_thread_messages(thread_id, limit=20)
+            # 요약되지 않은 최근 대화 기록 조회 시도
+            previous_messages = await load_context_messages(self.db_service, thread)
             print(f"✅ DB 연결 성공: Thread {thread_id}, 메시지 {len(previous_messages)}개")
             
         except Exception as e:
             print(f"⚠️ DB 연결 실패, 대화 기록 없이 진행: {str(e)}")
+            thread = None
             thread_id = 0  # 임시 thread_id
             previous_messages = []
         
-        # 2. OpenAI API 형식으로 변환
-        openai_messages = []
-        for msg in previous_messages:
-            role = "assistant" if msg["is_ai_response"] else "user"
-            openai_messages.append({
-                "role": role,
-                "content": msg["message"]
-            })
-        
-        # 현재 메시지 추가
-        openai_messages.append({
+        # 2. 현재 메시지 구성
+        current_message = {
             "role": "user",
             "content": request.message
-        })
+        }
         
         # 3. 사용자 컨텍스트 구성
         user_context = {
             "user_type": request.user_type,
             "user_name": request.user_name,
-            "user_id": request.user_id
+            "user_id": request.user_id,
+            "session_id": request.session_id
         }
         
         # 4. OpenAI 서비스 인스턴스 생성 및 AI 응답 생성
         try:
-            ai_response = self.openai_service.generate_response(openai_messages, user_context)
+            openai_messages = build_chat_context(
+                self.openai_service, self.db_service, thread, previous_messages, current_message, user_context
+            )
+            ai_response = await self.openai_service.generate_response_async(openai_messages, user_context)
         except Exception as e:
             print(f"❌ OpenAI API 오류: {str(e)}")
             raise HTTPException(
@@ -77,7 +75,7 @@ class ChatService:
                 detail=f"AI 응답 생성 실패: {str(e)}"
             )
         
-        # 5. 데이터베이스 저장 시도 (실패해도 응답은 반환)
+        # 5. 데이터베이스 저장 예약 (백그라운드에서 일괄 저장, 실패해도 응답은 반환)
         saved_user_message = None
         saved_ai_message = None
         
@@ -94,7 +92,7 @@ class ChatService:
                     "created_at": datetime.now().isoformat()
                 }
                 
-                saved_user_message = self.db_service.create_thread_message(user_message_data)
+                saved_user_message = as_response_message(await get_message_persister().enqueue(user_message_data))
                 
                 # AI 응답 저장
                 ai_message_data = {
@@ -107,8 +105,8 @@ class ChatService:
                     "created_at": datetime.now().isoformat()
                 }
                 
-                saved_ai_message = self.db_service.create_thread_message(ai_message_data)
-                print(f"✅ 메시지 저장 성공")
+                saved_ai_message = as_response_message(await get_message_persister().enqueue(ai_message_data))
+                print(f"✅ 메시지 저장 예약")
                 
             except Exception as e:
                 print(f"⚠️ 메시지 저장 실패, 응답은 반환: {str(e)}")
@@ -150,11 +148,11 @@ class ChatService:
         """
         try:
             # 사용자의 채팅 스레드 조회
-            thread = self.db_service.get_or_create_chat_thread(user_id, session_id)
+            thread = await self.db_service.get_or_create_chat_thread(user_id, session_id)
             thread_id = thread["id"]
             
             # 스레드의 모든 메시지 조회
-            messages = self.db_service.get_thread_messages(thread_id, limit=100)
+            messages = await self.db_service.get_thread_messages(thread_id, limit=100)
             
             return ChatHistoryResponse(
                 thread_id=thread_id,
@@ -200,28 +198,20 @@ class ChatService:
 
         # 2. 데이터베이스 스레드 조회 시도 (실패해도 계속 진행)
         try:
-            thread = self.db_service.get_or_create_chat_thread(user_id, session_id)
+            thread = await self.db_service.get_or_create_chat_thread(user_id, session_id)
             thread_id = thread["id"]
             
-            # 기존 대화 기록 조회 시도
-            previous_messages = self.db_service.get_thread_messages(thread_id, limit=20)
+            # 요약되지 않은 최근 대화 기록 조회 시도
+            previous_messages = await load_context_messages(self.db_service, thread)
             print(f"✅ DB 연결 성공: Thread {thread_id}, 메시지 {len(previous_messages)}개")
             
         except Exception as e:
             print(f"⚠️ DB 연결 실패, 대화 기록 없이 진행: {str(e)}")
+            thread = None
             thread_id = 0  # 임시 thread_id
             previous_messages = []
         
-        # 3. OpenAI API 형식으로 변환
-        openai_messages = []
-        for msg in previous_messages:
-            role = "assistant" if msg["is_ai_response"] else "user"
-            openai_messages.append({
-                "role": role,
-                "content": msg["message"]
-            })
-        
-        # 현재 메시지 구성 (파일 첨부 포함)
+        # 3. 현재 메시지 구성 (파일 첨부 포함)
         current_message_content = []
         
         # 텍스트 메시지 추가
@@ -259,24 +249,30 @@ class ChatService:
         # OpenAI API 호출 방식 결정
         if len(current_message_content) == 1 and current_message_content[0]["type"] == "text":
             # 단순 텍스트 메시지인 경우
-            openai_messages.append({
+            current_message = {
                 "role": "user",
                 "content": current_message_content[0]["text"]
-            })
+            }
         else:
             # 멀티모달 메시지인 경우 (파일 첨부 포함)
-            openai_messages.append({
+            current_message = {
                 "role": "user",
                 "content": current_message_content
-            })
+            }
         
         # 4. 사용자 컨텍스트 구성
         user_context = {
             "user_type": user_type,
             "user_name": user_name,
-            "user_id": user_id
+            "user_id": user_id,
+            "session_id": session_id
         }
         
+        # 5. 토큰 예산에 맞춰 대화 컨텍스트 구성 (오래된 대화는 요약으로 대체)
+        openai_messages = build_chat_context(
+            self.openai_service, self.db_service, thread, previous_messages, current_message, user_context
+        )
+        
         return {
             "openai_messages": openai_messages,
             "user_context": user_context,
@@ -23,7 +23,7 @@ class GalleryItemResponse(BaseModel):
     user_id: int
     user_name: str
     user_type: str
-    image_url: str
+    image_url: Optional[str] = None  # 목록 조회에서는 include_image=true일 때만 포함
     prompt: str
     title: Optional[str] = None
     created_at: str
@@ -33,6 +33,8 @@ class GallerySessionResponse(BaseModel):
     """세션 갤러리 응답"""
     success: bool
     items: List[GalleryItemResponse]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
     session_id: int
 
 
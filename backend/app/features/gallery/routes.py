@@ -2,11 +2,16 @@
 Gallery routes
 API endpoints for gallery operations
 """
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException
+from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from typing import Optional
 
 from .service import GalleryService
+from app.core.config.settings import GALLERY_PAGE_SIZE, GALLERY_MAX_PAGE_SIZE
+from app.core.utils.pagination import decode_cursor
+from app.core.utils.http_cache import cached_stream_response
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
+from app.core.services.image_store import ImageStore, get_image_store
 from .models import (
     GalleryUploadResponse,
     GallerySessionResponse,
@@ -15,7 +20,14 @@ from .models import (
 )
 
 router = APIRouter(prefix="/gallery", tags=["gallery"])
-gallery_service = GalleryService()
+
+
+def get_gallery_service(
+    db_service: AsyncDatabaseService = Depends(get_database_service),
+    image_store: ImageStore = Depends(get_image_store)
+) -> GalleryService:
+    """갤러리 서비스 의존성 (공유 데이터베이스 서비스와 이미지 저장소 주입)"""
+    return GalleryService(db_service, image_store)
 
 
 @router.post("/upload", response_model=GalleryUploadResponse)
@@ -26,7 +38,8 @@ async def upload_gallery_item(
     user_name: str = Form(...),
     user_type: str = Form(...),
     prompt: str = Form(...),
-    title: Optional[str] = Form(None)
+    title: Optional[str] = Form(None),
+    gallery_service: GalleryService = Depends(get_gallery_service)
 ):
     """
     Upload a new gallery item with image and prompt
@@ -44,12 +57,12 @@ async def upload_gallery_item(
         image_data = await image.read()
         
         # Validate image
-        validation = gallery_service.validate_image_file(image_data)
+        validation = await gallery_service.validate_image_file(image_data)
         if not validation["valid"]:
             raise HTTPException(status_code=400, detail=validation["error"])
         
         # Create gallery item
-        result = gallery_service.create_gallery_item(
+        result = await gallery_service.create_gallery_item(
             session_id=session_id,
             user_id=user_id,
             user_name=user_name,
@@ -79,20 +92,37 @@ async def upload_gallery_item(
 async def get_session_gallery(
     session_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(GALLERY_PAGE_SIZE, ge=1, le=GALLERY_MAX_PAGE_SIZE),
+    include_image: bool = False,
+    gallery_service: GalleryService = Depends(get_gallery_service)
 ):
     """
-    Get all gallery items for a specific session
+    Get one page of gallery items for a specific session (newest first)
+    
+    Pass the returned next_cursor as cursor to fetch the next page.
+    image_url is omitted unless include_image=true.
     """
     try:
         # Validate user_type
         if user_type not in ["student", "teacher"]:
             raise HTTPException(status_code=400, detail="Invalid user type")
         
-        result = gallery_service.get_session_gallery_items(
+        # Validate cursor
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        
+        result = await gallery_service.get_session_gallery_items(
             session_id=session_id,
             user_id=user_id,
-            user_type=user_type
+            user_type=user_type,
+            cursor=cursor,
+            limit=limit,
+            include_image=include_image
         )
         
         if result["success"]:
@@ -101,6 +131,8 @@ async def get_session_gallery(
                 content={
                     "success": True,
                     "items": result["items"],
+                    "next_cursor": result["next_cursor"],
+                    "has_more": result["has_more"],
                     "session_id": session_id
                 }
             )
@@ -117,7 +149,8 @@ async def get_session_gallery(
 async def delete_gallery_item(
     item_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    gallery_service: GalleryService = Depends(get_gallery_service)
 ):
     """
     Delete a gallery item (only by creator or session teacher)
@@ -127,7 +160,7 @@ async def delete_gallery_item(
         if user_type not in ["student", "teacher"]:
             raise HTTPException(status_code=400, detail="Invalid user type")
         
-        result = gallery_service.delete_gallery_item(
+        result = await gallery_service.delete_gallery_item(
             item_id=item_id,
             user_id=user_id,
             user_type=user_type
@@ -154,7 +187,8 @@ async def delete_gallery_item(
 async def get_gallery_item(
     item_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    gallery_service: GalleryService = Depends(get_gallery_service)
 ):
     """
     Get a specific gallery item (with session access validation)
@@ -164,7 +198,7 @@ async def get_gallery_item(
         if user_type not in ["student", "teacher"]:
             raise HTTPException(status_code=400, detail="Invalid user type")
         
-        result = gallery_service.get_gallery_item(
+        result = await gallery_service.get_gallery_item(
             item_id=item_id,
             user_id=user_id,
             user_type=user_type
@@ -191,7 +225,8 @@ async def get_gallery_item(
 async def get_session_gallery_stats(
     session_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    gallery_service: GalleryService = Depends(get_gallery_service)
 ):
     """
     Get statistics for a session's gallery
@@ -201,7 +236,7 @@ async def get_session_gallery_stats(
         if user_type not in ["student", "teacher"]:
             raise HTTPException(status_code=400, detail="Invalid user type")
         
-        result = gallery_service.get_session_gallery_stats(
+        result = await gallery_service.get_session_gallery_stats(
             session_id=session_id,
             user_id=user_id,
             user_type=user_type
@@ -221,4 +256,47 @@ async def get_session_gallery_stats(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+
+@router.get("/image/{item_id}")
+@router.get("/image/{item_id}/{size}")
+async def get_gallery_image(
+    item_id: int,
+    request: Request,
+    user_id: int,
+    user_type: str,
+    size: str = "original",
+    gallery_service: GalleryService = Depends(get_gallery_service)
+):
+    """
+    Stream a gallery image with a strong ETag, immutable caching,
+    If-None-Match (304) and single Range (206) support
+    
+    size is "original" or a rendition (256, 640, 1920 px long edge);
+    renditions are served as WebP/AVIF when accepted, else JPEG.
+    Requires the same session access as /item/{item_id}.
+    """
+    if user_type not in ["student", "teacher"]:
+        raise HTTPException(status_code=400, detail="Invalid user type")
+    
+    result = await gallery_service.get_gallery_image(
+        item_id=item_id,
+        user_id=user_id,
+        user_type=user_type,
+        size=size,
+        accept=request.headers.get("accept")
+    )
+    
+    if not result["success"]:
+        status_code = result.get("status_code") or (500 if result["error"].startswith("Server error") else 404)
+        raise HTTPException(status_code=status_code, detail=result["error"])
+    
+    return cached_stream_response(
+        request.headers,
+        etag=result["etag"],
+        content_type=result["content_type"],
+        size=result["size"],
+        open_range=result["open_range"],
+        vary=result.get("vary")
+    )
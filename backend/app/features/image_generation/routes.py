@@ -4,10 +4,11 @@ API endpoints for image generation operations
 """
 import io
 from datetime import datetime
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
 from fastapi.responses import StreamingResponse
 from typing import Optional
 
+from app.core.utils.disconnect import cancel_on_disconnect
 from .service import ImageGenerationService
 from .models import (
     CoreImageRequest, SD35ImageRequest, UltraImageRequest, SketchRequest,
@@ -74,6 +75,7 @@ async def validate_image(
 
 @router.post("/generate/core")
 async def generate_core_image(
+    http_request: Request,
     # 폼 데이터로 받기
     prompt: str = Form(..., description="이미지 생성 프롬프트"),
     aspect_ratio: str = Form("1:1", description="이미지 비율"),
@@ -101,7 +103,7 @@ async def generate_core_image(
         request_data["seed"] = seed
     
     # 이미지 생성
-    image_data = await service.generate_core_image_data(request_data)
+    image_data = await cancel_on_disconnect(http_request, service.generate_core_image_data(request_data))
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -117,6 +119,7 @@ async def generate_core_image(
 
 @router.post("/generate/sd35")
 async def generate_sd35_image(
+    http_request: Request,
     # 폼 데이터로 받기
     prompt: str = Form(..., description="이미지 생성 프롬프트"),
     mode: str = Form("text-to-image", description="생성 모드"),
@@ -156,7 +159,7 @@ async def generate_sd35_image(
         request_data["cfg_scale"] = cfg_scale
     
     # 이미지 생성
-    image_data = await service.generate_sd35_image(request_data, image)
+    image_data = await cancel_on_disconnect(http_request, service.generate_sd35_image(request_data, image))
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -173,6 +176,7 @@ async def generate_sd35_image(
 
 @router.post("/generate/ultra")
 async def generate_ultra_image(
+    http_request: Request,
     prompt: str = Form(..., description="이미지 생성 프롬프트"),
     aspect_ratio: str = Form("1:1", description="이미지 비율"),
     strength: Optional[float] = Form(None, description="참조 이미지 영향도"),
@@ -203,7 +207,7 @@ async def generate_ultra_image(
         request_data["seed"] = seed
     
     # 이미지 생성
-    image_data = await service.generate_ultra_image(request_data, image)
+    image_data = await cancel_on_disconnect(http_request, service.generate_ultra_image(request_data, image))
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -219,6 +223,7 @@ async def generate_ultra_image(
 
 @router.post("/control/sketch")
 async def sketch_to_image(
+    http_request: Request,
     prompt: str = Form(..., description="이미지 생성 프롬프트"),
     control_strength: float = Form(0.7, description="제어 강도"),
     output_format: str = Form("png", description="출력 형식"),
@@ -246,7 +251,7 @@ async def sketch_to_image(
         request_data["seed"] = seed
     
     # 이미지 생성
-    image_data = await service.sketch_to_image(request_data, image)
+    image_data = await cancel_on_disconnect(http_request, service.sketch_to_image(request_data, image))
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -264,6 +269,7 @@ async def sketch_to_image(
 
 @router.post("/generate/educational")
 async def generate_educational_image(
+    http_request: Request,
     prompt: str = Form(..., description="교육용 이미지 생성 프롬프트"),
     subject: str = Form(..., description="교육 주제"),
     grade_level: Optional[str] = Form(None, description="학년 수준"),
@@ -285,13 +291,14 @@ async def generate_educational_image(
     )
     
     # 교육용 이미지 생성
-    result = await service.generate_educational_image(request)
+    result = await cancel_on_disconnect(http_request, service.generate_educational_image(request))
     
     return result
 
 
 @router.post("/generate/quick")
 async def generate_quick_image(
+    http_request: Request,
     prompt: str = Form(..., description="간단한 프롬프트"),
     style: str = Form("illustration", description="스타일"),
     service: ImageGenerationService = Depends(get_image_service)
@@ -305,6 +312,6 @@ async def generate_quick_image(
     )
     
     # 빠른 이미지 생성
-    result = await service.generate_quick_image(request)
+    result = await cancel_on_disconnect(http_request, service.generate_quick_image(request))
     
     return result
\ No newline at end of file
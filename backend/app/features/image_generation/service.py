@@ -7,7 +7,6 @@ import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
 from fastapi import UploadFile, HTTPException
-import io
 
 from app.core.services.stability_service import StabilityService, StabilityServiceError
 from app.core.models.image_schemas import get_credits_required
@@ -72,7 +71,7 @@ class ImageGenerationService:
             await file.seek(0)
             
             # Stability 서비스를 통한 상세 검증
-            validation_result = self.stability_service.validate_image_file(io.BytesIO(file_content))
+            validation_result = await self.stability_service.validate_image_file_async(file_content)
             
             return FileValidationResponse(
                 valid=validation_result["valid"],
@@ -109,7 +108,7 @@ class ImageGenerationService:
             logger.info(f"Core 이미지 생성 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            image_data = self.stability_service.generate_core_image(
+            image_data = await self.stability_service.generate_core_image(
                 prompt=request.prompt,
                 aspect_ratio=request.aspect_ratio,
                 output_format=request.output_format,
@@ -126,7 +125,8 @@ class ImageGenerationService:
             logger.error(f"Core 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"Core 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -151,7 +151,7 @@ class ImageGenerationService:
             logger.info(f"Core 이미지 생성 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            image_data = self.stability_service.generate_core_image(
+            image_data = await self.stability_service.generate_core_image(
                 prompt=request.prompt,
                 aspect_ratio=request.aspect_ratio,
                 output_format=request.output_format,
@@ -167,7 +167,7 @@ class ImageGenerationService:
             filename = f"core_image_{timestamp}.{request.output_format}"
             
             # 이미지 정보 조회
-            image_info = self.stability_service.get_image_info(image_data)
+            image_info = await self.stability_service.get_image_info_async(image_data)
             
             logger.info(f"Core 이미지 생성 완료: {filename}, 시간: {generation_time:.2f}s")
             
@@ -185,7 +185,8 @@ class ImageGenerationService:
             logger.error(f"Core 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"Core 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -219,7 +220,7 @@ class ImageGenerationService:
             logger.info(f"SD3.5 이미지 생성 시작: {request.mode} - {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            generated_image = self.stability_service.generate_sd35_image(
+            generated_image = await self.stability_service.generate_sd35_image(
                 prompt=request.prompt,
                 mode=request.mode,
                 model=request.model,
@@ -241,7 +242,8 @@ class ImageGenerationService:
             logger.error(f"SD3.5 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"SD3.5 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -275,7 +277,7 @@ class ImageGenerationService:
             logger.info(f"Ultra 이미지 생성 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            generated_image = self.stability_service.generate_ultra_image(
+            generated_image = await self.stability_service.generate_ultra_image(
                 prompt=request.prompt,
                 aspect_ratio=request.aspect_ratio,
                 output_format=request.output_format,
@@ -294,7 +296,8 @@ class ImageGenerationService:
             logger.error(f"Ultra 이미지 생성 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"Ultra 이미지 생성 중 예상치 못한 오류: {str(e)}")
@@ -326,7 +329,7 @@ class ImageGenerationService:
             logger.info(f"스케치→이미지 변환 시작: {request.prompt[:50]}...")
             
             # Stability AI API 호출
-            generated_image = self.stability_service.sketch_to_image(
+            generated_image = await self.stability_service.sketch_to_image(
                 prompt=request.prompt,
                 image=image_data,
                 control_strength=request.control_strength,
@@ -344,7 +347,8 @@ class ImageGenerationService:
             logger.error(f"스케치→이미지 변환 오류: {str(e)}")
             raise HTTPException(
                 status_code=e.status_code or 500,
-                detail=str(e)
+                detail=str(e),
+                headers=e.headers
             )
         except Exception as e:
             logger.error(f"스케치→이미지 변환 중 예상치 못한 오류: {str(e)}")
@@ -2,16 +2,21 @@
 Student routes
 API endpoints for student operations
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from .service import StudentService
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
 
 router = APIRouter(prefix="/student", tags=["student"])
-student_service = StudentService()
+
+
+def get_student_service(db_service: AsyncDatabaseService = Depends(get_database_service)) -> StudentService:
+    """학생 서비스 의존성 (공유 데이터베이스 서비스 주입)"""
+    return StudentService(db_service)
 
 
 @router.get("/session/{session_id}/students")
-async def get_session_students(session_id: int):
+async def get_session_students(session_id: int, student_service: StudentService = Depends(get_student_service)):
     """
     세션에 참여한 학생 목록 조회 API
     특정 클래스 세션에 참여한 모든 학생 정보를 조회
@@ -25,11 +30,11 @@ async def get_session_students(session_id: int):
     Raises:
         HTTPException: 데이터베이스 오류 시 500 에러
     """
-    return student_service.get_session_students(session_id)
+    return await student_service.get_session_students(session_id)
 
 
 @router.get("/{student_id}")
-async def get_student_by_id(student_id: int):
+async def get_student_by_id(student_id: int, student_service: StudentService = Depends(get_student_service)):
     """
     학생 ID로 학생 정보 조회 API
     
@@ -42,4 +47,4 @@ async def get_student_by_id(student_id: int):
     Raises:
         HTTPException: 데이터베이스 오류 시 500 에러
     """
-    return student_service.get_student_by_id(student_id)
\ No newline at end of file
+    return await student_service.get_student_by_id(student_id)
\ No newline at end of file
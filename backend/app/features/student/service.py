@@ -2,7 +2,7 @@
 Student service
 Business logic for student operations
 """
-from app.core.services.database_service import DatabaseService
+from app.core.services.async_database_service import AsyncDatabaseService
 from app.core.models.schemas import StudentResponse
 
 
@@ -12,10 +12,10 @@ class StudentService:
     세션 관리 및 학생 정보 조회 기능을 담당
     """
     
-    def __init__(self):
-        self.db_service = DatabaseService()
+    def __init__(self, db_service: AsyncDatabaseService):
+        self.db_service = db_service
 
-    def get_session_students(self, session_id: int) -> list:
+    async def get_session_students(self, session_id: int) -> list:
         """
         세션에 참여한 학생 목록 조회
         
@@ -25,9 +25,9 @@ class StudentService:
         Returns:
             학생 목록
         """
-        return self.db_service.get_session_students(session_id)
+        return await self.db_service.get_session_students(session_id)
 
-    def get_student_by_id(self, student_id: int) -> dict:
+    async def get_student_by_id(self, student_id: int) -> dict:
         """
         학생 ID로 학생 정보 조회
         
@@ -37,4 +37,4 @@ class StudentService:
         Returns:
             학생 정보
         """
-        return self.db_service.get_student_by_id(student_id)
\ No newline at end of file
+        return await self.db_service.get_student_by_id(student_id)
\ No newline at end of file
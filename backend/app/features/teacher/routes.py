@@ -2,20 +2,25 @@
 선생님 관련 API 라우터
 HTTP 요청을 받아 적절한 Service로 전달하고 응답을 반환
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.core.models.schemas import (
     CreateClassRequest,
     CreateClassResponse
 )
 from .service import TeacherService
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
 
 router = APIRouter(prefix="/teacher", tags=["teacher"])
-teacher_service = TeacherService()
+
+
+def get_teacher_service(db_service: AsyncDatabaseService = Depends(get_database_service)) -> TeacherService:
+    """선생님 서비스 의존성 (공유 데이터베이스 서비스 주입)"""
+    return TeacherService(db_service)
 
 
 @router.post("/create-class", response_model=CreateClassResponse)
-async def create_class_session(request: CreateClassRequest):
+async def create_class_session(request: CreateClassRequest, teacher_service: TeacherService = Depends(get_teacher_service)):
     """
     클래스 세션 생성 API
     선생님이 새로운 클래스를 생성하고 학생들이 참여할 수 있는 코드를 발급
@@ -29,11 +34,11 @@ async def create_class_session(request: CreateClassRequest):
     Raises:
         HTTPException: 세션 생성 실패 시 500 에러
     """
-    return teacher_service.create_class_session(request)
+    return await teacher_service.create_class_session(request)
 
 
 @router.get("/{teacher_id}/sessions")
-async def get_teacher_sessions(teacher_id: int):
+async def get_teacher_sessions(teacher_id: int, teacher_service: TeacherService = Depends(get_teacher_service)):
     """
     선생님의 클래스 세션 목록 조회 API
     특정 선생님이 생성한 모든 클래스 세션을 조회
@@ -47,11 +52,11 @@ async def get_teacher_sessions(teacher_id: int):
     Raises:
         HTTPException: 데이터베이스 오류 시 500 에러
     """
-    return teacher_service.get_teacher_sessions(teacher_id)
+    return await teacher_service.get_teacher_sessions(teacher_id)
 
 
 @router.delete("/session/{session_id}")
-async def delete_session(session_id: int):
+async def delete_session(session_id: int, teacher_service: TeacherService = Depends(get_teacher_service)):
     """
     클래스 세션 삭제 API
     선생님이 생성한 클래스 세션을 삭제 (관련된 모든 데이터 포함)
@@ -65,4 +70,4 @@ async def delete_session(session_id: int):
     Raises:
         HTTPException: 세션을 찾을 수 없거나 삭제 실패 시 에러
     """
-    return teacher_service.delete_session(session_id)
\ No newline at end of file
+    return await teacher_service.delete_session(session_id)
\ No newline at end of file
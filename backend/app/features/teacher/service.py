@@ -10,7 +10,7 @@ from app.core.models.schemas import (
     CreateClassResponse,
     ClassSessionResponse
 )
-from app.core.services.database_service import DatabaseService
+from app.core.services.async_database_service import AsyncDatabaseService
 from app.core.utils.security import generate_class_code
 from app.core.config.settings import SESSION_EXPIRE_HOURS
 
@@ -21,10 +21,10 @@ class TeacherService:
     클래스 세션 생성 및 관리 기능을 담당
     """
     
-    def __init__(self):
-        self.db_service = DatabaseService()
+    def __init__(self, db_service: AsyncDatabaseService):
+        self.db_service = db_service
 
-    def create_class_session(self, request: CreateClassRequest) -> CreateClassResponse:
+    async def create_class_session(self, request: CreateClassRequest) -> CreateClassResponse:
         """
         클래스 세션 생성
         중복되지 않는 클래스 코드 생성 및 세션 생성
@@ -39,7 +39,7 @@ class TeacherService:
             HTTPException: 세션 생성 실패 시 500 에러
         """
         # 중복되지 않는 클래스 코드 생성
-        class_code = self._generate_unique_class_code()
+        class_code = await self._generate_unique_class_code()
         
         # 세션 데이터 생성 (24시간 후 만료)
         session_data = {
@@ -49,14 +49,14 @@ class TeacherService:
         }
         
         # 세션 생성
-        created_session = self.db_service.create_class_session(session_data)
+        created_session = await self.db_service.create_class_session(session_data)
         
         return CreateClassResponse(
             class_code=class_code,
             session=ClassSessionResponse(**created_session)
         )
 
-    def get_teacher_sessions(self, teacher_id: int) -> list:
+    async def get_teacher_sessions(self, teacher_id: int) -> list:
         """
         선생님의 클래스 세션 목록 조회
         
@@ -66,9 +66,9 @@ class TeacherService:
         Returns:
             클래스 세션 목록
         """
-        return self.db_service.get_teacher_sessions(teacher_id)
+        return await self.db_service.get_teacher_sessions(teacher_id)
 
-    def delete_session(self, session_id: int) -> dict:
+    async def delete_session(self, session_id: int) -> dict:
         """
         클래스 세션 삭제
         세션과 관련된 모든 데이터 삭제 (학생, 채팅, 이미지 등)
@@ -83,18 +83,18 @@ class TeacherService:
             HTTPException: 세션을 찾을 수 없거나 삭제 실패 시 에러
         """
         # 세션 존재 확인
-        session = self.db_service.get_session_by_id(session_id)
+        session = await self.db_service.get_session_by_id(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
         try:
             # 세션 삭제 (cascade로 관련 데이터도 함께 삭제됨)
-            self.db_service.delete_session(session_id)
+            await self.db_service.delete_session(session_id)
             return {"message": "Session deleted successfully"}
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to delete session: {str(e)}")
 
-    def _generate_unique_class_code(self) -> str:
+    async def _generate_unique_class_code(self) -> str:
         """
         중복되지 않는 클래스 코드 생성
         데이터베이스에서 중복 확인 후 고유한 코드 반환
@@ -104,6 +104,6 @@ class TeacherService:
         """
         while True:
             class_code = generate_class_code()
-            existing_session = self.db_service.get_session_by_class_code(class_code)
+            existing_session = await self.db_service.get_session_by_class_code(class_code)
             if not existing_session:
                 return class_code
\ No newline at end of file
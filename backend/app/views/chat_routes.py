@@ -2,15 +2,19 @@
 채팅 관련 API 라우트
 스레드 기반 1:1 AI 채팅 기능 제공
 """
-from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Request
+from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Request, Depends
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+from contextlib import aclosing
 from datetime import datetime
 import base64
 import os
 
-from app.core.services.openai_service import OpenAIService
-from app.core.services.database_service import DatabaseService
+from app.core.services.openai_service import get_openai_service
+from app.core.services.message_persister import get_message_persister, as_response_message
+from app.core.services.chat_context import build_chat_context, load_context_messages
+from app.core.utils.disconnect import stream_until_disconnect
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
 
 router = APIRouter()
 
@@ -37,7 +41,8 @@ class ChatHistoryResponse(BaseModel):
 
 @router.post("/chat/ai/stream")
 async def chat_with_ai_stream(
-    request: Request
+    request: Request,
+    db_service: AsyncDatabaseService = Depends(get_database_service)
 ):
     """
     AI와 스트리밍 방식 1:1 채팅 (파일 첨부 지원)
@@ -74,7 +79,6 @@ async def chat_with_ai_stream(
         if key.startswith('file_') and hasattr(value, 'filename') and value.filename:
             files.append(value)
     
-    db_service = DatabaseService()
     thread_id = None
     previous_messages = []
     
@@ -121,28 +125,20 @@ async def chat_with_ai_stream(
 
     # 2. 데이터베이스 스레드 조회 시도 (실패해도 계속 진행)
     try:
-        thread = db_service.get_or_create_chat_thread(user_id, session_id)
+        thread = await db_service.get_or_create_chat_thread(user_id, session_id)
         thread_id = thread["id"]
         
-        # 기존 대화 기록 조회 시도
-        previous_messages = db_service.get_thread_messages(thread_id, limit=20)
+        # 요약되지 않은 최근 대화 기록 조회 시도
+        previous_messages = await load_context_messages(db_service, thread)
         print(f"✅ DB 연결 성공: Thread {thread_id}, 메시지 {len(previous_messages)}개")
         
     except Exception as e:
         print(f"⚠️ DB 연결 실패, 대화 기록 없이 진행: {str(e)}")
+        thread = None
         thread_id = 0  # 임시 thread_id
         previous_messages = []
     
-    # 3. OpenAI API 형식으로 변환
-    openai_messages = []
-    for msg in previous_messages:
-        role = "assistant" if msg["is_ai_response"] else "user"
-        openai_messages.append({
-            "role": role,
-            "content": msg["message"]
-        })
-    
-    # 현재 메시지 구성 (파일 첨부 포함)
+    # 3. 현재 메시지 구성 (파일 첨부 포함)
     current_message_content = []
     
     # 텍스트 메시지 추가
@@ -196,62 +192,53 @@ async def chat_with_ai_stream(
     # OpenAI API 호출 방식 결정
     if len(current_message_content) == 1 and current_message_content[0]["type"] == "text":
         # 단순 텍스트 메시지인 경우
-        openai_messages.append({
+        current_message = {
             "role": "user",
             "content": current_message_content[0]["text"]
-        })
+        }
     else:
         # 멀티모달 메시지인 경우 (파일 첨부 포함)
-        openai_messages.append({
+        current_message = {
             "role": "user",
             "content": current_message_content
-        })
+        }
     
     # 4. 사용자 컨텍스트 구성
     user_context = {
         "user_type": user_type,
         "user_name": user_name,
-        "user_id": user_id
+        "user_id": user_id,
+        "session_id": session_id
     }
     
-    # 4. 스트리밍 응답 생성 함수
+    # 5. 스트리밍 응답 생성 함수
     async def generate_streaming_response():
         try:
-            openai_service = OpenAIService()
+            openai_service = get_openai_service()
             collected_response = ""
             
-            # 파일 첨부가 있는 경우 업로드 파일 객체 변환
-            upload_files = []
-            if files:
-                for file in files:
-                    if file.filename:
-                        # 파일 포인터를 처음으로 리셋
-                        file.file.seek(0)
-                        upload_files.append(file)
+            # 토큰 예산에 맞춰 대화 컨텍스트 구성 (오래된 대화는 요약으로 대체)
+            openai_messages = build_chat_context(
+                openai_service, db_service, thread, previous_messages, current_message, user_context
+            )
             
-            # 스트리밍 응답 생성 - 파일 첨부 여부에 따라 다른 함수 사용
-            if upload_files:
-                # 파일 첨부가 있는 경우 새로운 generate_response_with_files 사용
-                # 하지만 스트리밍은 지원하지 않으므로 일반 응답 생성 후 청크로 나누어 전송
-                full_response = openai_service.generate_response_with_files(openai_messages, upload_files, user_context)
-                
-                # 응답을 청크로 나누어 스트리밍 효과 생성
-                import time
-                words = full_response.split()
-                for i, word in enumerate(words):
-                    chunk = word + (" " if i < len(words) - 1 else "")
+            # 업스트림 응답을 받는 대로 스트리밍 (첨부 파일은 이미 openai_messages에 포함됨)
+            # 클라이언트가 떠나면 OpenAI 스트림도 종료
+            deltas = stream_until_disconnect(
+                request, openai_service.generate_response_stream_async(openai_messages, user_context)
+            )
+            async with aclosing(deltas):
+                async for chunk in deltas:
                     collected_response += chunk
+                    # Server-Sent Events 형식으로 청크 전송
                     yield f"data: {json.dumps({'type': 'chunk', 'content': chunk})}\n\n"
-                    time.sleep(0.05)  # 스트리밍 효과를 위한 딜레이
-            else:
-                # 파일 첨부가 없는 경우 기존 스트리밍 방식 사용
-                for chunk in openai_service.generate_response_stream(openai_messages, user_context):
-                    if chunk and chunk.strip():
-                        collected_response += chunk
-                        # Server-Sent Events 형식으로 청크 전송
-                        yield f"data: {json.dumps({'type': 'chunk', 'content': chunk})}\n\n"
             
-            # 최종 응답을 데이터베이스에 저장
+            # 응답 도중 연결이 끊긴 경우 저장하지 않고 종료
+            if await request.is_disconnected():
+                print("⚠️ 클라이언트 연결 종료, 스트리밍 중단")
+                return
+            
+            # 최종 응답 저장 예약 (응답을 막지 않도록 백그라운드에서 일괄 저장)
             if thread_id and thread_id > 0:
                 try:
                     # 사용자 메시지 저장 (파일 첨부 정보 포함)
@@ -270,7 +257,7 @@ async def chat_with_ai_stream(
                         "created_at": datetime.now().isoformat()
                     }
                     
-                    db_service.create_thread_message(user_message_data)
+                    await get_message_persister().enqueue(user_message_data)
                     
                     # AI 응답 저장
                     ai_message_data = {
@@ -283,8 +270,8 @@ async def chat_with_ai_stream(
                         "created_at": datetime.now().isoformat()
                     }
                     
-                    db_service.create_thread_message(ai_message_data)
-                    print(f"✅ 메시지 저장 성공")
+                    await get_message_persister().enqueue(ai_message_data)
+                    print(f"✅ 메시지 저장 예약")
                     
                 except Exception as e:
                     print(f"⚠️ 메시지 저장 실패: {str(e)}")
@@ -309,56 +296,54 @@ async def chat_with_ai_stream(
     )
 
 @router.post("/chat/ai", response_model=ChatResponse)
-async def chat_with_ai(request: ChatRequest):
+async def chat_with_ai(
+    request: ChatRequest,
+    db_service: AsyncDatabaseService = Depends(get_database_service)
+):
     """
     AI와 스레드 기반 1:1 채팅
     사용자별로 대화 기록이 유지됨
     Graceful degradation: DB 오류 시에도 AI 응답 제공
     """
-    db_service = DatabaseService()
     thread_id = None
     previous_messages = []
     
     # 1. 데이터베이스 스레드 조회 시도 (실패해도 계속 진행)
     try:
-        thread = db_service.get_or_create_chat_thread(request.user_id, request.session_id)
+        thread = await db_service.get_or_create_chat_thread(request.user_id, request.session_id)
         thread_id = thread["id"]
         
-        # 기존 대화 기록 조회 시도
-        previous_messages = db_service.get_thread_messages(thread_id, limit=20)
+        # 요약되지 않은 최근 대화 기록 조회 시도
+        previous_messages = await load_context_messages(db_service, thread)
         print(f"✅ DB 연결 성공: Thread {thread_id}, 메시지 {len(previous_messages)}개")
         
     except Exception as e:
         print(f"⚠️ DB 연결 실패, 대화 기록 없이 진행: {str(e)}")
+        thread = None
         thread_id = 0  # 임시 thread_id
         previous_messages = []
     
-    # 2. OpenAI API 형식으로 변환
-    openai_messages = []
-    for msg in previous_messages:
-        role = "assistant" if msg["is_ai_response"] else "user"
-        openai_messages.append({
-            "role": role,
-            "content": msg["message"]
-        })
-    
-    # 현재 메시지 추가
-    openai_messages.append({
+    # 2. 현재 메시지 구성
+    current_message = {
         "role": "user",
         "content": request.message
-    })
+    }
     
     # 3. 사용자 컨텍스트 구성
     user_context = {
         "user_type": request.user_type,
         "user_name": request.user_name,
-        "user_id": request.user_id
+        "user_id": request.user_id,
+        "session_id": request.session_id
     }
     
     # 4. OpenAI 서비스 인스턴스 생성 및 AI 응답 생성
     try:
-        openai_service = OpenAIService()
-        ai_response = openai_service.generate_response(openai_messages, user_context)
+        openai_service = get_openai_service()
+        openai_messages = build_chat_context(
+            openai_service, db_service, thread, previous_messages, current_message, user_context
+        )
+        ai_response = await openai_service.generate_response_async(openai_messages, user_context)
     except Exception as e:
         print(f"❌ OpenAI API 오류: {str(e)}")
         raise HTTPException(
@@ -366,7 +351,7 @@ async def chat_with_ai(request: ChatRequest):
             detail=f"AI 응답 생성 실패: {str(e)}"
         )
     
-    # 5. 데이터베이스 저장 시도 (실패해도 응답은 반환)
+    # 5. 데이터베이스 저장 예약 (백그라운드에서 일괄 저장, 실패해도 응답은 반환)
     saved_user_message = None
     saved_ai_message = None
     
@@ -383,7 +368,7 @@ async def chat_with_ai(request: ChatRequest):
                 "created_at": datetime.now().isoformat()
             }
             
-            saved_user_message = db_service.create_thread_message(user_message_data)
+            saved_user_message = as_response_message(await get_message_persister().enqueue(user_message_data))
             
             # AI 응답 저장
             ai_message_data = {
@@ -396,8 +381,8 @@ async def chat_with_ai(request: ChatRequest):
                 "created_at": datetime.now().isoformat()
             }
             
-            saved_ai_message = db_service.create_thread_message(ai_message_data)
-            print(f"✅ 메시지 저장 성공")
+            saved_ai_message = as_response_message(await get_message_persister().enqueue(ai_message_data))
+            print(f"✅ 메시지 저장 예약")
             
         except Exception as e:
             print(f"⚠️ 메시지 저장 실패, 응답은 반환: {str(e)}")
@@ -434,19 +419,21 @@ async def chat_with_ai(request: ChatRequest):
     )
 
 @router.get("/chat/history/{user_id}/{session_id}", response_model=ChatHistoryResponse)
-async def get_chat_history(user_id: int, session_id: int):
+async def get_chat_history(
+    user_id: int,
+    session_id: int,
+    db_service: AsyncDatabaseService = Depends(get_database_service)
+):
     """
     사용자별 채팅 기록 조회
     """
     try:
-        db_service = DatabaseService()
-        
         # 사용자의 채팅 스레드 조회
-        thread = db_service.get_or_create_chat_thread(user_id, session_id)
+        thread = await db_service.get_or_create_chat_thread(user_id, session_id)
         thread_id = thread["id"]
         
         # 스레드의 모든 메시지 조회
-        messages = db_service.get_thread_messages(thread_id, limit=100)
+        messages = await db_service.get_thread_messages(thread_id, limit=100)
         
         return ChatHistoryResponse(
             thread_id=thread_id,
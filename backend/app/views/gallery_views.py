@@ -1,18 +1,28 @@
 """
 Gallery API Views - FastAPI endpoints for gallery functionality
 """
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends, Query, Request
 from fastapi.responses import JSONResponse
 from typing import Optional
 import json
 
 from app.controllers.gallery_controller import GalleryController
-from app.core.services.database_service import DatabaseService
+from app.core.config.settings import GALLERY_PAGE_SIZE, GALLERY_MAX_PAGE_SIZE
+from app.core.utils.pagination import decode_cursor
+from app.core.utils.http_cache import cached_stream_response
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
+from app.core.services.image_store import ImageStore, get_image_store, public_gallery_item
 
 
 router = APIRouter(prefix="/gallery", tags=["gallery"])
-db_service = DatabaseService()
-gallery_controller = GalleryController(db_service)
+
+
+def get_gallery_controller(
+    db_service: AsyncDatabaseService = Depends(get_database_service),
+    image_store: ImageStore = Depends(get_image_store)
+) -> GalleryController:
+    """갤러리 컨트롤러 의존성 (공유 데이터베이스 서비스와 이미지 저장소 주입)"""
+    return GalleryController(db_service, image_store)
 
 
 @router.post("/upload")
@@ -23,7 +33,8 @@ async def upload_gallery_item(
     user_name: str = Form(...),
     user_type: str = Form(...),
     prompt: str = Form(...),
-    title: Optional[str] = Form(None)
+    title: Optional[str] = Form(None),
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """
     Upload a new gallery item with image and prompt
@@ -41,12 +52,12 @@ async def upload_gallery_item(
         image_data = await image.read()
         
         # Validate image
-        validation = gallery_controller.validate_image_file(image_data)
+        validation = await gallery_controller.validate_image_file(image_data)
         if not validation["valid"]:
             raise HTTPException(status_code=400, detail=validation["error"])
         
         # Create gallery item
-        result = gallery_controller.create_gallery_item(
+        result = await gallery_controller.create_gallery_item(
             session_id=session_id,
             user_id=user_id,
             user_name=user_name,
@@ -79,20 +90,37 @@ async def upload_gallery_item(
 async def get_session_gallery(
     session_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(GALLERY_PAGE_SIZE, ge=1, le=GALLERY_MAX_PAGE_SIZE),
+    include_image: bool = False,
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """
-    Get all gallery items for a specific session
+    Get one page of gallery items for a specific session (newest first)
+    
+    Pass the returned next_cursor as cursor to fetch the next page.
+    image_url is omitted unless include_image=true.
     """
     try:
         # Validate user_type
         if user_type not in ["student", "teacher"]:
             raise HTTPException(status_code=400, detail="Invalid user type")
         
-        result = gallery_controller.get_session_gallery_items(
+        # Validate cursor
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        
+        result = await gallery_controller.get_session_gallery_items(
             session_id=session_id,
             user_id=user_id,
-            user_type=user_type
+            user_type=user_type,
+            cursor=cursor,
+            limit=limit,
+            include_image=include_image
         )
         
         if result["success"]:
@@ -101,6 +129,8 @@ async def get_session_gallery(
                 content={
                     "success": True,
                     "items": result["items"],
+                    "next_cursor": result["next_cursor"],
+                    "has_more": result["has_more"],
                     "session_id": session_id
                 }
             )
@@ -117,7 +147,8 @@ async def get_session_gallery(
 async def delete_gallery_item(
     item_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """
     Delete a gallery item (only by creator or session teacher)
@@ -127,7 +158,7 @@ async def delete_gallery_item(
         if user_type not in ["student", "teacher"]:
             raise HTTPException(status_code=400, detail="Invalid user type")
         
-        result = gallery_controller.delete_gallery_item(
+        result = await gallery_controller.delete_gallery_item(
             item_id=item_id,
             user_id=user_id,
             user_type=user_type
@@ -154,7 +185,8 @@ async def delete_gallery_item(
 async def get_gallery_item(
     item_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """
     Get a specific gallery item (with session access validation)
@@ -165,25 +197,20 @@ async def get_gallery_item(
             raise HTTPException(status_code=400, detail="Invalid user type")
         
         # Get the item first
-        item = db_service.get_gallery_item_by_id(item_id)
+        item = await gallery_controller.db.get_gallery_item_by_id(item_id)
         if not item:
             raise HTTPException(status_code=404, detail="Gallery item not found")
         
         # Validate session access
-        result = gallery_controller.get_session_gallery_items(
-            session_id=item["session_id"],
-            user_id=user_id,
-            user_type=user_type
-        )
-        
-        if not result["success"]:
-            raise HTTPException(status_code=403, detail=result["error"])
+        error = await gallery_controller.validate_session_access(item["session_id"], user_id, user_type)
+        if error:
+            raise HTTPException(status_code=403, detail=error)
         
         return JSONResponse(
             status_code=200,
             content={
                 "success": True,
-                "item": item
+                "item": public_gallery_item(item)
             }
         )
         
@@ -197,7 +224,8 @@ async def get_gallery_item(
 async def get_session_gallery_stats(
     session_id: int,
     user_id: int,
-    user_type: str
+    user_type: str,
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """
     Get statistics for a session's gallery
@@ -207,34 +235,13 @@ async def get_session_gallery_stats(
         if user_type not in ["student", "teacher"]:
             raise HTTPException(status_code=400, detail="Invalid user type")
         
-        result = gallery_controller.get_session_gallery_items(
-            session_id=session_id,
-            user_id=user_id,
-            user_type=user_type
-        )
+        error = await gallery_controller.validate_session_access(session_id, user_id, user_type)
+        if error:
+            raise HTTPException(status_code=403, detail=error)
         
-        if not result["success"]:
-            raise HTTPException(status_code=403, detail=result["error"])
-        
-        items = result["items"]
-        
-        # Calculate stats
-        total_items = len(items)
-        student_items = len([item for item in items if item["user_type"] == "student"])
-        teacher_items = len([item for item in items if item["user_type"] == "teacher"])
-        
-        # Get unique contributors
-        contributors = set()
-        for item in items:
-            contributors.add(f"{item['user_name']}_{item['user_type']}")
-        
-        stats = {
-            "total_items": total_items,
-            "student_items": student_items,
-            "teacher_items": teacher_items,
-            "unique_contributors": len(contributors),
-            "session_id": session_id
-        }
+        # Counts come from count-only queries, cached per session
+        stats = await gallery_controller.db.get_gallery_stats(session_id)
+        stats["session_id"] = session_id
         
         return JSONResponse(
             status_code=200,
@@ -247,4 +254,47 @@ async def get_session_gallery_stats(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+
+@router.get("/image/{item_id}")
+@router.get("/image/{item_id}/{size}")
+async def get_gallery_image(
+    item_id: int,
+    request: Request,
+    user_id: int,
+    user_type: str,
+    size: str = "original",
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
+):
+    """
+    Stream a gallery image with a strong ETag, immutable caching,
+    If-None-Match (304) and single Range (206) support
+    
+    size is "original" or a rendition (256, 640, 1920 px long edge);
+    renditions are served as WebP/AVIF when accepted, else JPEG.
+    Requires the same session access as /item/{item_id}.
+    """
+    if user_type not in ["student", "teacher"]:
+        raise HTTPException(status_code=400, detail="Invalid user type")
+    
+    result = await gallery_controller.get_gallery_image(
+        item_id=item_id,
+        user_id=user_id,
+        user_type=user_type,
+        size=size,
+        accept=request.headers.get("accept")
+    )
+    
+    if not result["success"]:
+        status_code = result.get("status_code") or (500 if result["error"].startswith("Server error") else 404)
+        raise HTTPException(status_code=status_code, detail=result["error"])
+    
+    return cached_stream_response(
+        request.headers,
+        etag=result["etag"],
+        content_type=result["content_type"],
+        size=result["size"],
+        open_range=result["open_range"],
+        vary=result.get("vary")
+    )
@@ -3,15 +3,29 @@
 FastAPI 라우터를 통해 이미지 생성 API 엔드포인트 제공
 """
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
-from fastapi.responses import StreamingResponse
-from typing import Optional
+from fastapi.responses import StreamingResponse, JSONResponse, Response
+from typing import Optional, Callable, Awaitable, TypeVar, Dict, Any, Union
+import base64
+import asyncio
 import io
+import json
 from datetime import datetime
 
 from app.controllers.image_controller import ImageController
+from app.controllers.gallery_controller import GalleryController
+from app.core.models.image_schemas import get_credits_required
+from app.core.services.credit_limiter import CreditLimitExceeded, get_credit_limiter
+from app.core.services.image_store import iter_memory_range
+from app.core.services.stability_service import ImageStream, track_generation_usage
+from app.core.services.image_job_queue import (
+    ImageJobQueueFull, JOB_SUCCEEDED, PublishCallback, get_image_job_queue
+)
+from app.core.utils.disconnect import cancel_on_disconnect
+from app.views.gallery_views import get_gallery_controller
+from app.core.config.settings import BATCH_GENERATION_CONCURRENCY
 from app.core.models.image_schemas import (
     CoreImageRequest, ImageGenerationResponse, ErrorResponse,
-    FileValidationResponse, HealthCheckResponse
+    FileValidationResponse, HealthCheckResponse, BatchImageRequest, BatchImageItem
 )
 
 # 라우터 생성
@@ -29,6 +43,158 @@ async def get_image_controller() -> ImageController:
     """이미지 컨트롤러 의존성"""
     return image_controller
 
+# 백그라운드 작업 헬퍼
+
+T = TypeVar("T")
+
+# SSE 연결 유지용 주석 전송 간격 (초)
+JOB_EVENT_KEEPALIVE_SECONDS = 15
+
+
+def wants_background(form) -> bool:
+    """폼의 background 필드가 참이면 작업 큐로 제출"""
+    return str(form.get('background', '')).lower() in ('true', '1')
+
+
+async def detach_upload(upload: Optional[UploadFile]) -> Optional[UploadFile]:
+    """
+    업로드 파일을 메모리로 복사
+    요청이 끝나면 원래 업로드 파일이 닫히므로 백그라운드 작업에는 복사본을 넘김
+    """
+    if upload is None:
+        return None
+    data = await upload.read()
+    return UploadFile(io.BytesIO(data), size=len(data), filename=upload.filename, headers=upload.headers)
+
+
+def charge_generation_credits(kind: str, session_id: int, user_id: int) -> int:
+    """
+    생성 전에 세션/사용자 버킷에서 모델별 크레딧 차감
+    부족하면 Stability를 호출하지 않고 429와 Retry-After 반환
+    캐시 적중이나 같은 요청 합류로 Stability를 호출하지 않으면 refund_unused_credits에서 반환
+    """
+    credits = get_credits_required(kind)
+    try:
+        get_credit_limiter().charge(session_id, user_id, credits)
+    except CreditLimitExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": e.retry_after_header})
+    return credits
+
+
+async def refund_unused_credits(awaitable: Awaitable[T], session_id: int, user_id: int, credits: int) -> T:
+    """
+    생성이 실패하거나 취소되면 차감한 크레딧 반환
+    Stability API를 호출하지 않은 경우(생성 결과 캐시 적중, 진행 중인 같은 요청에 합류)에도 반환
+    """
+    with track_generation_usage() as usage:
+        try:
+            result = await awaitable
+        except BaseException:
+            get_credit_limiter().refund(session_id, user_id, credits)
+            raise
+    if not usage.upstream:
+        get_credit_limiter().refund(session_id, user_id, credits)
+    return result
+
+
+def enqueue_generation_job(run: Callable[[], Awaitable[bytes]], kind: str, session_id: int,
+                           user_id: int, output_format: str, filename: str, credits: int,
+                           publish: Optional[PublishCallback] = None) -> Dict[str, Any]:
+    """이미지 생성 작업을 큐에 넣고 작업 ID와 조회 경로 반환 (실패하면 크레딧 반환)"""
+    queue = get_image_job_queue()
+    try:
+        job = queue.submit(
+            lambda: refund_unused_credits(run(), session_id, user_id, credits),
+            session_id, user_id, kind, f"image/{output_format}", filename, publish
+        )
+    except ImageJobQueueFull as e:
+        get_credit_limiter().refund(session_id, user_id, credits)
+        raise HTTPException(status_code=429, detail=str(e))
+
+    base_url = f"{router.prefix}/jobs/{job.id}"
+    return {
+        **queue.describe(job),
+        "credits_charged": credits,
+        "status_url": base_url,
+        "events_url": f"{base_url}/events",
+        "result_url": f"{base_url}/result",
+        "publish_url": f"{base_url}/publish"
+    }
+
+
+def submit_generation_job(run: Callable[[], Awaitable[bytes]], kind: str, session_id: int,
+                          user_id: int, output_format: str, filename: str, credits: int,
+                          publish: Optional[PublishCallback] = None) -> JSONResponse:
+    """이미지 생성 작업을 큐에 넣고 202 응답 반환"""
+    job_info = enqueue_generation_job(run, kind, session_id, user_id, output_format, filename, credits, publish)
+    return JSONResponse(status_code=202, content=job_info)
+
+
+def wants_stream(form) -> bool:
+    """
+    폼의 stream 필드가 참이면 업스트림 응답을 메모리에 모으지 않고 그대로 전달
+    스트리밍 응답은 생성 결과 캐시와 동일 요청 합치기를 거치지 않으므로 요청한 경우에만 사용
+    """
+    return str(form.get('stream', '')).lower() in ('true', '1')
+
+
+def wants_publish(form) -> bool:
+    """폼의 publish_to_gallery 필드가 참이면 생성 결과를 바로 갤러리에 게시"""
+    return str(form.get('publish_to_gallery', '')).lower() in ('true', '1')
+
+
+async def gallery_publisher(form, gallery_controller: GalleryController,
+                            session_id: int, user_id: int) -> Optional[PublishCallback]:
+    """
+    publish_to_gallery 요청이면 갤러리 게시 함수 반환 (아니면 None)
+    크레딧을 쓰기 전에 세션 접근 권한을 먼저 확인
+    """
+    if not wants_publish(form):
+        return None
+    
+    user_name = form.get('user_name', '')
+    user_type = form.get('user_type', '')
+    prompt = form.get('prompt', '')
+    title = form.get('title') or None
+    if user_type not in ("student", "teacher"):
+        raise HTTPException(status_code=400, detail="Invalid user type")
+    
+    error = await gallery_controller.validate_upload_access(session_id, user_id, user_name, user_type)
+    if error:
+        raise HTTPException(status_code=403, detail=error)
+    
+    return lambda image_data: gallery_controller.publish_generated_image(
+        session_id, user_id, user_name, user_type, image_data, prompt, title
+    )
+
+
+async def publish_response(publish: PublishCallback, image_data: bytes) -> JSONResponse:
+    """생성 이미지를 갤러리에 게시하고 갤러리 업로드와 같은 형식으로 응답"""
+    result = await publish(image_data)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return JSONResponse(
+        status_code=201,
+        content={
+            "success": True,
+            "message": "Gallery item created successfully",
+            "item": result["item"]
+        }
+    )
+
+
+def generation_response(result: Union[bytes, ImageStream], output_format: str,
+                        filename: str) -> StreamingResponse:
+    """
+    생성 결과를 다운로드 응답으로 변환
+    ImageStream은 업스트림 청크를 그대로 전달하여 이미지 전체를 메모리에 두지 않음
+    """
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if isinstance(result, ImageStream):
+        return StreamingResponse(result.iter_bytes(), media_type=result.media_type, headers=headers)
+    return StreamingResponse(iter_memory_range(result), media_type=f"image/{output_format}", headers=headers)
+
+
 # 헬스체크 엔드포인트
 @router.get("/health", response_model=HealthCheckResponse)
 async def health_check(controller: ImageController = Depends(get_image_controller)):
@@ -74,7 +240,8 @@ async def validate_image(
 @router.post("/generate/core")
 async def generate_core_image(
     request: Request,
-    controller: ImageController = Depends(get_image_controller)
+    controller: ImageController = Depends(get_image_controller),
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """Stable Image Core로 이미지 생성"""
     
@@ -126,24 +293,46 @@ async def generate_core_image(
     if seed is not None:
         request_data["seed"] = seed
     
-    # 이미지 생성
-    image_data = await controller.generate_core_image_data(request_data)
+    # 갤러리 게시 요청이면 크레딧 차감 전에 권한 확인
+    publish = await gallery_publisher(form, gallery_controller, session_id, user_id)
+    
+    # 크레딧 차감 (부족하면 429)
+    credits = charge_generation_credits("core", session_id, user_id)
+    
+    # 백그라운드 작업으로 제출
+    if wants_background(form):
+        filename = f"core_image_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        return submit_generation_job(
+            lambda: controller.generate_core_image_data(request_data),
+            "core", session_id, user_id, output_format, filename, credits, publish
+        )
+    
+    # 이미지 생성 (stream 요청이면 업스트림 응답을 그대로 스트리밍, 시드 고정/갤러리 게시는 제외)
+    stream = wants_stream(form) and seed is None and publish is None
+    result = await cancel_on_disconnect(
+        request,
+        refund_unused_credits(
+            controller.generate_core_image_data(request_data, stream=stream),
+            session_id, user_id, credits
+        )
+    )
+    
+    # 갤러리 게시 요청이면 저장 후 갤러리 항목 반환
+    if publish is not None:
+        return await publish_response(publish, result)
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"core_image_{timestamp}.{output_format}"
     
     # 스트리밍 응답으로 반환
-    return StreamingResponse(
-        io.BytesIO(image_data),
-        media_type=f"image/{output_format}",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return generation_response(result, output_format, filename)
 
 @router.post("/generate/sd35")
 async def generate_sd35_image(
     request: Request,
-    controller: ImageController = Depends(get_image_controller)
+    controller: ImageController = Depends(get_image_controller),
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """Stable Diffusion 3.5로 이미지 생성"""
     
@@ -228,8 +417,35 @@ async def generate_sd35_image(
     if cfg_scale is not None:
         request_data["cfg_scale"] = cfg_scale
     
-    # 이미지 생성
-    image_data = await controller.generate_sd35_image(request_data, image)
+    # 갤러리 게시 요청이면 크레딧 차감 전에 권한 확인
+    publish = await gallery_publisher(form, gallery_controller, session_id, user_id)
+    
+    # 크레딧 차감 (부족하면 429)
+    credits = charge_generation_credits("sd35", session_id, user_id)
+    
+    # 백그라운드 작업으로 제출
+    if wants_background(form):
+        mode_suffix = "i2i" if mode == "image-to-image" else "t2i"
+        filename = f"sd35_{mode_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        job_image = await detach_upload(image)
+        return submit_generation_job(
+            lambda: controller.generate_sd35_image(request_data, job_image),
+            "sd35", session_id, user_id, output_format, filename, credits, publish
+        )
+    
+    # 이미지 생성 (stream 요청이면 업스트림 응답을 그대로 스트리밍, 시드 고정/갤러리 게시는 제외)
+    stream = wants_stream(form) and seed is None and publish is None
+    result = await cancel_on_disconnect(
+        request,
+        refund_unused_credits(
+            controller.generate_sd35_image(request_data, image, stream=stream),
+            session_id, user_id, credits
+        )
+    )
+    
+    # 갤러리 게시 요청이면 저장 후 갤러리 항목 반환
+    if publish is not None:
+        return await publish_response(publish, result)
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -237,16 +453,13 @@ async def generate_sd35_image(
     filename = f"sd35_{mode_suffix}_{timestamp}.{output_format}"
     
     # 스트리밍 응답으로 반환
-    return StreamingResponse(
-        io.BytesIO(image_data),
-        media_type=f"image/{output_format}",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return generation_response(result, output_format, filename)
 
 @router.post("/generate/ultra")
 async def generate_ultra_image(
     request: Request,
-    controller: ImageController = Depends(get_image_controller)
+    controller: ImageController = Depends(get_image_controller),
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """Stable Image Ultra로 이미지 생성"""
     
@@ -313,24 +526,47 @@ async def generate_ultra_image(
     if seed is not None:
         request_data["seed"] = seed
     
-    # 이미지 생성
-    image_data = await controller.generate_ultra_image(request_data, image)
+    # 갤러리 게시 요청이면 크레딧 차감 전에 권한 확인
+    publish = await gallery_publisher(form, gallery_controller, session_id, user_id)
+    
+    # 크레딧 차감 (부족하면 429)
+    credits = charge_generation_credits("ultra", session_id, user_id)
+    
+    # 백그라운드 작업으로 제출
+    if wants_background(form):
+        filename = f"ultra_image_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        job_image = await detach_upload(image)
+        return submit_generation_job(
+            lambda: controller.generate_ultra_image(request_data, job_image),
+            "ultra", session_id, user_id, output_format, filename, credits, publish
+        )
+    
+    # 이미지 생성 (stream 요청이면 업스트림 응답을 그대로 스트리밍, 시드 고정/갤러리 게시는 제외)
+    stream = wants_stream(form) and seed is None and publish is None
+    result = await cancel_on_disconnect(
+        request,
+        refund_unused_credits(
+            controller.generate_ultra_image(request_data, image, stream=stream),
+            session_id, user_id, credits
+        )
+    )
+    
+    # 갤러리 게시 요청이면 저장 후 갤러리 항목 반환
+    if publish is not None:
+        return await publish_response(publish, result)
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"ultra_image_{timestamp}.{output_format}"
     
     # 스트리밍 응답으로 반환
-    return StreamingResponse(
-        io.BytesIO(image_data),
-        media_type=f"image/{output_format}",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return generation_response(result, output_format, filename)
 
 @router.post("/control/sketch")
 async def sketch_to_image(
     request: Request,
-    controller: ImageController = Depends(get_image_controller)
+    controller: ImageController = Depends(get_image_controller),
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
 ):
     """스케치를 이미지로 변환"""
     
@@ -397,30 +633,253 @@ async def sketch_to_image(
     if seed is not None:
         request_data["seed"] = seed
     
-    # 이미지 생성
-    image_data = await controller.sketch_to_image(request_data, image)
+    # 갤러리 게시 요청이면 크레딧 차감 전에 권한 확인
+    publish = await gallery_publisher(form, gallery_controller, session_id, user_id)
+    
+    # 크레딧 차감 (부족하면 429)
+    credits = charge_generation_credits("sketch", session_id, user_id)
+    
+    # 백그라운드 작업으로 제출
+    if wants_background(form):
+        filename = f"sketch_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        job_image = await detach_upload(image)
+        return submit_generation_job(
+            lambda: controller.sketch_to_image(request_data, job_image),
+            "sketch", session_id, user_id, output_format, filename, credits, publish
+        )
+    
+    # 이미지 생성 (stream 요청이면 업스트림 응답을 그대로 스트리밍, 시드 고정/갤러리 게시는 제외)
+    stream = wants_stream(form) and seed is None and publish is None
+    result = await cancel_on_disconnect(
+        request,
+        refund_unused_credits(
+            controller.sketch_to_image(request_data, image, stream=stream),
+            session_id, user_id, credits
+        )
+    )
+    
+    # 갤러리 게시 요청이면 저장 후 갤러리 항목 반환
+    if publish is not None:
+        return await publish_response(publish, result)
     
     # 파일명 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"sketch_result_{timestamp}.{output_format}"
     
     # 스트리밍 응답으로 반환
+    return generation_response(result, output_format, filename)
+
+# 배치 생성 엔드포인트
+
+def run_batch_item(controller: ImageController, item: BatchImageItem) -> Awaitable[bytes]:
+    """배치 항목을 모델별 생성 메서드 호출로 변환"""
+    request_data = item.to_request_data()
+    if item.generation_type == "sd35":
+        return controller.generate_sd35_image(request_data)
+    if item.generation_type == "ultra":
+        return controller.generate_ultra_image(request_data)
+    return controller.generate_core_image_data(request_data)
+
+@router.post("/generate/batch")
+async def generate_batch_images(
+    batch: BatchImageRequest,
+    controller: ImageController = Depends(get_image_controller)
+):
+    """
+    여러 프롬프트를 한 번에 생성 (Core, SD3.5, Ultra)
+    최대 BATCH_GENERATION_CONCURRENCY개씩 동시에 실행하고 끝나는 순서대로 NDJSON 한 줄씩 반환
+    - 성공: index, status=succeeded, media_type, image_base64
+    - background=true: index, status=queued와 작업 조회 경로 (이미지는 작업 API로 조회)
+    - 실패: index, status=failed, status_code, error (다른 항목에는 영향 없음)
+    """
+    semaphore = asyncio.Semaphore(BATCH_GENERATION_CONCURRENCY)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    async def process(index: int, item: BatchImageItem) -> Dict[str, Any]:
+        output_format = item.output_format.value
+        filename = f"batch_{item.generation_type}_{timestamp}_{index + 1}.{output_format}"
+        base = {"index": index, "generation_type": item.generation_type}
+        try:
+            async with semaphore:
+                credits = charge_generation_credits(item.generation_type, batch.session_id, batch.user_id)
+                if batch.background:
+                    job_info = enqueue_generation_job(
+                        lambda: run_batch_item(controller, item), item.generation_type,
+                        batch.session_id, batch.user_id, output_format, filename, credits
+                    )
+                    return {**base, **job_info}
+                
+                with track_generation_usage() as usage:
+                    image_data = await refund_unused_credits(
+                        run_batch_item(controller, item), batch.session_id, batch.user_id, credits
+                    )
+            return {
+                **base,
+                "status": "succeeded",
+                "filename": filename,
+                "media_type": f"image/{output_format}",
+                "credits_charged": credits if usage.upstream else 0,
+                "image_base64": base64.b64encode(image_data).decode("ascii")
+            }
+        except HTTPException as e:
+            result = {**base, "status": "failed", "status_code": e.status_code, "error": e.detail}
+            if e.headers and "Retry-After" in e.headers:
+                result["retry_after"] = int(e.headers["Retry-After"])
+            return result
+        except Exception as e:
+            print(f"🔴 Batch item {index} failed: {str(e)}")
+            return {**base, "status": "failed", "status_code": 500, "error": "이미지 생성 중 오류가 발생했습니다"}
+    
+    tasks = [asyncio.create_task(process(index, item)) for index, item in enumerate(batch.items)]
+    
+    async def result_stream():
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield json.dumps(await next_result, ensure_ascii=False) + "\n"
+        finally:
+            # 클라이언트가 연결을 끊으면 남은 생성도 취소
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+# 크레딧 잔여량 조회 엔드포인트
+
+@router.get("/budget/{session_id}")
+async def get_credit_budget(session_id: int, user_id: Optional[int] = None):
+    """세션(및 사용자)의 남은 생성 크레딧과 모델별 필요 크레딧 반환"""
+    limiter = get_credit_limiter()
+    return {
+        "session_id": session_id,
+        "session": limiter.remaining("session", session_id),
+        "user": limiter.remaining("user", user_id) if user_id is not None else None,
+        "costs": {kind: get_credits_required(kind) for kind in ("core", "sd35", "ultra", "sketch")}
+    }
+
+# 백그라운드 작업 조회 엔드포인트들
+
+@router.get("/jobs/{job_id}")
+async def get_generation_job(job_id: str):
+    """이미지 생성 작업 상태 조회 (폴링용)"""
+    queue = get_image_job_queue()
+    job = queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return queue.describe(job)
+
+@router.get("/jobs/{job_id}/result")
+async def get_generation_job_result(job_id: str):
+    """완료된 작업의 생성 이미지 반환"""
+    job = get_image_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    if not job.finished:
+        raise HTTPException(status_code=409, detail="작업이 아직 완료되지 않았습니다")
+    if job.status != JOB_SUCCEEDED:
+        raise HTTPException(status_code=job.status_code or 500, detail=job.error)
+    
+    return Response(
+        content=job.result,
+        media_type=job.media_type,
+        headers={"Content-Disposition": f"attachment; filename={job.filename}"}
+    )
+
+@router.post("/jobs/{job_id}/publish")
+async def publish_generation_job(
+    job_id: str,
+    user_id: int = Form(...),
+    user_name: str = Form(...),
+    user_type: str = Form(...),
+    prompt: str = Form(...),
+    title: Optional[str] = Form(None),
+    gallery_controller: GalleryController = Depends(get_gallery_controller)
+):
+    """
+    완료된 작업의 생성 이미지를 갤러리에 게시
+    서버에 남아 있는 결과를 그대로 사용하므로 클라이언트가 이미지를 다시 업로드하지 않음
+    이미 게시된 작업이면 기존 갤러리 항목 반환
+    """
+    if user_type not in ("student", "teacher"):
+        raise HTTPException(status_code=400, detail="Invalid user type")
+
+    queue = get_image_job_queue()
+    job = queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    if job.user_id != user_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    if job.status != JOB_SUCCEEDED:
+        raise HTTPException(status_code=409, detail="완료된 작업만 게시할 수 있습니다")
+
+    if job.gallery_item is None:
+        await queue.publish(job, lambda image_data: gallery_controller.publish_generated_image(
+            job.session_id, user_id, user_name, user_type, image_data, prompt, title
+        ))
+        if job.gallery_item is None:
+            raise HTTPException(status_code=400, detail=job.gallery_error)
+
+    return JSONResponse(
+        status_code=201,
+        content={
+            "success": True,
+            "message": "Gallery item created successfully",
+            "item": job.gallery_item
+        }
+    )
+
+@router.get("/jobs/{job_id}/events")
+async def stream_generation_job_events(job_id: str, request: Request):
+    """
+    작업 상태를 SSE로 전송
+    대기 순서/상태가 바뀔 때마다 status 이벤트, 끝나면 complete 이벤트를 보내고 종료
+    """
+    queue = get_image_job_queue()
+    job = queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    
+    async def event_stream():
+        last_info = None
+        idle_seconds = 0.0
+        while True:
+            info = queue.describe(job)
+            if job.finished:
+                yield f"event: complete\ndata: {json.dumps(info)}\n\n"
+                break
+            if info != last_info:
+                yield f"event: status\ndata: {json.dumps(info)}\n\n"
+                last_info = info
+                idle_seconds = 0.0
+            elif idle_seconds >= JOB_EVENT_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                idle_seconds = 0.0
+            
+            if await request.is_disconnected():
+                break
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                idle_seconds += 1.0
+    
     return StreamingResponse(
-        io.BytesIO(image_data),
-        media_type=f"image/{output_format}",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 # 교육용 특화 엔드포인트들
 
 @router.post("/generate/educational")
 async def generate_educational_image(
+    http_request: Request,
     prompt: str = Form(..., description="교육용 이미지 생성 프롬프트"),
     subject: str = Form(..., description="교육 주제"),
     grade_level: Optional[str] = Form(None, description="학년 수준"),
     style: str = Form("illustration", description="교육용 스타일"),
     aspect_ratio: str = Form("16:9", description="이미지 비율"),
     output_format: str = Form("png", description="출력 형식"),
+    session_id: int = Form(0, description="세션 ID (크레딧 제한 단위)"),
+    user_id: int = Form(0, description="사용자 ID (크레딧 제한 단위)"),
     controller: ImageController = Depends(get_image_controller)
 ):
     """교육용 이미지 생성 (Core 모델 사용)"""
@@ -444,14 +903,20 @@ async def generate_educational_image(
     # Core 모델로 이미지 생성
     from app.core.models.image_schemas import CoreImageRequest
     request = CoreImageRequest(**request_data)
-    result = await controller.generate_core_image(request)
+    credits = charge_generation_credits("core", session_id, user_id)
+    result = await cancel_on_disconnect(
+        http_request, refund_unused_credits(controller.generate_core_image(request), session_id, user_id, credits)
+    )
     
     return result
 
 @router.post("/generate/quick")
 async def generate_quick_image(
+    http_request: Request,
     prompt: str = Form(..., description="간단한 프롬프트"),
     style: str = Form("illustration", description="스타일"),
+    session_id: int = Form(0, description="세션 ID (크레딧 제한 단위)"),
+    user_id: int = Form(0, description="사용자 ID (크레딧 제한 단위)"),
     controller: ImageController = Depends(get_image_controller)
 ):
     """빠른 이미지 생성 (기본 설정 사용)"""
@@ -465,7 +930,10 @@ async def generate_quick_image(
         output_format="png"
     )
     
-    result = await controller.generate_core_image(request)
+    credits = charge_generation_credits("core", session_id, user_id)
+    result = await cancel_on_disconnect(
+        http_request, refund_unused_credits(controller.generate_core_image(request), session_id, user_id, credits)
+    )
     return result
 
 # 예외 처리는 메인 애플리케이션에서 처리하므로 여기서는 제거
\ No newline at end of file
@@ -3,7 +3,17 @@
 애플리케이션의 기본 엔드포인트 정의
 헬스체크 및 루트 경로 처리
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.core.services.async_database_service import AsyncDatabaseService, get_database_service
+from app.core.services.image_executor import get_image_executor
+from app.core.services.image_job_queue import get_image_job_queue
+from app.core.services.credit_limiter import get_credit_limiter
+from app.core.services.generation_cache import get_generation_cache
+from app.core.services.response_cache import get_response_cache_stats
+from app.core.services.openai_service import get_stream_stats
+from app.core.services.message_persister import get_message_persister
+from app.core.services.stability_service import get_generation_flight_stats
 
 # 메인 라우터 생성
 router = APIRouter(tags=["main"])
@@ -30,4 +40,104 @@ async def health_check():
     Returns:
         서버 상태 정보
     """
-    return {"status": "healthy", "message": "Server is running"}
\ No newline at end of file
+    return {"status": "healthy", "message": "Server is running"}
+
+
+@router.get("/health/cache")
+async def cache_stats(db_service: AsyncDatabaseService = Depends(get_database_service)):
+    """
+    캐시 상태 조회 API
+    데이터베이스 엔티티/갤러리 통계 캐시의 적중/미스 통계 반환
+    
+    Returns:
+        캐시 통계 정보
+    """
+    return db_service.get_cache_stats()
+
+
+@router.get("/health/image-workers")
+async def image_worker_stats():
+    """
+    이미지 처리 풀 상태 조회 API
+    대기/실행 중 작업 수(큐 깊이)와 처리 시간 통계 반환
+    
+    Returns:
+        이미지 처리 풀 통계 정보
+    """
+    return get_image_executor().stats()
+
+
+@router.get("/health/image-jobs")
+async def image_job_stats():
+    """
+    이미지 생성 작업 큐 상태 조회 API
+    대기/실행 중 작업 수와 세션 수, 대기/실행 시간 통계 반환
+    
+    Returns:
+        이미지 생성 작업 큐 통계 정보
+    """
+    return get_image_job_queue().stats()
+
+
+@router.get("/health/generation-cache")
+async def generation_cache_stats():
+    """
+    이미지 생성 결과 캐시 상태 조회 API
+    시드 고정 생성 결과 캐시의 적중/미스 통계와 디스크 사용량,
+    동시에 들어온 같은 요청 합치기(single-flight) 통계 반환
+    
+    Returns:
+        생성 결과 캐시 통계 정보 (비활성화된 경우 enabled: false)
+    """
+    cache = get_generation_cache()
+    stats = {"enabled": True, **cache.stats()} if cache is not None else {"enabled": False}
+    stats["single_flight"] = get_generation_flight_stats()
+    return stats
+
+
+@router.get("/health/credits")
+async def credit_limiter_stats():
+    """
+    이미지 생성 크레딧 제한기 상태 조회 API
+    허용/거절 횟수, 차감/환불 크레딧, Stability 요청 제한으로 막힌 남은 시간 반환
+    
+    Returns:
+        크레딧 제한기 통계 정보
+    """
+    return get_credit_limiter().stats()
+
+
+@router.get("/health/response-cache")
+async def response_cache_stats():
+    """
+    OpenAI 응답 캐시 상태 조회 API
+    반복 질문 캐시의 적중/미스 통계와 항목 수 반환
+    
+    Returns:
+        응답 캐시 통계 정보 (비활성화된 경우 enabled: false)
+    """
+    return get_response_cache_stats()
+
+
+@router.get("/health/chat-streams")
+async def chat_stream_stats():
+    """
+    AI 채팅 스트리밍 상태 조회 API
+    진행 중/완료/취소/실패 스트림 수와 첫 토큰까지 걸린 시간(TTFT) 통계 반환
+    
+    Returns:
+        스트리밍 통계 정보
+    """
+    return get_stream_stats()
+
+
+@router.get("/health/chat-persistence")
+async def chat_persistence_stats():
+    """
+    채팅 메시지 일괄 저장 상태 조회 API
+    저장 대기/저장 중 메시지 수, 저장된 메시지와 배치 수, 재시도 횟수, 스풀 파일 기록 수 반환
+    
+    Returns:
+        메시지 저장 통계 정보
+    """
+    return get_message_persister().stats()
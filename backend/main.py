@@ -24,11 +24,20 @@ Feature-based 구조로 리팩토링된 구조에서 애플리케이션 진입
    - 각 feature별로 단위 테스트 작성 가능
    - 모킹(Mocking)을 통한 독립적 테스트 가능
 """
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config.settings import CORS_ORIGINS, SERVER_HOST, SERVER_PORT
+from app.core.services.async_database_service import init_database_service, close_database_service
+from app.core.services.image_executor import init_image_executor, shutdown_image_executor
+from app.core.services.stability_service import close_stability_client
+from app.core.services.image_job_queue import shutdown_image_job_queue
+from app.core.services.credit_limiter import save_credit_limiter
+from app.core.services.openai_service import close_openai_service
+from app.core.services.message_persister import init_message_persister, shutdown_message_persister
 
 # Feature-based 라우터 import
 from app.features.auth.routes import router as auth_router
@@ -41,11 +50,34 @@ from app.views.chat_routes import router as chat_router
 from app.views.gallery_views import router as gallery_router
 from app.views.image_routes import router as image_generation_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    애플리케이션 수명 주기 관리
+    시작 시 프로세스 공유 데이터베이스 서비스(연결 풀)와 이미지 처리 풀을 생성하고 종료 시 정리
+    Stability AI/OpenAI 공유 클라이언트와 이미지 생성 작업 큐는 첫 호출 시 생성되며 종료 시 함께 정리
+    크레딧 제한기 상태는 CREDIT_LIMITER_STATE_FILE이 설정된 경우 종료 시 저장
+    채팅 메시지 저장기는 시작 시 스풀 파일을 다시 저장하고, 종료 시 남은 메시지를 저장하거나 스풀 파일에 기록
+    """
+    await init_database_service()
+    init_image_executor()
+    init_message_persister()
+    yield
+    await shutdown_message_persister()
+    await shutdown_image_job_queue()
+    save_credit_limiter()
+    shutdown_image_executor()
+    await close_stability_client()
+    await close_openai_service()
+    await close_database_service()
+
+
 # FastAPI 애플리케이션 인스턴스 생성
 app = FastAPI(
     title="Education System API",
     description="Feature-based 구조로 구성된 교육 시스템 API",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS 미들웨어 설정
@@ -0,0 +1,78 @@
+"""
+갤러리 이미지 마이그레이션 명령
+gallery_items.image_url에 data: URL(base64)로 저장된 이미지를 이미지 저장소로 옮기고
+행에는 저장소 URL만 남김
+
+사용법:
+    python migrate_gallery_images.py              # 전체 마이그레이션
+    python migrate_gallery_images.py --dry-run    # 대상만 확인
+    python migrate_gallery_images.py --batch-size 20
+"""
+import argparse
+import asyncio
+
+from app.core.services.async_database_service import AsyncDatabaseService
+from app.core.services.image_store import ImageStore, create_image_store, parse_data_url
+
+
+async def migrate(db_service: AsyncDatabaseService, image_store: ImageStore,
+                  batch_size: int = 50, dry_run: bool = False) -> dict:
+    """
+    인라인 이미지를 배치 단위로 저장소에 옮기고 image_url을 갱신
+
+    Returns:
+        migrated, skipped, failed 개수
+    """
+    result = {"migrated": 0, "skipped": 0, "failed": 0}
+    after_id = 0
+
+    while True:
+        items = await db_service.get_inline_image_gallery_items(after_id=after_id, limit=batch_size)
+        if not items:
+            break
+
+        for item in items:
+            after_id = item["id"]
+            parsed = parse_data_url(item["image_url"])
+            if parsed is None:
+                print(f"⚠️ Skipping gallery item {item['id']}: unsupported data URL")
+                result["skipped"] += 1
+                continue
+
+            image_data, image_format = parsed
+            if dry_run:
+                print(f"📝 Would migrate gallery item {item['id']} ({len(image_data)} bytes, {image_format})")
+                result["migrated"] += 1
+                continue
+
+            try:
+                image_url = await image_store.save(image_data, image_format)
+                updated = await db_service.update_gallery_item(item["id"], {"image_url": image_url})
+                if not updated:
+                    raise RuntimeError("row update failed")
+                print(f"✅ Migrated gallery item {item['id']} -> {image_url}")
+                result["migrated"] += 1
+            except Exception as e:
+                print(f"🔴 Failed to migrate gallery item {item['id']}: {str(e)}")
+                result["failed"] += 1
+
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Move inline base64 gallery images into the image store")
+    parser.add_argument("--batch-size", type=int, default=50, help="rows fetched per request")
+    parser.add_argument("--dry-run", action="store_true", help="list rows without changing anything")
+    args = parser.parse_args()
+
+    db_service = AsyncDatabaseService()
+    try:
+        result = await migrate(db_service, create_image_store(), args.batch_size, args.dry_run)
+    finally:
+        await db_service.close()
+
+    print(f"Done: {result['migrated']} migrated, {result['skipped']} skipped, {result['failed']} failed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,6 +6,7 @@ import Masonry from './Masonry';
 import './Gallery.css';
 
 const API_BASE_URL = 'http://localhost:8000';
+const PAGE_SIZE = 24;
 
 function Gallery({ sessionId, sessionInfo }) {
   const [galleryItems, setGalleryItems] = useState([]);
@@ -15,6 +16,9 @@ function Gallery({ sessionId, sessionInfo }) {
   const [showDetailModal, setShowDetailModal] = useState(false);
   const [selectedItem, setSelectedItem] = useState(null);
   const [stats, setStats] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { user } = useAuth();
 
   // Convert gallery items to masonry format
@@ -23,9 +27,14 @@ function Gallery({ sessionId, sessionInfo }) {
       // Generate random height for masonry effect (between 250-500px)
       const height = Math.floor(Math.random() * (500 - 250 + 1)) + 250;
       
+      // 이미지 엔드포인트도 세션 접근 권한을 확인하므로 사용자 정보 전달
+      const access = `user_id=${user.id}&user_type=${user.user_type}`;
+      
       return {
         id: item.id.toString(),
-        img: item.image_url,
+        img: `${API_BASE_URL}/api/gallery/image/${item.id}/640?${access}`,
+        largeImg: `${API_BASE_URL}/api/gallery/image/${item.id}/1920?${access}`,
+        originalImg: `${API_BASE_URL}/api/gallery/image/${item.id}?${access}`,
         prompt: item.prompt,
         title: item.title || 'AI 생성 이미지',
         user_name: item.user_name,
@@ -39,6 +48,14 @@ function Gallery({ sessionId, sessionInfo }) {
     });
   };
 
+  const buildGalleryUrl = (cursor) => {
+    let url = `${API_BASE_URL}/api/gallery/session/${sessionId}?user_id=${user.id}&user_type=${user.user_type}&limit=${PAGE_SIZE}`;
+    if (cursor) {
+      url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
+    return url;
+  };
+
   const fetchGalleryItems = async () => {
     if (!sessionId || !user) return;
 
@@ -46,14 +63,14 @@ function Gallery({ sessionId, sessionInfo }) {
     setError(null);
     
     try {
-      const response = await fetch(
-        `${API_BASE_URL}/api/gallery/session/${sessionId}?user_id=${user.id}&user_type=${user.user_type}`
-      );
+      const response = await fetch(buildGalleryUrl(null));
 
       const data = await response.json();
 
       if (response.ok && data.success) {
         setGalleryItems(data.items || []);
+        setNextCursor(data.next_cursor || null);
+        setHasMore(Boolean(data.has_more));
       } else {
         throw new Error(data.detail || data.error || '갤러리를 불러오는데 실패했습니다.');
       }
@@ -65,6 +82,31 @@ function Gallery({ sessionId, sessionInfo }) {
     }
   };
 
+  const fetchMoreGalleryItems = async () => {
+    if (!sessionId || !user || !nextCursor || loadingMore) return;
+
+    setLoadingMore(true);
+    
+    try {
+      const response = await fetch(buildGalleryUrl(nextCursor));
+
+      const data = await response.json();
+
+      if (response.ok && data.success) {
+        setGalleryItems(prev => [...prev, ...(data.items || [])]);
+        setNextCursor(data.next_cursor || null);
+        setHasMore(Boolean(data.has_more));
+      } else {
+        throw new Error(data.detail || data.error || '갤러리를 불러오는데 실패했습니다.');
+      }
+    } catch (error) {
+      console.error('Gallery fetch more error:', error);
+      setError(error.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchStats = async () => {
     if (!sessionId || !user) return;
 
@@ -178,7 +220,7 @@ function Gallery({ sessionId, sessionInfo }) {
               <span className="recommend-stat-item__label">전체 작품</span>
             </div>
             <div className="recommend-stat-item">
-              <span className="recommend-stat-item__value">{stats.total_contributors}</span>
+              <span className="recommend-stat-item__value">{stats.unique_contributors}</span>
               <span className="recommend-stat-item__label">참여자</span>
             </div>
             <div className="recommend-stat-item">
@@ -235,6 +277,18 @@ function Gallery({ sessionId, sessionInfo }) {
             />
           </div>
         )}
+
+        {!loading && !error && hasMore && (
+          <div className="recommend-gallery__load-more">
+            <button 
+              className="recommend-btn recommend-btn--secondary"
+              onClick={fetchMoreGalleryItems}
+              disabled={loadingMore}
+            >
+              {loadingMore ? '불러오는 중...' : '더 보기'}
+            </button>
+          </div>
+        )}
       </div>
 
       {showUploadModal && (
@@ -261,7 +315,7 @@ function Gallery({ sessionId, sessionInfo }) {
             <div className="recommend-modal__content">
               <div className="recommend-gallery-detail">
                 <div className="recommend-gallery-detail__image">
-                  <img src={selectedItem.img} alt={selectedItem.title} />
+                  <img src={selectedItem.largeImg} alt={selectedItem.title} />
                 </div>
                 <div className="recommend-gallery-detail__info">
                   <div className="recommend-gallery-detail__meta">
@@ -279,7 +333,7 @@ function Gallery({ sessionId, sessionInfo }) {
             </div>
             <div className="recommend-modal__actions">
               <a 
-                href={selectedItem.img} 
+                href={selectedItem.originalImg} 
                 download={`${selectedItem.title}.jpg`}
                 className="recommend-btn recommend-btn--primary"
               >
@@ -10,6 +10,13 @@ function GalleryItem({ item, onDelete, isModal = false, isOpen = false, onClose
   const [showPromptModal, setShowPromptModal] = useState(false);
   const { user } = useAuth();
 
+  // 그리드 타일은 640px, 모달은 1920px 렌디션 사용 (세션 접근 권한 확인용 사용자 정보 포함)
+  const imagePath = `${API_BASE_URL}/api/gallery/image/${item.id}`;
+  const access = user ? `?user_id=${user.id}&user_type=${user.user_type}` : '';
+  const imageUrl = `${imagePath}${access}`;
+  const thumbnailUrl = `${imagePath}/640${access}`;
+  const largeUrl = `${imagePath}/1920${access}`;
+
   const canDelete = user && (
     (user.user_type === 'student' && user.id === item.user_id && item.user_type === 'student') ||
     (user.user_type === 'teacher') // 선생님은 모든 이미지 삭제 권한
@@ -83,7 +90,7 @@ function GalleryItem({ item, onDelete, isModal = false, isOpen = false, onClose
           
           <div className="gallery-modal__content">
             <div className="gallery-modal__image">
-              <img src={item.image_url} alt={item.title || item.prompt} />
+              <img src={largeUrl} alt={item.title || item.prompt} />
             </div>
             
             <div className="gallery-modal__details">
@@ -163,7 +170,7 @@ function GalleryItem({ item, onDelete, isModal = false, isOpen = false, onClose
       <div className="gallery-item">
         <div className="gallery-item__image-container">
           <img 
-            src={item.image_url} 
+            src={thumbnailUrl} 
             alt={item.title || item.prompt} 
             className="gallery-item__image"
             loading="lazy"
@@ -259,7 +266,7 @@ function GalleryItem({ item, onDelete, isModal = false, isOpen = false, onClose
             
             <div className="gallery-modal__content">
               <div className="gallery-modal__image">
-                <img src={item.image_url} alt={item.title || item.prompt} />
+                <img src={largeUrl} alt={item.title || item.prompt} />
               </div>
               
               <div className="gallery-modal__details">
@@ -31,6 +31,8 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState(null)
   const [generatedImage, setGeneratedImage] = useState(null)
+  const [generatedJob, setGeneratedJob] = useState(null)
+  const [jobStatus, setJobStatus] = useState(null)
   const [constants, setConstants] = useState(null)
   // const [educationalPrompts, setEducationalPrompts] = useState(null) // 제거됨
   
@@ -100,12 +102,84 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
     }
   }
 
+  // 작업 완료 대기 (SSE, 연결이 끊기면 폴링으로 대체)
+  const waitForJob = (job) => new Promise((resolve, reject) => {
+    const finish = (info) => {
+      if (info.status === 'succeeded') {
+        resolve(info)
+      } else {
+        reject(new Error(info.error || '이미지 생성 실패'))
+      }
+    }
+
+    const poll = async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}${job.status_url}`)
+        const info = await response.json()
+        if (!response.ok) {
+          throw new Error(info.detail || '작업 상태 조회 실패')
+        }
+        setJobStatus(info)
+        if (info.status === 'succeeded' || info.status === 'failed') {
+          finish(info)
+        } else {
+          setTimeout(poll, 2000)
+        }
+      } catch (err) {
+        reject(err)
+      }
+    }
+
+    const source = new EventSource(`${API_BASE_URL}${job.events_url}`)
+    source.addEventListener('status', (event) => setJobStatus(JSON.parse(event.data)))
+    source.addEventListener('complete', (event) => {
+      source.close()
+      finish(JSON.parse(event.data))
+    })
+    source.onerror = () => {
+      source.close()
+      poll()
+    }
+  })
+
+  // 백그라운드 작업으로 제출하고 완료되면 결과 이미지 URL과 작업 정보 반환
+  const runGenerationJob = async (endpoint, formDataToSend, failureMessage) => {
+    formDataToSend.append('background', 'true')
+
+    const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+      method: 'POST',
+      body: formDataToSend
+    })
+
+    if (!response.ok) {
+      const errorData = await response.json()
+      throw new Error(errorData.detail || failureMessage)
+    }
+
+    const job = await response.json()
+    setJobStatus(job)
+    try {
+      await waitForJob(job)
+    } finally {
+      setJobStatus(null)
+    }
+
+    const resultResponse = await fetch(`${API_BASE_URL}${job.result_url}`)
+    if (!resultResponse.ok) {
+      const errorData = await resultResponse.json()
+      throw new Error(errorData.detail || failureMessage)
+    }
+    const imageBlob = await resultResponse.blob()
+    return { imageUrl: URL.createObjectURL(imageBlob), job }
+  }
+
   // 이미지 생성 API 호출
   const generateImage = async () => {
     try {
       setLoading(true)
       setError(null)
       setGeneratedImage(null)
+      setGeneratedJob(null)
 
       const formDataToSend = new FormData()
       
@@ -146,20 +220,10 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
           throw new Error('알 수 없는 생성 타입')
       }
 
-      const response = await fetch(`${API_BASE_URL}${endpoint}`, {
-        method: 'POST',
-        body: formDataToSend
-      })
-
-      if (response.ok) {
-        // 모든 모델이 이미지 바이너리 응답으로 통일
-        const imageBlob = await response.blob()
-        const imageUrl = URL.createObjectURL(imageBlob)
-        setGeneratedImage(imageUrl)
-      } else {
-        const errorData = await response.json()
-        throw new Error(errorData.detail || '이미지 생성 실패')
-      }
+      // 모든 모델이 이미지 바이너리 결과로 통일
+      const { imageUrl, job } = await runGenerationJob(endpoint, formDataToSend, '이미지 생성 실패')
+      setGeneratedImage(imageUrl)
+      setGeneratedJob(job)
 
     } catch (err) {
       console.error('이미지 생성 오류:', err)
@@ -175,6 +239,7 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
       setLoading(true)
       setError(null)
       setGeneratedImage(null)
+      setGeneratedJob(null)
 
       if (!uploadedImage) {
         throw new Error('스케치 이미지를 업로드해주세요.')
@@ -198,19 +263,9 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
 
       formDataToSend.append('image', uploadedImage)
 
-      const response = await fetch(`${API_BASE_URL}/api/image/control/sketch`, {
-        method: 'POST',
-        body: formDataToSend
-      })
-
-      if (response.ok) {
-        const imageBlob = await response.blob()
-        const imageUrl = URL.createObjectURL(imageBlob)
-        setGeneratedImage(imageUrl)
-      } else {
-        const errorData = await response.json()
-        throw new Error(errorData.detail || '스케치 변환 실패')
-      }
+      const { imageUrl, job } = await runGenerationJob('/api/image/control/sketch', formDataToSend, '스케치 변환 실패')
+      setGeneratedImage(imageUrl)
+      setGeneratedJob(job)
 
     } catch (err) {
       console.error('스케치 변환 오류:', err)
@@ -220,9 +275,9 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
     }
   }
 
-  // 갤러리에 업로드 기능
+  // 갤러리에 게시 (서버에 남아 있는 작업 결과를 그대로 게시하므로 이미지를 다시 업로드하지 않음)
   const uploadToGallery = async () => {
-    if (!generatedImage || !user || !sessionId) {
+    if (!generatedJob || !user || !sessionId) {
       alert('업로드할 이미지가 없거나 사용자 정보가 없습니다.')
       return
     }
@@ -235,21 +290,15 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
     try {
       setLoading(true)
       
-      // 생성된 이미지를 Blob으로 변환
-      const response = await fetch(generatedImage)
-      const imageBlob = await response.blob()
-      
       // FormData 생성
       const uploadFormData = new FormData()
-      uploadFormData.append('image', imageBlob, `ai-generated-${Date.now()}.${formData.output_format}`)
-      uploadFormData.append('session_id', sessionId.toString())
       uploadFormData.append('user_id', user.id.toString())
       uploadFormData.append('user_name', user.name)
       uploadFormData.append('user_type', user.user_type)
       uploadFormData.append('prompt', formData.prompt.trim())
       uploadFormData.append('title', `AI 생성 이미지 - ${new Date().toLocaleDateString()}`)
 
-      const uploadResponse = await fetch(`${API_BASE_URL}/api/gallery/upload`, {
+      const uploadResponse = await fetch(`${API_BASE_URL}${generatedJob.publish_url}`, {
         method: 'POST',
         body: uploadFormData,
       })
@@ -257,6 +306,7 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
       const uploadData = await uploadResponse.json()
 
       if (uploadResponse.ok && uploadData.success) {
+        setGeneratedJob(prev => ({ ...prev, gallery_item: uploadData.item }))
         alert('이미지가 갤러리에 성공적으로 업로드되었습니다!')
       } else {
         throw new Error(uploadData.detail || uploadData.error || '갤러리 업로드에 실패했습니다.')
@@ -549,7 +599,11 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
           {loading && (
             <div className="loading-spinner">
               <div className="spinner"></div>
-              <p>AI가 이미지를 생성하고 있습니다...</p>
+              <p>
+                {jobStatus && jobStatus.status === 'queued'
+                  ? `대기 중입니다... (대기 순서 ${jobStatus.position + 1}번)`
+                  : 'AI가 이미지를 생성하고 있습니다...'}
+              </p>
             </div>
           )}
           
@@ -577,9 +631,13 @@ const ImageGenerator = ({ onClose, user, sessionId }) => {
                   <button 
                     onClick={uploadToGallery}
                     className="gallery-upload-btn"
-                    disabled={loading}
+                    disabled={loading || !generatedJob || Boolean(generatedJob.gallery_item)}
                   >
-                    {loading ? '업로드 중...' : '🖼️ 갤러리에 업로드'}
+                    {loading
+                      ? '업로드 중...'
+                      : generatedJob && generatedJob.gallery_item
+                        ? '✅ 갤러리에 게시됨'
+                        : '🖼️ 갤러리에 업로드'}
                   </button>
                 )}
               </div>